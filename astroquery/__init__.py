@@ -58,5 +58,59 @@ class Cache_Conf(_config.ConfigNamespace):
         cfgtype='boolean'
     )
 
+    cache_size_limit = _config.ConfigItem(
+        0,
+        ('Astroquery-wide cache size limit (bytes). When the cached responses of all '
+         'services exceed it, the least recently used ones are removed. '
+         'Default is 0, meaning no limit.'),
+        cfgtype='integer'
+    )
+
+    cache_compression = _config.ConfigItem(
+        ['none', 'gzip', 'zstd'],
+        ('Compression applied to the body of cached responses. '
+         "'zstd' requires the zstandard package."),
+    )
+
 
 cache_conf = Cache_Conf()
+
+
+# Set up connection configuration
+class Connection_Conf(_config.ConfigNamespace):
+
+    pool_connections = _config.ConfigItem(
+        10,
+        ('Number of urllib3 connection pools cached by the HTTP adapter of each host, '
+         'which holds one pool per scheme and port the host is reached on.'),
+        cfgtype='integer'
+    )
+
+    pool_maxsize = _config.ConfigItem(
+        10,
+        'Maximum number of keep-alive connections kept open to each host.',
+        cfgtype='integer'
+    )
+
+    max_retries = _config.ConfigItem(
+        0,
+        ('Number of times failed connections, and idempotent requests answered with '
+         'a 429, 502, 503 or 504 status, are retried. Default is 0, no retries.'),
+        cfgtype='integer'
+    )
+
+    retry_backoff_factor = _config.ConfigItem(
+        0.5,
+        ('Retries wait for retry_backoff_factor * 2 ** (retry number - 1) seconds, '
+         'unless the server sends a Retry-After header.'),
+        cfgtype='float'
+    )
+
+    http2 = _config.ConfigItem(
+        False,
+        "Use HTTP/2 where the server supports it. Requires the httpx package with its http2 extra.",
+        cfgtype='boolean'
+    )
+
+
+connection_conf = Connection_Conf()
@@ -1,6 +1,8 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 import os.path
+from concurrent.futures import ThreadPoolExecutor
+
 import keyring
 import numpy as np
 import re
@@ -409,6 +411,8 @@ class AlmaClass(QueryWithLogin):
     TIMEOUT = conf.timeout
     archive_url = conf.archive_url
     USERNAME = conf.username
+    # the queries go through a pyvo TAP service kept between calls
+    _deferrable = False
 
     def __init__(self):
         # sia service does not need disambiguation but tap does
@@ -895,31 +899,36 @@ class AlmaClass(QueryWithLogin):
             return False
         return True
 
-    def _HEADER_data_size(self, files):
+    def _HEADER_data_size(self, files, *, max_workers=1):
         """
         Given a list of file URLs, return the data size.  This is useful for
         assessing how much data you might be downloading!
         (This is discouraged by the ALMA archive, as it puts unnecessary load
         on their system)
+
+        ``max_workers`` HEAD requests are sent at the same time.
         """
+        def head(fileLink):
+            return self._request('HEAD', fileLink, stream=False,
+                                 cache=False, timeout=self.TIMEOUT)
+
         totalsize = 0 * u.B
         data_sizes = {}
         pb = ProgressBar(len(files))
-        for index, fileLink in enumerate(files):
-            response = self._request('HEAD', fileLink, stream=False,
-                                     cache=False, timeout=self.TIMEOUT)
-            filesize = (int(response.headers['content-length']) * u.B).to(u.GB)
-            totalsize += filesize
-            data_sizes[fileLink] = filesize
-            log.debug("File {0}: size {1}".format(fileLink, filesize))
-            pb.update(index + 1)
-            response.raise_for_status()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for index, (fileLink, response) in enumerate(zip(files, executor.map(head, files))):
+                filesize = (int(response.headers['content-length']) * u.B).to(u.GB)
+                totalsize += filesize
+                data_sizes[fileLink] = filesize
+                log.debug("File {0}: size {1}".format(fileLink, filesize))
+                pb.update(index + 1)
+                response.raise_for_status()
 
         return data_sizes, totalsize.to(u.GB)
 
     def download_files(self, files, *, savedir=None, cache=True,
                        continuation=True, skip_unauthorized=True,
-                       verify_only=False):
+                       verify_only=False, max_workers=1):
         """
         Given a list of file URLs, download them
 
@@ -944,6 +953,12 @@ class AlmaClass(QueryWithLogin):
             Option to go through the process of checking the files to see if
             they're the right size, but not actually download them.  This
             option may be useful if a previous download run failed partway.
+        max_workers : int
+            Number of HEAD requests, and then of files downloaded, at the
+            same time, each in its own thread.  Default 1.  With more than
+            one worker, the files are downloaded by
+            `~astroquery.downloads.DownloadManager`, to ``.part`` files renamed
+            once complete, and the progress is shown for the whole set of files.
         """
 
         if self.USERNAME:
@@ -951,13 +966,22 @@ class AlmaClass(QueryWithLogin):
         else:
             auth = None
 
-        downloaded_files = []
         if savedir is None:
             savedir = self.cache_location
-        for file_link in unique(files):
+
+        # learn the file names with HEAD requests, sent concurrently
+        file_links = list(unique(files))
+
+        def head(file_link):
             log.debug("Downloading {0} to {1}".format(file_link, savedir))
+            return self._request('HEAD', file_link, auth=auth, timeout=self.TIMEOUT)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(head, file_links))
+
+        downloads = []
+        for file_link, check_filename in zip(file_links, responses):
             try:
-                check_filename = self._request('HEAD', file_link, auth=auth, timeout=self.TIMEOUT)
                 check_filename.raise_for_status()
             except requests.HTTPError as ex:
                 if ex.response.status_code == 401:
@@ -999,36 +1023,48 @@ class AlmaClass(QueryWithLogin):
                 else:
                     warnings.warn(f"Could not verify {file_link} because it has no 'content-length'")
 
-            try:
-                if not verify_only:
-                    self._download_file(file_link,
-                                        filename,
-                                        timeout=self.TIMEOUT,
-                                        auth=auth,
-                                        cache=cache,
-                                        method='GET',
-                                        head_safe=False,
-                                        continuation=continuation)
+            downloads.append((file_link, filename))
 
-                downloaded_files.append(filename)
+        if verify_only:
+            return [filename for _, filename in downloads]
+
+        def failed(file_link, ex):
+            # None for a file skipped as unauthorized, otherwise raise
+            if ex.response.status_code == 401:
+                if skip_unauthorized:
+                    log.info("Access denied to {url}.  Skipping to"
+                             " next file".format(url=file_link))
+                    return None
+                else:
+                    raise (ex)
+            elif ex.response.status_code == 403:
+                log.error("Access denied to {url}".format(url=file_link))
+                if 'dataPortal' in file_link and 'sso' not in file_link:
+                    log.error("The URL may be incorrect.  Try using "
+                              "{0} instead of {1}"
+                              .format(file_link.replace('dataPortal/',
+                                                        'dataPortal/sso/'),
+                                      file_link))
+                raise ex
+            else:
+                raise ex
+
+        def download(file_link, filename):
+            # each resumed download sends its own Range header; the shared
+            # session is left untouched
+            try:
+                self._download_file(file_link,
+                                    filename,
+                                    timeout=self.TIMEOUT,
+                                    auth=auth,
+                                    cache=cache,
+                                    method='GET',
+                                    head_safe=False,
+                                    continuation=continuation)
+
+                return filename
             except requests.HTTPError as ex:
-                if ex.response.status_code == 401:
-                    if skip_unauthorized:
-                        log.info("Access denied to {url}.  Skipping to"
-                                 " next file".format(url=file_link))
-                        continue
-                    else:
-                        raise (ex)
-                elif ex.response.status_code == 403:
-                    log.error("Access denied to {url}".format(url=file_link))
-                    if 'dataPortal' in file_link and 'sso' not in file_link:
-                        log.error("The URL may be incorrect.  Try using "
-                                  "{0} instead of {1}"
-                                  .format(file_link.replace('dataPortal/',
-                                                            'dataPortal/sso/'),
-                                          file_link))
-                    raise ex
-                elif ex.response.status_code == 500:
+                if ex.response.status_code == 500:
                     # empirically, this works the second time most of the time...
                     self._download_file(file_link,
                                         filename,
@@ -1039,10 +1075,33 @@ class AlmaClass(QueryWithLogin):
                                         head_safe=False,
                                         continuation=continuation)
 
-                    downloaded_files.append(filename)
-                else:
-                    raise ex
-        return downloaded_files
+                    return filename
+                return failed(file_link, ex)
+
+        def download_many(indices):
+            return self._download_many([downloads[index][0] for index in indices],
+                                       [downloads[index][1] for index in indices],
+                                       max_workers=max_workers, timeout=self.TIMEOUT,
+                                       auth=auth, continuation=continuation, cache=cache,
+                                       return_exceptions=True)
+
+        if max_workers == 1:
+            results = [download(file_link, filename) for file_link, filename in downloads]
+        else:
+            results = download_many(range(len(downloads)))
+            # the downloads that failed with a server error are tried a second time, as above
+            retry = [index for index, result in enumerate(results)
+                     if isinstance(result, requests.HTTPError) and result.response.status_code == 500]
+            if retry:
+                for index, result in zip(retry, download_many(retry)):
+                    results[index] = result
+            for index, ((file_link, _), result) in enumerate(zip(downloads, results)):
+                if isinstance(result, requests.HTTPError):
+                    results[index] = failed(file_link, result)
+                elif isinstance(result, Exception):
+                    raise result
+
+        return [filename for filename in results if filename is not None]
 
     def _parse_result(self, response, verbose=False):
         """
@@ -1053,7 +1112,7 @@ class AlmaClass(QueryWithLogin):
 
         return response
 
-    def retrieve_data_from_uid(self, uids, *, cache=True):
+    def retrieve_data_from_uid(self, uids, *, cache=True, max_workers=1):
         """
         Stage & Download ALMA data.  Will print out the expected file size
         before attempting the download.
@@ -1065,6 +1124,8 @@ class AlmaClass(QueryWithLogin):
             UIDs should have the form: 'uid://A002/X391d0b/X7b'
         cache : bool
             Whether to cache the downloads.
+        max_workers : int
+            Number of files downloaded at the same time.  Default 1.
 
         Returns
         -------
@@ -1091,7 +1152,7 @@ class AlmaClass(QueryWithLogin):
         # each_size, totalsize = self.data_size(files)
         log.info("Downloading files of size {0}...".format(totalsize.to(u.GB)))
         # TODO: Add cache=cache keyword here.  Currently would have no effect.
-        downloaded_files = self.download_files(file_urls)
+        downloaded_files = self.download_files(file_urls, max_workers=max_workers)
         return downloaded_files
 
     def _get_auth_info(self, username, *, store_password=False,
@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from io import StringIO
 import os
+import threading
 
 import pytest
 from unittest.mock import patch, Mock
@@ -13,6 +14,7 @@ from astropy.io import votable
 from astropy.coordinates import SkyCoord
 from astropy.time import Time
 import pyvo
+import requests
 
 from astroquery.alma import Alma
 from astroquery.alma.core import _gen_sql, _OBSCORE_TO_ALMARESULT, get_enhanced_table
@@ -694,3 +696,43 @@ def test_download_files():
     alma._request.return_value = Mock(headers={})
     result = alma.download_files(['https://location/file1'])
     assert not result
+
+
+def test_download_files_concurrent():
+    urls = [f'https://location/file{i}' for i in range(6)]
+    # all the HEAD requests run at the same time
+    heads = threading.Barrier(len(urls), timeout=10)
+
+    def _requests_mock(method, url, **kwargs):
+        heads.wait()
+        return Mock(headers={'Content-Disposition': 'attachment; '
+                                                    'filename={}'.format(url.split('/')[-1])})
+
+    def http_error(status_code):
+        error = requests.HTTPError()
+        error.response = Mock(status_code=status_code)
+        return error
+
+    calls = []
+
+    def _download_many_mock(urls, local_filepaths, **kwargs):
+        calls.append((urls, kwargs))
+        # file1 is unauthorized, file2 fails with a server error the first time
+        return [http_error(401) if url.endswith('1')
+                else http_error(500) if url.endswith('2') and len(calls) == 1
+                else filename for url, filename in zip(urls, local_filepaths)]
+
+    alma = Alma()
+    alma._request = Mock(side_effect=_requests_mock)
+    alma._download_many = Mock(side_effect=_download_many_mock)
+    downloaded_files = alma.download_files(urls, savedir='dir', max_workers=6)
+    assert downloaded_files == [os.path.join('dir', f'file{i}') for i in (0, 2, 3, 4, 5)]
+    # all the files go through the download manager, then file2 a second time
+    assert [len(urls) for urls, _ in calls] == [6, 1]
+    assert calls[1][0] == ['https://location/file2']
+    assert calls[0][1]['max_workers'] == 6 and calls[0][1]['return_exceptions']
+
+    heads.reset()
+    calls.clear()
+    with pytest.raises(requests.HTTPError):
+        alma.download_files(urls, savedir='dir', max_workers=6, skip_unauthorized=False)
@@ -0,0 +1,358 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Storage and bookkeeping for the astroquery response cache.
+
+Each response cached by `~astroquery.query.BaseQuery` is stored in its own
+file, holding the status, headers and raw (optionally compressed) body of
+the response, see `write_response` and `read_response`.
+
+Every cache file is also recorded in a single SQLite index living in the
+astroquery cache directory.  The index stores the size, creation time, last
+access time and service of each entry, so that expiry checks do not need to
+``stat`` the cache files and eviction never needs to scan the cache
+directories.
+"""
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from astropy.config import paths
+
+from astroquery import log, cache_conf
+
+try:
+    import zstandard
+except ImportError:
+    _HAVE_ZSTD = False
+else:
+    _HAVE_ZSTD = True
+
+__all__ = ['CacheIndex', 'get_cache_index', 'enforce_cache_limits',
+           'write_response', 'read_response']
+
+
+INDEX_FILENAME = 'cache_index.sqlite'
+
+# Cache files start with this signature, followed by the length of the
+# JSON metadata as a little-endian unsigned 64-bit integer, the metadata
+# itself, the body of the request and finally the body of the response.
+_MAGIC = b'astroquery-response-v1\n'
+_LENGTH = struct.Struct('<Q')
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entries (
+           path TEXT PRIMARY KEY,
+           service TEXT,
+           size INTEGER NOT NULL,
+           created REAL NOT NULL,
+           last_access REAL NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)",
+    "CREATE INDEX IF NOT EXISTS entries_created ON entries (created)",
+)
+
+_initialized = set()
+_lock = threading.Lock()
+
+
+def _key(path):
+    return os.path.abspath(os.fspath(path))
+
+
+class CacheIndex:
+    """
+    Index of the cached responses, backed by an SQLite database.
+
+    All methods open a short-lived connection, so a single index can be
+    shared between threads and processes.
+
+    Parameters
+    ----------
+    index_file : str or `~pathlib.Path`
+        Location of the SQLite database; created on first use.
+    """
+
+    def __init__(self, index_file):
+        self.index_file = Path(index_file)
+
+    @contextmanager
+    def _connect(self):
+        with _lock:
+            if self.index_file not in _initialized:
+                self.index_file.parent.mkdir(parents=True, exist_ok=True)
+                with closing(sqlite3.connect(self.index_file, timeout=30)) as conn, conn:
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                _initialized.add(self.index_file)
+        with closing(sqlite3.connect(self.index_file, timeout=30)) as conn, conn:
+            yield conn
+
+    def add(self, path, service, size, created=None):
+        """
+        Record (or replace) the entry for the cache file ``path``.
+        """
+        now = time.time()
+        created = now if created is None else created
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                         (_key(path), service, int(size), created, now))
+
+    def lookup(self, path, *, touch=False):
+        """
+        Return the ``(size, created, last_access)`` tuple recorded for
+        ``path``, or `None` if the file is not in the index.
+
+        If ``touch`` is True, the access time of the entry is updated.
+        """
+        key = _key(path)
+        with self._connect() as conn:
+            entry = conn.execute("SELECT size, created, last_access FROM entries WHERE path = ?",
+                                 (key,)).fetchone()
+            if entry is not None and touch:
+                conn.execute("UPDATE entries SET last_access = ? WHERE path = ?",
+                             (time.time(), key))
+        return entry
+
+    def remove(self, path):
+        """
+        Drop the entry for ``path`` from the index.  The file is left alone.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE path = ?", (_key(path),))
+
+    def remove_location(self, location):
+        """
+        Drop all the entries stored under the directory ``location``.
+        """
+        prefix = os.path.join(_key(location), '')
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE substr(path, 1, ?) = ?",
+                         (len(prefix), prefix))
+
+    def total_size(self, service=None):
+        """
+        Total size in bytes of the indexed entries, optionally restricted to
+        a single ``service``.
+        """
+        with self._connect() as conn:
+            if service is None:
+                size, = conn.execute("SELECT TOTAL(size) FROM entries").fetchone()
+            else:
+                size, = conn.execute("SELECT TOTAL(size) FROM entries WHERE service = ?",
+                                     (service,)).fetchone()
+        return int(size)
+
+    def evict(self, size_limit=None, timeout=None):
+        """
+        Remove expired entries, then the least recently used ones until the
+        indexed entries fit in ``size_limit`` bytes.
+
+        Parameters
+        ----------
+        size_limit : int or None
+            Byte budget for the whole cache. `None` or 0 means no limit.
+        timeout : int or None
+            Entries created more than ``timeout`` seconds ago are removed.
+            `None` means entries never expire.
+
+        Returns
+        -------
+        evicted : list of str
+            The paths of the removed cache files.
+        """
+        evicted = []
+        with self._connect() as conn:
+            if timeout is not None:
+                cutoff = time.time() - timeout
+                evicted += [path for path, in conn.execute(
+                    "SELECT path FROM entries WHERE created < ?", (cutoff,))]
+                conn.execute("DELETE FROM entries WHERE created < ?", (cutoff,))
+
+            if size_limit:
+                total, = conn.execute("SELECT TOTAL(size) FROM entries").fetchone()
+                if total > size_limit:
+                    lru = conn.execute("SELECT path, size FROM entries ORDER BY last_access")
+                    stale = []
+                    for path, size in lru:
+                        if total <= size_limit:
+                            break
+                        stale.append(path)
+                        total -= size
+                    conn.executemany("DELETE FROM entries WHERE path = ?",
+                                     [(path,) for path in stale])
+                    evicted += stale
+
+        for path in evicted:
+            log.debug(f"Evicting {path} from the cache")
+            Path(path).unlink(missing_ok=True)
+        return evicted
+
+
+def get_cache_index():
+    """
+    Return the `CacheIndex` of the current astropy cache directory.
+    """
+    return CacheIndex(Path(paths.get_cache_dir(), 'astroquery', INDEX_FILENAME))
+
+
+def enforce_cache_limits():
+    """
+    Apply the ``cache_conf`` size limit and timeout to the cache, removing
+    the entries that do not fit.
+    """
+    return get_cache_index().evict(cache_conf.cache_size_limit or None,
+                                   cache_conf.cache_timeout)
+
+
+def _compress(content, compression):
+    if compression == 'zstd':
+        if _HAVE_ZSTD:
+            return zstandard.ZstdCompressor().compress(content), 'zstd'
+        log.warning("zstandard is not installed, compressing the cache with gzip instead.")
+        compression = 'gzip'
+    if compression == 'gzip':
+        # Favour speed, the cache is written on the request path
+        return zlib.compress(content, level=1, wbits=31), 'gzip'
+    return content, 'none'
+
+
+def write_response(response, cache_file, compression='none'):
+    """
+    Write the status, headers and body of ``response`` to ``cache_file``.
+
+    The file is written next to its final location and then moved in
+    place, so that concurrent readers never see a partial entry.
+
+    Parameters
+    ----------
+    response : `requests.Response`
+    cache_file : str or `~pathlib.Path`
+    compression : {'none', 'gzip', 'zstd'}
+        Compression applied to the body of the response.
+
+    Returns
+    -------
+    size : int
+        The size of the cache file in bytes.
+    """
+    content = response.content
+    is_text = isinstance(content, str)
+    if is_text:
+        content = content.encode('utf-8')
+    elif content is None:
+        content = b''
+    content_length = len(content)
+    content, compression = _compress(content, compression)
+
+    request = getattr(response, 'request', None)
+    request_body = getattr(request, 'body', None)
+    request_body_type = type(request_body).__name__ if request_body is not None else None
+    if isinstance(request_body, str):
+        request_body = request_body.encode('utf-8')
+    elif not isinstance(request_body, bytes):
+        request_body, request_body_type = b'', None
+
+    metadata = {
+        'status_code': response.status_code,
+        'reason': response.reason,
+        'url': response.url,
+        'encoding': response.encoding,
+        'headers': list(response.headers.items()),
+        'content_type': 'str' if is_text else 'bytes',
+        'content_length': content_length,
+        'compression': compression,
+        'request': None if request is None else {
+            'method': request.method,
+            'url': request.url,
+            'headers': list((request.headers or {}).items()),
+            'body_type': request_body_type,
+            'body_length': len(request_body)},
+    }
+    metadata = json.dumps(metadata).encode('utf-8')
+
+    cache_file = Path(cache_file)
+    fd, tmp_file = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.name, suffix='.tmp')
+    try:
+        with open(fd, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(_LENGTH.pack(len(metadata)))
+            f.write(metadata)
+            f.write(request_body)
+            f.write(content)
+            size = f.tell()
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        Path(tmp_file).unlink(missing_ok=True)
+        raise
+    return size
+
+
+def read_response(cache_file):
+    """
+    Rebuild the `requests.Response` stored in ``cache_file`` by
+    `write_response`.
+
+    Uncompressed bodies are read with a single unbuffered read straight
+    into the returned bytes; compressed bodies are decompressed from a
+    memory map of the file.
+
+    Returns
+    -------
+    response : `requests.Response` or None
+        `None` if the file is not a response cache file.
+    """
+    with open(cache_file, 'rb', buffering=0) as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            return None
+        metadata_length, = _LENGTH.unpack(f.read(_LENGTH.size))
+        metadata = json.loads(f.read(metadata_length))
+
+        request_metadata = metadata['request']
+        if request_metadata is not None:
+            request = requests.PreparedRequest()
+            request.method = request_metadata['method']
+            request.url = request_metadata['url']
+            request.headers = CaseInsensitiveDict(request_metadata['headers'])
+            body = f.read(request_metadata['body_length'])
+            if request_metadata['body_type'] == 'str':
+                body = body.decode('utf-8')
+            elif request_metadata['body_type'] is None:
+                body = None
+            request.body = body
+        else:
+            request = None
+
+        if metadata['compression'] == 'none':
+            content = f.readall()
+        else:
+            offset = f.tell()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped)[offset:] as body:
+                    if metadata['compression'] == 'gzip':
+                        content = zlib.decompress(body, wbits=31,
+                                                  bufsize=max(metadata['content_length'], 1))
+                    else:
+                        content = zstandard.ZstdDecompressor().decompress(body)
+
+    if metadata['content_type'] == 'str':
+        content = content.decode('utf-8')
+
+    response = requests.Response()
+    response.status_code = metadata['status_code']
+    response.reason = metadata['reason']
+    response.url = metadata['url']
+    response.encoding = metadata['encoding']
+    response.headers = CaseInsensitiveDict(metadata['headers'])
+    response.request = request
+    response._content = content
+    response._content_consumed = True
+    return response
@@ -69,6 +69,8 @@ class CadcClass(BaseVOQuery, BaseQuery):
     CADCDATALINK_SERVICE_URI = conf.CADCDATLINK_SERVICE_URI
     CADCLOGIN_SERVICE_URI = conf.CADCLOGIN_SERVICE_URI
     TIMEOUT = conf.TIMEOUT
+    # the queries go through pyvo, with an authenticated session of its own
+    _deferrable = False
 
     def __init__(self, *, url=None, auth_session=None):
         """
@@ -0,0 +1,393 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Process-wide HTTP connection pools shared by all the astroquery services.
+
+Every `~astroquery.query.BaseQuery` session mounts the same `PooledAdapter`,
+which hands the requests to one transport adapter per host.  Keep-alive
+connections are therefore reused across services, across the fresh copies
+made by ``BaseQuery.__call__`` and across threads, while cookies, headers
+and authentication stay private to each session.
+
+The transport adapters are configured with ``astroquery.connection_conf``
+when they are first used; `configure_host` overrides these settings for a
+single host.
+
+`async_send` is the asyncio counterpart of the adapters, used by the
+coroutine query methods (e.g. ``aquery_region``).
+"""
+import asyncio
+import http.client
+import http.cookiejar
+import io
+import ssl
+import threading
+import weakref
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from astroquery import connection_conf
+
+try:
+    import httpx
+except ImportError:
+    _HAVE_HTTPX = False
+else:
+    _HAVE_HTTPX = True
+
+__all__ = ['PooledAdapter', 'HTTP2Adapter', 'configure_host', 'get_adapter',
+           'close_connections', 'shared_adapter', 'async_send', 'aclose_connections']
+
+
+_SETTINGS = ('pool_connections', 'pool_maxsize', 'max_retries', 'retry_backoff_factor', 'http2')
+
+_adapters = {}
+_host_settings = {}
+_lock = threading.Lock()
+
+
+def _retry(max_retries, backoff_factor):
+    # The same as the requests default (Retry(0, read=False)) when
+    # max_retries is 0. Retries on a bad status return the last response, so
+    # that callers still see it in raise_for_status.
+    return Retry(total=max_retries, read=False, backoff_factor=backoff_factor,
+                 status_forcelist=(429, 502, 503, 504), raise_on_status=False)
+
+
+def _make_adapter(pool_connections, pool_maxsize, max_retries, retry_backoff_factor, http2):
+    if http2:
+        return HTTP2Adapter(pool_maxsize=pool_maxsize, max_retries=max_retries)
+    return HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                       max_retries=_retry(max_retries, retry_backoff_factor))
+
+
+def configure_host(host, **settings):
+    """
+    Override the connection settings of ``connection_conf`` for one host.
+
+    The connections already open to ``host`` are closed, the new settings
+    apply from the next request.
+
+    Parameters
+    ----------
+    host : str
+        Host name, e.g. ``'simbad.cds.unistra.fr'``.
+    pool_connections, pool_maxsize, max_retries, retry_backoff_factor, http2
+        See ``astroquery.connection_conf``. Settings given as `None` revert
+        to the configuration value.
+    """
+    unknown = set(settings) - set(_SETTINGS)
+    if unknown:
+        raise TypeError(f"Unknown connection settings: {', '.join(sorted(unknown))}")
+    with _lock:
+        host_settings = _host_settings.setdefault(host, {})
+        host_settings.update(settings)
+        for key in [key for key, value in host_settings.items() if value is None]:
+            del host_settings[key]
+        adapter = _adapters.pop(host, None)
+    if adapter is not None:
+        adapter.close()
+
+
+def get_adapter(host):
+    """
+    Return the transport adapter holding the connections to ``host``.
+    """
+    with _lock:
+        adapter = _adapters.get(host)
+        if adapter is None:
+            settings = {key: getattr(connection_conf, key) for key in _SETTINGS}
+            settings.update(_host_settings.get(host, {}))
+            adapter = _adapters[host] = _make_adapter(**settings)
+    return adapter
+
+
+def close_connections():
+    """
+    Close all the pooled connections. The adapters are rebuilt with the
+    current configuration on the next request.
+    """
+    with _lock:
+        adapters = list(_adapters.values())
+        _adapters.clear()
+    for adapter in adapters:
+        adapter.close()
+
+
+class PooledAdapter(BaseAdapter):
+    """
+    Transport adapter dispatching each request to the shared adapter of its
+    host, see `get_adapter`.
+    """
+
+    def send(self, request, **kwargs):
+        return get_adapter(urlparse(request.url).hostname).send(request, **kwargs)
+
+    def close(self):
+        # The pools are shared by every session; closing one session must not
+        # close the connections of the others. Use close_connections instead.
+        pass
+
+
+shared_adapter = PooledAdapter()
+
+
+def _require_httpx(feature):
+    if not _HAVE_HTTPX:
+        raise ImportError(f"{feature} requires the httpx package, install it with "
+                          "'pip install httpx[http2]'.")
+
+
+def _ssl_context(verify, cert):
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        context = ssl.create_default_context(
+            cafile=DEFAULT_CA_BUNDLE_PATH if verify is True else verify)
+    if cert:
+        context.load_cert_chain(*((cert,) if isinstance(cert, str) else cert))
+    return context
+
+
+def _cookie_message(headers):
+    # requests reads the cookies of a response from the headers of the
+    # http.client response it wraps
+    message = http.client.HTTPMessage()
+    message.msg = message
+    for key, value in headers.multi_items():
+        message[key] = value
+    return message
+
+
+def _httpx_timeout(timeout):
+    # requests timeouts are either a number or a (connect, read) tuple
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class _httpx_errors:
+    """
+    Translate the httpx exceptions to the requests ones.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            return False
+        if issubclass(exc_type, httpx.ConnectTimeout):
+            raise requests.exceptions.ConnectTimeout(exc, request=self.request)
+        if issubclass(exc_type, httpx.TimeoutException):
+            raise requests.exceptions.ReadTimeout(exc, request=self.request)
+        if issubclass(exc_type, httpx.TransportError):
+            raise requests.exceptions.ConnectionError(exc, request=self.request)
+        return False
+
+
+class _HTTPXRaw(io.RawIOBase):
+    """
+    File-like wrapper of a streamed `httpx.Response`, standing in for the
+    urllib3 response of `requests.Response.raw`.
+    """
+
+    def __init__(self, response):
+        super().__init__()
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b''
+        self._original_response = _cookie_message(response.headers)
+
+    def readable(self):
+        return True
+
+    def stream(self, amt=2**16, decode_content=True):
+        if self._buffer:
+            yield self._buffer
+            self._buffer = b''
+        for chunk in self._chunks:
+            yield chunk
+
+    def read(self, amt=None, decode_content=True):
+        if amt is None or amt < 0:
+            data = self._buffer + b''.join(self._chunks)
+            self._buffer = b''
+            return data
+        for chunk in self._chunks:
+            self._buffer += chunk
+            if len(self._buffer) >= amt:
+                break
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def release_conn(self):
+        self._response.close()
+
+    def close(self):
+        self._response.close()
+        super().close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter sending the requests through `httpx`, which negotiates
+    HTTP/2 with the servers supporting it and multiplexes the requests made
+    to a host over a single connection.
+
+    Proxies given to the session are not supported.
+
+    Parameters
+    ----------
+    pool_maxsize : int
+        Maximum number of connections kept open.
+    max_retries : int
+        Number of times failed connections are retried.
+    """
+
+    def __init__(self, pool_maxsize=10, max_retries=0):
+        _require_httpx("HTTP/2 support")
+        super().__init__()
+        self._limits = httpx.Limits(max_connections=pool_maxsize,
+                                    max_keepalive_connections=pool_maxsize)
+        self._max_retries = max_retries
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self, verify, cert):
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                transport = httpx.HTTPTransport(verify=_ssl_context(verify, cert), http2=True,
+                                                limits=self._limits, retries=self._max_retries)
+                client = self._clients[key] = httpx.Client(transport=transport, trust_env=False)
+        return client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        client = self._get_client(verify, cert)
+        http_request = client.build_request(request.method, request.url,
+                                            headers=list(request.headers.items()),
+                                            content=request.body, timeout=_httpx_timeout(timeout))
+        with _httpx_errors(request):
+            http_response = client.send(http_request, stream=True)
+
+        response = self.build_response(request, http_response)
+        if not stream:
+            response.content
+        return response
+
+    def build_response(self, request, http_response):
+        response = requests.Response()
+        response.status_code = http_response.status_code
+        response.headers = CaseInsensitiveDict(http_response.headers.items())
+        # httpx already decoded any Content-Encoding of the body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _HTTPXRaw(http_response)
+        response.reason = http_response.reason_phrase
+        response.url = request.url
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+# One client per event loop and TLS setup: httpx clients cannot be shared
+# between event loops.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _get_async_client(verify, cert):
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (verify, tuple(cert) if isinstance(cert, list) else cert)
+    client = clients.get(key)
+    if client is None:
+        # Cookies belong to the requests sessions, the client must not keep
+        # them, or they would leak between services.
+        no_cookies = http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        limits = httpx.Limits(max_connections=None,
+                              max_keepalive_connections=connection_conf.pool_maxsize)
+        client = clients[key] = httpx.AsyncClient(verify=_ssl_context(verify, cert),
+                                                  http2=connection_conf.http2, limits=limits,
+                                                  cookies=no_cookies, trust_env=False)
+    return client
+
+
+async def async_send(request, *, timeout=None, verify=True, cert=None, allow_redirects=True):
+    """
+    Send a prepared request from the running event loop.
+
+    The connections are pooled per event loop.
+
+    Parameters
+    ----------
+    request : `requests.PreparedRequest`
+        Typically prepared by ``session.prepare_request`` to include the
+        headers, cookies and authentication of a session.
+    timeout : float, tuple or None
+        See `requests.request`.
+    verify : bool or str
+        Verify the server's TLS certificate, or path to a CA bundle.
+    cert : str, tuple or None
+        Client certificate.
+    allow_redirects : bool
+
+    Returns
+    -------
+    response : `requests.Response`
+        The response, with its content already read.
+    """
+    _require_httpx("The coroutine query methods")
+    client = _get_async_client(verify, cert)
+    with _httpx_errors(request):
+        http_response = await client.request(request.method, request.url,
+                                             headers=list(request.headers.items()),
+                                             content=request.body, timeout=_httpx_timeout(timeout),
+                                             follow_redirects=allow_redirects)
+
+    response = requests.Response()
+    response.status_code = http_response.status_code
+    response.headers = CaseInsensitiveDict(http_response.headers.items())
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.reason = http_response.reason_phrase
+    response.url = str(http_response.url)
+    response._content = http_response.content
+    response._content_consumed = True
+    response.raw = io.BytesIO()
+    response.raw._original_response = _cookie_message(http_response.headers)
+    extract_cookies_to_jar(response.cookies, request, response.raw)
+    response.request = request
+    return response
+
+
+async def aclose_connections():
+    """
+    Close the connections pooled for the running event loop.
+    """
+    for client in _async_clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.aclose()
@@ -0,0 +1,326 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Concurrent and resumable downloads of many files.
+
+`DownloadManager` fetches a list of URLs with a pool of threads sharing one
+`requests.Session`.  Every file is written to ``<local path>.part`` and only
+renamed to its final name once complete, so that a file found under its
+final name is never truncated.  Large files may be split in byte ranges
+fetched in parallel.
+
+When the server supports range requests, the progress of each download is
+recorded in a small JSON journal, ``<local path>.part.json``.  A download
+interrupted for any reason (error, Ctrl-C, killed process) resumes from where
+it stopped the next time the same URL is downloaded to the same path.
+"""
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import astropy.utils.data
+from astropy.utils.console import ProgressBarOrSpinner
+
+from astroquery import log
+from astroquery.exceptions import RemoteServiceError
+
+__all__ = ['DownloadManager']
+
+
+PART_SUFFIX = '.part'
+JOURNAL_SUFFIX = '.part.json'
+
+# Bytes written to a byte range between two updates of the journal
+_JOURNAL_INTERVAL = 4 * 2**20
+
+
+class _Journal:
+    """
+    Progress of a download, as the list of its byte ranges.
+
+    Each range is a ``[start, end, done]`` list: the first and last byte of the
+    range (``end`` is `None` when the length is unknown) and the number of
+    bytes of the range already written to the ``.part`` file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.url = None
+        self.length = None
+        self.segments = []
+        self._lock = threading.Lock()
+
+    def load(self, url):
+        """
+        Read the journal of an earlier download of ``url``. Returns False if
+        there is none.
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get('url') != url:
+            return False
+        self.url, self.length, self.segments = url, state['length'], state['segments']
+        return True
+
+    def start(self, url, length, segments):
+        self.url, self.length, self.segments = url, length, segments
+        self.save()
+
+    def save(self):
+        with self._lock:
+            state = json.dumps({'url': self.url, 'length': self.length, 'segments': self.segments})
+            temp_path = f'{self.path}.{threading.get_ident()}'
+            with open(temp_path, 'w') as f:
+                f.write(state)
+            os.replace(temp_path, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def remaining(self):
+        return sum(end - start + 1 - done for start, end, done in self.segments)
+
+
+def _content_length(response):
+    if 'content-length' in response.headers:
+        return int(response.headers['content-length'])
+    return None
+
+
+class DownloadManager:
+    """
+    Download many files concurrently, resuming the interrupted downloads.
+
+    Parameters
+    ----------
+    session : `requests.Session`
+        Session sending the requests, typically the ``_session`` of a service.
+        The session is shared by all the threads and never modified: range
+        requests carry their own ``Range`` header.
+    max_workers : int
+        Number of files downloaded at the same time. Defaults to 4.
+    split_size : int or None
+        Files larger than ``split_size`` bytes are downloaded as
+        ``range_workers`` byte ranges fetched in parallel, when the server
+        supports range requests. `None`, the default, never splits files.
+    range_workers : int
+        Number of byte ranges of the split files. Defaults to 4.
+    timeout : int or None
+    auth : tuple or None
+        Passed to every request.
+    continuation : bool
+        Resume the downloads interrupted by an earlier run. Defaults to True.
+    cache : bool
+        Skip the files already downloaded with the expected size. Defaults to
+        False.
+    verbose : bool
+        Whether to show the progress of the downloads. Defaults to True.
+
+    Attributes
+    ----------
+    nbytes : int
+        Number of bytes received by the last `download`.
+    elapsed : float
+        Duration of the last `download` in seconds.
+    """
+
+    def __init__(self, session, *, max_workers=4, split_size=None, range_workers=4,
+                 timeout=None, auth=None, continuation=True, cache=False, verbose=True):
+        self.session = session
+        self.max_workers = max_workers
+        self.split_size = split_size
+        self.range_workers = range_workers
+        self.timeout = timeout
+        self.auth = auth
+        self.continuation = continuation
+        self.cache = cache
+        self.verbose = verbose
+        self.blocksize = astropy.utils.data.conf.download_block_size
+        self.nbytes = 0
+        self.elapsed = 0.
+        self._lock = threading.Lock()
+
+    def download(self, urls, local_filepaths, *, method="GET", return_exceptions=False, **kwargs):
+        """
+        Download each of ``urls`` to the matching path of ``local_filepaths``.
+
+        Parameters
+        ----------
+        urls : list of str
+        local_filepaths : list of str
+            The directories of the files must exist.
+        method : "GET" or "POST"
+        return_exceptions : bool
+            If True, the exception of a failed download is returned in place
+            of its path. Otherwise, the first failure is raised once the other
+            downloads have ended. Defaults to False.
+        **kwargs
+            Passed to every request, e.g. ``params``, ``data`` or ``headers``.
+
+        Returns
+        -------
+        local_filepaths : list
+            The paths of the downloaded files, in the order of ``urls``.
+        """
+        urls = list(urls)
+        local_filepaths = [str(local_filepath) for local_filepath in local_filepaths]
+        if len(urls) != len(local_filepaths):
+            raise ValueError("urls and local_filepaths must have the same length.")
+
+        self.nbytes = 0
+        start_time = time.monotonic()
+
+        # Only show progress bar if logging level is INFO or lower.
+        if log.getEffectiveLevel() <= 20 and self.verbose:
+            progress_stream = None  # Astropy default
+        else:
+            progress_stream = io.StringIO()
+
+        nfiles = len(set(local_filepaths))
+        futures = {}
+        with ProgressBarOrSpinner(nfiles, f'Downloading {nfiles} files ...',
+                                  file=progress_stream) as pb:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for url, local_filepath in zip(urls, local_filepaths):
+                    # The same file listed twice is only downloaded once
+                    if local_filepath not in futures:
+                        futures[local_filepath] = executor.submit(self._download_one, url,
+                                                                  local_filepath, method, kwargs)
+                for ii, future in enumerate(futures.values()):
+                    future.exception()
+                    pb.update(ii + 1)
+
+        self.elapsed = time.monotonic() - start_time
+        log.info(f"Downloaded {nfiles} files, {self.nbytes / 2**20:.1f} MB in "
+                 f"{self.elapsed:.1f} s ({self.nbytes / 2**20 / max(self.elapsed, 1e-6):.1f} MB/s)")
+
+        results = []
+        for local_filepath in local_filepaths:
+            exception = futures[local_filepath].exception()
+            if exception is not None:
+                if not return_exceptions:
+                    raise exception
+                results.append(exception)
+            else:
+                results.append(local_filepath)
+        return results
+
+    def _request(self, method, url, kwargs, byte_range=None):
+        headers = dict(kwargs.get('headers') or {})
+        if byte_range is not None:
+            start, end = byte_range
+            headers['Range'] = f"bytes={start}-{'' if end is None else end}"
+            log.debug(f"Requesting {url} with range={headers['Range']}")
+        response = self.session.request(method, url, timeout=self.timeout, auth=self.auth,
+                                        stream=True, **dict(kwargs, headers=headers))
+        response.raise_for_status()
+        return response
+
+    def _download_one(self, url, local_filepath, method, kwargs):
+        part_file = local_filepath + PART_SUFFIX
+        journal = _Journal(local_filepath + JOURNAL_SUFFIX)
+
+        if self.continuation and os.path.exists(part_file) and journal.load(url):
+            if len(journal.segments) == 1:
+                # The .part file of a single range holds exactly what was written
+                start, end, _ = journal.segments[0]
+                journal.segments[0][2] = min(os.stat(part_file).st_size, end + 1) - start
+            log.info(f"Continuing download of file {local_filepath}, with {journal.remaining} bytes to go")
+            self._fetch_segments(method, url, kwargs, part_file, journal)
+            length = journal.length
+        else:
+            response = self._request(method, url, kwargs)
+            length = _content_length(response)
+            if length == 0:
+                log.warning(f'URL {url} has length=0')
+
+            if self.cache and os.path.exists(local_filepath):
+                if length is not None and os.stat(local_filepath).st_size == length:
+                    log.info(f"Found cached file {local_filepath} with expected size {length}.")
+                    response.close()
+                    return local_filepath
+                log.warning(f"Found cached file {local_filepath} with unexpected size. "
+                            "Re-downloading the file.")
+
+            resumable = (length is not None and self.continuation
+                         and response.headers.get('Accept-Ranges', '').lower() == 'bytes')
+            if resumable and self.split_size and length > self.split_size and self.range_workers > 1:
+                response.close()
+                step = -(-length // self.range_workers)
+                segments = [[start, min(start + step, length) - 1, 0] for start in range(0, length, step)]
+                with open(part_file, 'wb') as f:
+                    f.truncate(length)
+                journal.start(url, length, segments)
+                self._fetch_segments(method, url, kwargs, part_file, journal)
+            else:
+                segment = [0, None if length is None else length - 1, 0]
+                open(part_file, 'wb').close()
+                if resumable:
+                    journal.start(url, length, [segment])
+                self._write(response, part_file, segment, journal if resumable else None)
+
+        if length is not None and os.stat(part_file).st_size != length:
+            raise RemoteServiceError(f"Download of {url} is incomplete: received "
+                                     f"{os.stat(part_file).st_size} of {length} bytes.")
+        os.replace(part_file, local_filepath)
+        journal.remove()
+        return local_filepath
+
+    def _fetch_segments(self, method, url, kwargs, part_file, journal):
+        segments = [segment for segment in journal.segments if segment[0] + segment[2] <= segment[1]]
+        if len(segments) == 1:
+            self._fetch_segment(method, url, kwargs, part_file, segments[0], journal)
+        elif segments:
+            with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+                futures = [executor.submit(self._fetch_segment, method, url, kwargs,
+                                           part_file, segment, journal)
+                           for segment in segments]
+            for future in futures:
+                future.result()
+
+    def _fetch_segment(self, method, url, kwargs, part_file, segment, journal):
+        start, end, done = segment
+        response = self._request(method, url, kwargs, byte_range=(start + done, end))
+        if response.status_code != 206:
+            if start != 0 or len(journal.segments) != 1:
+                response.close()
+                raise RemoteServiceError(f"The server did not honour the range request for {url}.")
+            # The whole file is sent again
+            log.info(f"Range requests not honoured for {url}, restarting the download.")
+            segment[2] = 0
+            open(part_file, 'wb').close()
+        self._write(response, part_file, segment, journal)
+
+    def _write(self, response, part_file, segment, journal):
+        start, end, done = segment
+        unsaved = 0
+        try:
+            with open(part_file, 'r+b') as f:
+                f.seek(start + done)
+                for block in response.iter_content(self.blocksize):
+                    if end is not None:
+                        block = block[:end + 1 - start - segment[2]]
+                    f.write(block)
+                    segment[2] += len(block)
+                    unsaved += len(block)
+                    with self._lock:
+                        self.nbytes += len(block)
+                    if journal is not None and unsaved >= _JOURNAL_INTERVAL:
+                        # Flush first, the journal must never claim unwritten bytes
+                        f.flush()
+                        journal.save()
+                        unsaved = 0
+        finally:
+            # Also record the progress of a failed or interrupted transfer
+            response.close()
+            if journal is not None:
+                journal.save()
@@ -24,6 +24,7 @@ from requests.models import Response
 
 from astroquery.esa.hubble import ESAHubbleClass
 import astroquery.esa.utils.utils as esautils
+from astroquery.utils.tap.conn.tapconn import close_connections
 from astroquery.esa.hubble.tests.dummy_tap_handler import DummyHubbleTapHandler
 from astropy.utils.exceptions import AstropyDeprecationWarning
 
@@ -744,12 +745,18 @@ class TestESAHubble:
                                output_format=parameters['output_format'],
                                verbose=parameters['verbose'])
 
-    @patch("http.client.HTTPSConnection")
+    @patch("astroquery.utils.tap.conn.tapconn._PooledHTTPSConnection")
     @patch("http.client.HTTPResponse")
     def test_show_messages(self, mock_conn, mock_res):
         mock_res.status = 400
         mock_conn.getresponse = MagicMock(return_value=mock_res)
-        ESAHubbleClass()
+        # Start and end with an empty shared pool, so that the mocked
+        # connection is created and dropped
+        close_connections()
+        try:
+            ESAHubbleClass()
+        finally:
+            close_connections()
         mock_res.assert_called()
 
     def test_get_datalabs_path(self):
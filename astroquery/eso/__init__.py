@@ -19,6 +19,9 @@ class Conf(_config.ConfigNamespace):
     query_instrument_url = _config.ConfigItem(
         "http://archive.eso.org/wdb/wdb/eso",
         'Root query URL for main and instrument queries.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Maximum number of headers downloaded at the same time by get_headers.')
 
 
 conf = Conf()
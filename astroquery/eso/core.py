@@ -2,6 +2,7 @@
 
 import base64
 import email
+import html
 import json
 import os.path
 import re
@@ -16,8 +17,10 @@ from typing import List, Optional, Tuple, Dict, Set
 
 import astropy.utils.data
 import keyring
+import numpy as np
 import requests.exceptions
-from astropy.table import Table, Column
+from astropy.io import fits
+from astropy.table import Table, Column, MaskedColumn
 from astropy.utils.decorators import deprecated_renamed_argument
 from bs4 import BeautifulSoup
 
@@ -43,6 +46,95 @@ def _check_response(content):
         return True
 
 
+def _parse_header_page(content):
+    """Parse the FITS header in the ``<pre>`` block of an archive header page.
+
+    Returns
+    -------
+    header : dict
+        The values of the keywords, the ``HIERARCH`` keywords being named as
+        in the header. Commentary and undefined cards and the lines without a
+        value indicator are left out; the cards that cannot be parsed are left
+        out with a warning.
+    """
+    text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    lower = text.lower()
+    start = lower.find('<pre')
+    if start < 0:
+        raise RemoteServiceError("No header found in the response of the ESO archive.")
+    start = lower.find('>', start) + 1
+    end = lower.find('</pre>', start)
+    # drop any link or tag in the block
+    text = html.unescape(re.sub(r'<[^>]*>', '', text[start:end if end >= 0 else None]))
+    header = {}
+    for line in text.splitlines():
+        line = line.rstrip()
+        if line == 'END':
+            break
+        # only the cards with a value indicator
+        if not (line[8:9] == '=' or (line.startswith('HIERARCH ') and '=' in line)):
+            continue
+        try:
+            keyword, value = _parse_card(line)
+        except (fits.VerifyError, ValueError):
+            warnings.warn(f"Skipping the header card {line!r}, which cannot be parsed.")
+            continue
+        if keyword in ('COMMENT', 'HISTORY') or isinstance(value, fits.card.Undefined):
+            continue
+        if len(keyword) > 8 or ' ' in keyword:
+            keyword = f'HIERARCH {keyword}'
+        header[keyword] = value
+    return header
+
+
+_CARD_VALUE = re.compile(r"\s*('(?:[^']|'')*'|[^/]*)")
+
+
+def _parse_card(line):
+    """The keyword and value of a header card.
+
+    astropy reads a line longer than 80 characters as a string value continued
+    on ``CONTINUE`` cards, so the comment of such a card is dropped first, and
+    a string value still too long is unquoted here.
+    """
+    if len(line) > 80:
+        keyword, _, value_comment = line.partition('=')
+        value = _CARD_VALUE.match(value_comment).group(1).strip()
+        if value.startswith("'") and len(keyword) + len(value) > 78:
+            card = fits.Card.fromstring(f"{keyword}= ''")
+            card.verify('exception')
+            return card.keyword, value[1:-1].replace("''", "'").rstrip()
+        line = f"{keyword}= {value}"
+    card = fits.Card.fromstring(line)
+    card.verify('exception')
+    return card.keyword, card.value
+
+
+def _headers_to_table(headers):
+    """A table of the ``headers`` dicts, with the keywords missing in some of
+    them masked.
+
+    The keywords with values of different types in different headers, other
+    than integers and floats, are kept in object columns."""
+    columns = []
+    # the columns in their order of appearance
+    for key in dict.fromkeys(key for header in headers for key in header):
+        values = [header.get(key) for header in headers]
+        mask = np.array([value is None for value in values])
+        present = [value for value in values if value is not None]
+        # numpy would turn e.g. True and 'T' into strings, and True and 1 into integers
+        types = {type(value) for value in present}
+        mixed = len(types) > 1 and not types <= {int, float}
+        present = np.array(present, dtype=object if mixed else None)
+        data = np.zeros(len(values), dtype=present.dtype)
+        data[~mask] = present
+        if mask.any():
+            columns.append(MaskedColumn(data, name=key, mask=mask))
+        else:
+            columns.append(Column(data, name=key))
+    return Table(columns)
+
+
 class CalSelectorError(Exception):
     """
     Raised on failure to parse CalSelector's response.
@@ -550,6 +642,9 @@ class EsoClass(QueryWithLogin):
         Note: The additional column ``'DP.ID'`` found in the returned table
         corresponds to the provided data product IDs.
 
+        The headers are downloaded concurrently, at most ``conf.max_workers``
+        at a time.
+
         Parameters
         ----------
         product_ids : either a list of strings or a `~astropy.table.Column`
@@ -562,56 +657,23 @@ class EsoClass(QueryWithLogin):
         -------
         result : `~astropy.table.Table`
             A table where: columns are header keywords, rows are product_ids.
+            The keywords missing in some of the headers are masked.
 
         """
         _schema_product_ids = schema.Schema(
             schema.Or(Column, [schema.Schema(str)]))
         _schema_product_ids.validate(product_ids)
-        # Get all headers
-        result = []
-        for dp_id in product_ids:
-            response = self._request(
-                "GET", "http://archive.eso.org/hdr?DpId={0}".format(dp_id),
-                cache=cache)
-            root = BeautifulSoup(response.content, 'html5lib')
-            hdr = root.select('pre')[0].text
-            header = {'DP.ID': dp_id}
-            for key_value in hdr.split('\n'):
-                if "=" in key_value:
-                    key, value = key_value.split('=', 1)
-                    key = key.strip()
-                    value = value.split('/', 1)[0].strip()
-                    if key[0:7] != "COMMENT":  # drop comments
-                        if value == "T":  # Convert boolean T to True
-                            value = True
-                        elif value == "F":  # Convert boolean F to False
-                            value = False
-                        # Convert to string, removing quotation marks
-                        elif value[0] == "'":
-                            value = value[1:-1]
-                        elif "." in value:  # Convert to float
-                            value = float(value)
-                        else:  # Convert to integer
-                            value = int(value)
-                        header[key] = value
-                elif key_value.startswith("END"):
-                    break
-            result.append(header)
-        # Identify all columns
-        columns = []
-        column_types = []
-        for header in result:
-            for key in header:
-                if key not in columns:
-                    columns.append(key)
-                    column_types.append(type(header[key]))
-        # Add all missing elements
-        for i in range(len(result)):
-            for (column, column_type) in zip(columns, column_types):
-                if column not in result[i]:
-                    result[i][column] = column_type()
-        # Return as Table
-        return Table(result)
+        headers = self.query_many('_get_header',
+                                  [{'dp_id': dp_id, 'cache': cache} for dp_id in product_ids],
+                                  max_workers=conf.max_workers)
+        return _headers_to_table(headers)
+
+    def _get_header(self, dp_id, *, cache=True):
+        """The header of the data product ``dp_id``, as a dict."""
+        response = self._request(
+            "GET", "http://archive.eso.org/hdr?DpId={0}".format(dp_id),
+            cache=cache)
+        return {'DP.ID': dp_id, **_parse_header_page(response.content)}
 
     @staticmethod
     def _get_filename_from_response(response: requests.Response) -> str:
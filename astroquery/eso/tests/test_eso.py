@@ -182,3 +182,55 @@ def test_calselector_multipart(monkeypatch, tmp_path):
     assert isinstance(result, list)
     assert len(result) == 99
     assert datasets[0] not in result and datasets[1] not in result
+
+
+HEADER_PAGE = """<html><body><h2>Header of {dp_id}</h2>
+<pre>
+SIMPLE  =                    T / Standard FITS
+BITPIX  =                   16 / Bits per pixel
+OBJECT  = 'NGC4151 / 1 '       / Original target
+{cards}HIERARCH ESO OCS TPL NFILE = {nfile} / Number of files
+HIERARCH ESO INS OPTI1 NAME = 'FILTER_N8.7 / narrow' / Name of the optical element in the beam
+HIERARCH ESO INS OPTI2 NAME = 'a name so long that its card goes on past the 80 characters' / Name
+some stray text in the header
+BADVAL  = abc / Unquoted string
+COMMENT <a href="http://archive.eso.org">ESO &amp; archive</a>
+END
+</pre></body></html>"""
+
+
+def header_request(method, url, **kwargs):
+    dp_id = url.split('DpId=')[1]
+    number = dp_id[-5]
+    cards = "EXPTIME =                 0.25 / Exposure time\n" if number == '1' else ""
+    # a keyword written with different types in different headers
+    cards += "HIERARCH ESO DET CHOP = {} / Chopping\n".format({'0': 'T', '1': "'T'", '2': '1'}.get(number, '2.5'))
+    content = HEADER_PAGE.format(dp_id=dp_id, cards=cards, nfile=number)
+    return MockResponse(content=content.encode(), url=url)
+
+
+def test_get_headers(monkeypatch):
+    eso = Eso()
+    monkeypatch.setattr(eso, '_request', header_request)
+    product_ids = [f'MIDI.2007-02-07T07:01:5{ii}.000' for ii in range(5)]
+    with pytest.warns(UserWarning, match="'BADVAL  = abc / Unquoted string', which cannot be parsed"):
+        result = eso.get_headers(product_ids)
+    # the stray line and the unparsable card are left out
+    assert result.colnames == ['DP.ID', 'SIMPLE', 'BITPIX', 'OBJECT', 'HIERARCH ESO DET CHOP',
+                               'HIERARCH ESO OCS TPL NFILE', 'HIERARCH ESO INS OPTI1 NAME',
+                               'HIERARCH ESO INS OPTI2 NAME', 'EXPTIME']
+    assert list(result['DP.ID']) == product_ids
+    assert result['SIMPLE'].dtype == bool and all(result['SIMPLE'])
+    assert list(result['OBJECT']) == ['NGC4151 / 1'] * 5
+    assert list(result['HIERARCH ESO OCS TPL NFILE']) == [0, 1, 2, 3, 4]
+    # the cards longer than 80 characters are kept
+    assert list(result['HIERARCH ESO INS OPTI1 NAME']) == ['FILTER_N8.7 / narrow'] * 5
+    assert list(result['HIERARCH ESO INS OPTI2 NAME']) == [
+        'a name so long that its card goes on past the 80 characters'] * 5
+    # the keywords missing in some headers are masked
+    assert list(result['EXPTIME'].mask) == [True, False, True, True, True]
+    assert result['EXPTIME'][1] == 0.25
+    # the values of different types are kept as they are
+    assert result['HIERARCH ESO DET CHOP'].dtype == object
+    assert list(result['HIERARCH ESO DET CHOP']) == [True, 'T', 1, 2.5, 2.5]
+    assert [type(value) for value in result['HIERARCH ESO DET CHOP']] == [bool, str, int, float, float]
@@ -49,9 +49,13 @@ class Conf(_config.ConfigNamespace):
 
     VALID_LINKING_PARAMETERS = {'SOURCE_ID', 'TRANSIT_ID', 'IMAGE_ID'}
 
+    DATALINK_MAX_IDS = _config.ConfigItem(5000,
+                                          "Maximum number of identifiers sent in a single "
+                                          "DataLink request by load_data.")
+
 
 conf = Conf()
 
-from .core import Gaia, GaiaClass
+from .core import Gaia, GaiaClass, DataLinkProducts
 
-__all__ = ['Gaia', 'GaiaClass', 'Conf', 'conf']
+__all__ = ['Gaia', 'GaiaClass', 'DataLinkProducts', 'Conf', 'conf']
@@ -9,11 +9,14 @@ European Space Agency (ESA)
 
 """
 import datetime
+import io
 import json
 import os
 import shutil
+import weakref
 import zipfile
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 from astropy import units
 from astropy import units as u
@@ -32,6 +35,123 @@ from astroquery.utils.tap import taputils
 from . import conf
 
 
+def _read_datalink_product(name, data):
+    """Reads the DataLink product ``name`` from the binary file ``data``"""
+    if name.endswith('.fits'):
+        tables = []
+        with fits.open(io.BytesIO(data.read())) as hduList:
+            num_hdus = len(hduList)
+            for i in range(1, num_hdus):
+                table = Table.read(hduList[i], format='fits')
+                GaiaClass.correct_table_units(table)
+                tables.append(table)
+        return tables
+
+    elif name.endswith('.xml'):
+        return list(votable.parse(data).iter_tables())
+
+    elif name.endswith('.csv'):
+        return [Table.read(data, format='ascii.csv', fast_reader=False)]
+
+    elif name.endswith('.ecsv'):
+        return [Table.read(data, format='ascii.ecsv')]
+
+    elif name.endswith('.json'):
+        content = data.read()
+        data_json = json.loads(content)
+
+        if data_json.get('data') and data_json.get('metadata'):
+
+            column_name = []
+            for column in data_json['metadata']:
+                column_name.append(column['name'])
+
+            result = Table(rows=data_json['data'], names=column_name, masked=True)
+
+            for v in data_json['metadata']:
+                col_name = v['name']
+                result[col_name].unit = v['unit']
+                result[col_name].description = v['description']
+                result[col_name].meta = {'metadata': v}
+
+            return result
+        else:
+            return [Table.read(io.BytesIO(content), format='pandas.json')]
+
+    return data.read()
+
+
+def _close_bundles(bundles, cleanup_dir):
+    for bundle in bundles:
+        bundle.close()
+    if cleanup_dir is not None:
+        shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+class DataLinkProducts(Mapping):
+    """
+    Read-only dictionary of the DataLink products returned by `GaiaClass.load_data`
+
+    The keys are the names of the files of the downloaded zip bundles. Each
+    product is read straight from its bundle, without extracting it, when it
+    is first accessed: a list of tables for the VOTable, FITS, CSV and ECSV
+    files, and the bytes of the files in other formats. The products of a
+    file present in several bundles are merged in a single list.
+
+    The bundles stay open until `close` is called, or the dictionary is used
+    as a context manager.
+    """
+
+    def __init__(self, zip_files, *, cleanup_dir=None):
+        """
+        Parameters
+        ----------
+        zip_files : list of str
+            the zip bundles
+        cleanup_dir : str, optional
+            directory removed, with the bundles in it, once closed
+        """
+        self._bundles = []
+        self._finalizer = weakref.finalize(self, _close_bundles, self._bundles, cleanup_dir)
+        self._members = {}
+        self._products = {}
+        for zip_file in zip_files:
+            bundle = zipfile.ZipFile(zip_file, "r")
+            self._bundles.append(bundle)
+            for info in bundle.infolist():
+                if not info.is_dir():
+                    self._members.setdefault(info.filename, []).append(bundle)
+
+    def __getitem__(self, name):
+        if name not in self._products:
+            products = []
+            for bundle in self._members[name]:
+                with bundle.open(name) as data:
+                    products.append(_read_datalink_product(name, data))
+            if len(products) == 1:
+                self._products[name] = products[0]
+            else:
+                self._products[name] = [product for value in products
+                                        for product in (value if isinstance(value, list) else [value])]
+        return self._products[name]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def close(self):
+        """Closes the bundles, and removes them if they were downloaded to a temporary directory"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 class GaiaClass(TapPlus):
     """
     Proxy class to default TapPlus object (pointing to Gaia Archive)
@@ -167,7 +287,7 @@ class GaiaClass(TapPlus):
     def load_data(self, ids, *, data_release=None, data_structure='INDIVIDUAL', retrieval_type="ALL",
                   linking_parameter='SOURCE_ID', valid_data=False, band=None, avoid_datatype_check=False,
                   format="votable", dump_to_file=False, overwrite_output_file=False, verbose=False,
-                  output_file=None):
+                  output_file=None, lazy=False, max_ids_per_request=None, max_workers=4):
         """Loads the specified table
         TAP+ only
 
@@ -220,6 +340,14 @@ class GaiaClass(TapPlus):
             To overwrite the output file ("datalink_output.zip") if it already exists.
         verbose : bool, optional, default 'False'
             flag to display information about the process
+        lazy : bool, optional, default False
+            If it is true, a `DataLinkProducts` dictionary is returned, which reads each product from the
+            downloaded bundle only when it is first accessed. Close it once done, to remove the bundle.
+        max_ids_per_request : int, optional, default ``conf.DATALINK_MAX_IDS``
+            A list of more ``ids`` is split in several requests, whose products are merged. With
+            ``dump_to_file``, each request is saved in its own "datalink_output_<time_stamp>_<n>.zip" file.
+        max_workers : int, optional, default 4
+            Maximum number of these requests run at the same time
 
         Returns
         -------
@@ -273,13 +401,17 @@ class GaiaClass(TapPlus):
             params_dict['VALID_DATA'] = "true"
 
         if isinstance(ids, str):
-            ids_arg = ids
+            ids_args = [ids]
         else:
             if isinstance(ids, int):
-                ids_arg = str(ids)
+                ids_args = [str(ids)]
             else:
-                ids_arg = ','.join(str(item) for item in ids)
-        params_dict['ID'] = ids_arg
+                ids = [str(item) for item in ids]
+                if max_ids_per_request is None:
+                    max_ids_per_request = conf.DATALINK_MAX_IDS
+                ids_args = [','.join(ids[i:i + max_ids_per_request])
+                            for i in range(0, max(len(ids), 1), max_ids_per_request)]
+        params_dict['ID'] = ids_args[0]
         if data_release is not None:
             params_dict['RELEASE'] = data_release
         params_dict['DATA_STRUCTURE'] = data_structure
@@ -295,22 +427,42 @@ class GaiaClass(TapPlus):
             if linking_parameter != 'SOURCE_ID':
                 params_dict['LINKING_PARAMETER'] = linking_parameter
 
-        files = dict()
+        if len(ids_args) == 1:
+            output_files = [output_file]
+        else:
+            root, ext = os.path.splitext(output_file)
+            output_files = [f"{root}_{i}{ext}" for i in range(len(ids_args))]
+            if output_file_specified and not overwrite_output_file:
+                for file in output_files:
+                    if os.path.exists(file):
+                        raise ValueError(f"{file} file already exists. Please use overwrite_output_file='True' to "
+                                         f"overwrite output file.")
+
+        def download(ids_arg, output_file):
+            self.__gaiadata.load_data(params_dict=dict(params_dict, ID=ids_arg), output_file=output_file,
+                                      verbose=verbose)
+
         try:
-            self.__gaiadata.load_data(params_dict=params_dict, output_file=output_file, verbose=verbose)
-            files = Gaia.__get_data_files(output_file=output_file, path=path)
-        except Exception as err:
-            raise err
-        finally:
+            if len(ids_args) == 1:
+                download(ids_args[0], output_file)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for future in [executor.submit(download, ids_arg, file)
+                                   for ids_arg, file in zip(ids_args, output_files)]:
+                        future.result()
+            files = DataLinkProducts(output_files, cleanup_dir=None if output_file_specified else path)
+        except Exception:
             if not output_file_specified:
                 shutil.rmtree(path)
-            else:
-                for file in files.keys():
-                    os.remove(os.path.join(os.getcwd(), path, file))
+            raise
+
+        if not lazy:
+            with files:
+                files = dict(files)
 
         if verbose:
             if output_file_specified:
-                log.info("output_file = %s" % output_file)
+                log.info("output_file = %s" % ", ".join(output_files))
 
         if log.isEnabledFor(20):
             log.debug("List of products available:")
@@ -319,71 +471,6 @@ class GaiaClass(TapPlus):
 
         return files
 
-    @staticmethod
-    def __get_data_files(output_file, path):
-        files = {}
-        extracted_files = []
-
-        with zipfile.ZipFile(output_file, "r") as zip_ref:
-            extracted_files.extend(zip_ref.namelist())
-            zip_ref.extractall(os.path.dirname(output_file))
-
-        # r=root, d=directories, f = files
-        for r, d, f in os.walk(path):
-            for file in f:
-                if file in extracted_files:
-                    files[file] = os.path.join(r, file)
-
-        for key, value in files.items():
-
-            if key.endswith('.fits'):
-                tables = []
-                with fits.open(value) as hduList:
-                    num_hdus = len(hduList)
-                    for i in range(1, num_hdus):
-                        table = Table.read(hduList[i], format='fits')
-                        Gaia.correct_table_units(table)
-                        tables.append(table)
-                    files[key] = tables
-
-            elif key.endswith('.xml'):
-                tables = []
-                for table in votable.parse(value).iter_tables():
-                    tables.append(table)
-                files[key] = tables
-
-            elif key.endswith('.csv'):
-                tables = []
-                table = Table.read(value, format='ascii.csv', fast_reader=False)
-                tables.append(table)
-                files[key] = tables
-
-            elif key.endswith('.json'):
-                tables = []
-                with open(value) as f:
-                    data = json.load(f)
-
-                    if data.get('data') and data.get('metadata'):
-
-                        column_name = []
-                        for name in data['metadata']:
-                            column_name.append(name['name'])
-
-                        result = Table(rows=data['data'], names=column_name, masked=True)
-
-                        for v in data['metadata']:
-                            col_name = v['name']
-                            result[col_name].unit = v['unit']
-                            result[col_name].description = v['description']
-                            result[col_name].meta = {'metadata': v}
-
-                        files[key] = result
-                    else:
-                        tables.append(Table.read(value, format='pandas.json'))
-                        files[key] = tables
-
-        return files
-
     def get_datalinks(self, ids, *, linking_parameter='SOURCE_ID', verbose=False):
         """Gets datalinks associated to the provided identifiers
         TAP+ only
@@ -31,7 +31,7 @@ from astropy.utils.exceptions import AstropyDeprecationWarning
 from requests import HTTPError
 
 from astroquery.gaia import conf
-from astroquery.gaia.core import GaiaClass
+from astroquery.gaia.core import DataLinkProducts, GaiaClass
 from astroquery.utils.commons import ASTROPY_LT_7_1_1
 from astroquery.utils.tap.conn.tests.DummyConnHandler import DummyConnHandler
 from astroquery.utils.tap.conn.tests.DummyResponse import DummyResponse
@@ -1181,6 +1181,49 @@ def test_load_data_ecsv(monkeypatch, tmp_path, tmp_path_factory, patch_datetime_
     path.unlink()
 
 
+def test_load_data_lazy(monkeypatch, patch_datetime_now):
+    output_files = []
+
+    def load_data_monkeypatched(self, params_dict, output_file, verbose):
+        output_files.append(output_file)
+        Path(output_file).write_bytes(Path(DL_PRODUCTS_VOT).read_bytes())
+
+    monkeypatch.setattr(TapPlus, "load_data", load_data_monkeypatched)
+
+    with GAIA_QUERIER.load_data(ids=[5937083312263887616], retrieval_type="ALL", lazy=True) as result:
+        assert isinstance(result, DataLinkProducts)
+        assert sorted(result) == ['MCMC_MSC-Gaia DR3 5937083312263887616.xml',
+                                  'XP_CONTINUOUS-Gaia DR3 5937083312263887616.xml',
+                                  'XP_SAMPLED-Gaia DR3 5937083312263887616.xml']
+        # The products are not extracted
+        temp_dir = Path(output_files[0]).parent
+        assert list(temp_dir.iterdir()) == [Path(output_files[0])]
+        tables = result['XP_SAMPLED-Gaia DR3 5937083312263887616.xml']
+        assert len(tables) == 1
+        assert result['XP_SAMPLED-Gaia DR3 5937083312263887616.xml'] is tables
+
+    assert not temp_dir.exists()
+
+
+def test_load_data_chunked(monkeypatch, patch_datetime_now):
+    requested_ids = []
+
+    def load_data_monkeypatched(self, params_dict, output_file, verbose):
+        requested_ids.append(params_dict["ID"])
+        Path(output_file).write_bytes(Path(DL_PRODUCTS_VOT).read_bytes())
+
+    monkeypatch.setattr(TapPlus, "load_data", load_data_monkeypatched)
+
+    result = GAIA_QUERIER.load_data(ids=[1, 2, 3, 4, 5], retrieval_type="ALL", max_ids_per_request=2,
+                                    max_workers=3)
+
+    assert sorted(requested_ids) == ["1,2", "3,4", "5"]
+    assert len(result) == 3
+    # The products of the three requests are merged
+    assert len(result['MCMC_MSC-Gaia DR3 5937083312263887616.xml']) == 3
+    assert not [f for f in os.listdir(os.getcwd()) if f.startswith("temp_")]
+
+
 def test_load_data_linking_parameter(monkeypatch, tmp_path, patch_datetime_now):
     assert datetime.datetime.now(datetime.timezone.utc) == FAKE_TIME
 
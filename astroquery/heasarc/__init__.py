@@ -37,6 +37,19 @@ class Conf(_config.ConfigNamespace):
         'The name of the AWS S3 bucket that contain the HEASARC data'
     )
 
+    max_batch_size = _config.ConfigItem(
+        2**31,
+        'Maximum total size, in bytes, of the files downloaded with one tar '
+        'request by download_data(..., stream=True).'
+    )
+
+    max_workers = _config.ConfigItem(
+        4,
+        'Maximum number of transfers running at the same time in '
+        'download_data: tar requests with stream=True, S3 downloads and '
+        'SciServer copies.'
+    )
+
 
 conf = Conf()
 
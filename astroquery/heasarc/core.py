@@ -1,5 +1,9 @@
 
+import hashlib
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import shutil
 import requests
@@ -9,6 +13,7 @@ import numpy as np
 from astropy.table import Table, Row
 from astropy import coordinates
 from astropy import units as u
+from astropy.utils.console import ProgressBarOrSpinner
 from astropy.utils.decorators import deprecated, deprecated_renamed_argument
 
 import pyvo
@@ -52,6 +57,14 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
             self._session = self._tap._session
         return self._tap
 
+    def _ensure_tap(self):
+        """Create the TAP service, and the session it sets up, if needed.
+
+        Called before copies of this instance run concurrent requests, so that
+        they all share the same service and session.
+        """
+        return self.tap
+
     @property
     def _meta(self):
         """Queries and holds meta-information about the catalogs.
@@ -586,7 +599,7 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
 
         self.s3_client = self.s3_resource.meta.client
 
-    def download_data(self, links, host='heasarc', location='.'):
+    def download_data(self, links, host='heasarc', location='.', *, stream=False):
         """Download data products in links with a choice of getting the
         data from either the heasarc server, sciserver, or the cloud in AWS.
 
@@ -604,11 +617,18 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
         location : str
             local folder where the downloaded file will be saved.
             Default is current working directory
+        stream : bool
+            Only used with host == 'heasarc'. If True, the links are split
+            in batches of at most ``conf.max_batch_size`` bytes, downloaded
+            concurrently (``conf.max_workers`` at a time), and extracted
+            as they arrive, without writing the tar files to disk. The
+            completed batches are recorded in ``location``, so that calling
+            again after an interruption only downloads the missing data.
 
         Note that ff you are downloading large datasets (more 10 10GB),
         from the main heasarc server, it is recommended that you split
-        it up, so that if the downloaded is interrupted, you do not need
-        to start again.
+        it up, or use ``stream=True``, so that if the downloaded is
+        interrupted, you do not need to start again.
         """
 
         if len(links) == 0:
@@ -634,7 +654,10 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
         if host == 'heasarc':
 
             log.info('Downloading data from the HEASARC ...')
-            self._download_heasarc(links, location)
+            if stream:
+                self._download_heasarc_stream(links, location)
+            else:
+                self._download_heasarc(links, location)
 
         elif host == 'sciserver':
 
@@ -668,7 +691,8 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
                 warnings.warn(
                     f"The size of the requested file is large {size:.3f} GB. "
                     "If the download is interrupted, you may need to start "
-                    "again. Consider downloading the data in chunks."
+                    "again. Consider downloading the data in chunks, or "
+                    "with stream=True."
                 )
 
         file_list = [f"/FTP/{link.split('FTP/')[1]}"
@@ -703,6 +727,101 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
                 'An error occurred when downloading the data. Retry again.'
             )
 
+    def _download_heasarc_stream(self, links, location='.'):
+        """Download data from the heasarc main server in concurrent batches,
+        extracting the tar stream of each batch as it arrives
+
+        Do not call directly.
+        Users should be using `~self.download_data` instead
+
+        Parameters
+        ----------
+        links : `astropy.table.Table`
+            The result from locate_data
+        location : str
+            local folder where the downloaded files will be saved.
+            Default is current working directory
+
+        """
+        os.makedirs(location, exist_ok=True)
+
+        # the files of the completed batches of a previous, interrupted call
+        record = f'{location}/heasarc-data.done'
+        done = set()
+        if os.path.exists(record):
+            with open(record) as fin:
+                done = set(fin.read().split('\n'))
+
+        file_list = [f"/FTP/{link.split('FTP/')[1]}"
+                     for link in links['access_url']]
+        if 'content_length' in links.colnames:
+            sizes = np.ma.filled(links['content_length'], 0)
+        else:
+            sizes = [0] * len(file_list)
+        todo = [(name, size) for name, size in zip(file_list, sizes)
+                if name not in done]
+        if len(todo) < len(file_list):
+            log.info(f'Skipping {len(file_list) - len(todo)} files downloaded '
+                     'by a previous call ...')
+
+        batches = _batch_files(todo, conf.max_batch_size)
+        # the session is set up with the TAP service; the concurrent
+        # downloads run with copies of it
+        self._ensure_tap()
+        log.info(f'Downloading {len(batches)} batches to {location} ...')
+        errors = []
+        with open(record, 'a') as fout:
+            results = self.query_many(
+                '_extract_tar_batch',
+                [{'files': batch, 'location': location} for batch in batches],
+                max_workers=conf.max_workers, ordered=False,
+                return_exceptions=True)
+            for _, result in results:
+                if isinstance(result, Exception):
+                    errors.append(result)
+                else:
+                    fout.write(''.join(f'{name}\n' for name in result))
+                    fout.flush()
+        if errors:
+            raise errors[0]
+        os.remove(record)
+
+    def _extract_tar_batch(self, files, location='.'):
+        """Download ``files`` with xamin's tar servlet, and extract the
+        tar stream as it arrives
+
+        Do not call directly.
+        Users should be using `~self.download_data` instead
+
+        Returns
+        -------
+        files : list
+            The downloaded files.
+        """
+        params = {
+            'files': f'>{"&&>".join(files)}&&',
+            'filter': ''
+        }
+        response = self._request('POST', self.TAR_URL, data=params,
+                                 timeout=self.timeout, stream=True,
+                                 cache=False)
+        with response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            try:
+                with tarfile.open(fileobj=response.raw, mode='r|') as tfile:
+                    for member in tfile:
+                        # other batches are extracted to the same tree at the
+                        # same time; create the parent directories race-free
+                        os.makedirs(os.path.join(location, os.path.dirname(member.name)),
+                                    exist_ok=True)
+                        tfile.extract(member, path=location, filter="fully_trusted")
+            except tarfile.TarError as ex:
+                raise ValueError(
+                    'An error occurred when downloading the data. Retry again.'
+                ) from ex
+        return files
+
     def _copy_sciserver(self, links, location='.'):
         """Copy data from the local archive on sciserver
 
@@ -719,6 +838,7 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
         # make sure the output folder exits
         os.makedirs(location, exist_ok=True)
 
+        transfers = []
         for link in links['sciserver']:
             link = str(link)
             log.info(f'Copying to {link} from the data drive ...')
@@ -731,9 +851,27 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
                 )
             if os.path.isdir(link):
                 download_dir = os.path.basename(link.strip('/'))
-                shutil.copytree(link, f'{location}/{download_dir}')
+                for root, _, files in os.walk(link):
+                    local = os.path.normpath(os.path.join(location, download_dir,
+                                                          os.path.relpath(root, link)))
+                    os.makedirs(local, exist_ok=True)
+                    transfers.extend((os.path.join(root, name), os.path.join(local, name))
+                                     for name in files)
             else:
-                shutil.copy(link, location)
+                transfers.append((link, os.path.join(location, os.path.basename(link))))
+
+        # skip the files copied before: copy2 keeps the modification time
+        todo = []
+        for source, dest in transfers:
+            source_stat = os.stat(source)
+            try:
+                dest_stat = os.stat(dest)
+            except FileNotFoundError:
+                dest_stat = None
+            if (dest_stat is None or dest_stat.st_size != source_stat.st_size
+                    or int(dest_stat.st_mtime) != int(source_stat.st_mtime)):
+                todo.append((source, dest, source_stat.st_size))
+        _run_transfers(todo, shutil.copy2, skipped=len(transfers) - len(todo))
 
     def _download_s3(self, links, location='.'):
         """Download data from AWS S3
@@ -743,27 +881,136 @@ class HeasarcClass(BaseVOQuery, BaseQuery):
         Users should be using `~self.download_data` instead
 
         """
+        from boto3.s3.transfer import TransferConfig
+
         keys_list = [link for link in links['aws']]
         if not hasattr(self, 's3_resource'):
             # all the data is public for now; no profile is needed
             self.enable_cloud(provider='aws', profile=None)
 
-        def _s3_tree_download(client, bucket_name, path, local):
-            """Download nested keys from s3"""
-            response = client.list_objects_v2(Bucket=bucket_name, Prefix=path)
-            content = response.get('Contents', [])
-            for obj in content:
-                key = obj['Key']
-                path2 = '/'.join(path.strip('/').split('/')[:-1])
-                dest = os.path.join(local, key[len(path2)+1:])
-                os.makedirs(os.path.dirname(dest), exist_ok=True)
-                client.download_file(bucket_name, key, dest)
-
-        # loop through the requested links
+        # list the objects under the requested keys, following the pages of
+        # more than 1000 objects
+        transfers = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
         for key in keys_list:
             log.info(f'downloading {key}')
             path = key.replace(f's3://{self.S3_BUCKET}/', '')
-            _s3_tree_download(self.s3_client, self.S3_BUCKET, path, location)
+            path2 = '/'.join(path.strip('/').split('/')[:-1])
+            for page in paginator.paginate(Bucket=self.S3_BUCKET, Prefix=path):
+                for obj in page.get('Contents', []):
+                    dest = os.path.join(location, obj['Key'][len(path2)+1:])
+                    transfers.append((obj['Key'], dest, obj['Size'], obj.get('ETag', '')))
+
+        todo = []
+        for key, dest, size, etag in transfers:
+            if not (os.path.isfile(dest) and os.path.getsize(dest) == size
+                    and _etag_matches(dest, etag)):
+                os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+                todo.append((key, dest, size))
+
+        # large objects are downloaded as parts fetched in parallel
+        config = TransferConfig(max_concurrency=conf.max_workers)
+
+        def download(key, dest):
+            self.s3_client.download_file(self.S3_BUCKET, key, dest, Config=config)
+
+        _run_transfers(todo, download, skipped=len(transfers) - len(todo))
+
+
+def _run_transfers(transfers, copy, *, skipped=0):
+    """Run ``copy(source, dest)`` for the ``(source, dest, size)`` triplets
+    of ``transfers``, ``conf.max_workers`` at a time, showing the progress.
+    The first error is raised once all the transfers have ended.
+
+    The transfers are S3 downloads with boto3, or copies of SciServer files,
+    so they do not go through `~astroquery.downloads.DownloadManager`, which
+    only sends HTTP requests.
+    """
+    if skipped:
+        log.info(f'Skipping {skipped} files already present ...')
+    if not transfers:
+        return
+
+    # Only show progress bar if logging level is INFO or lower.
+    progress_stream = None if log.getEffectiveLevel() <= 20 else io.StringIO()
+    start = time.monotonic()
+    with ProgressBarOrSpinner(len(transfers), f'Transferring {len(transfers)} files ...',
+                              file=progress_stream) as pb:
+        with ThreadPoolExecutor(max_workers=conf.max_workers) as executor:
+            futures = {executor.submit(copy, source, dest): size
+                       for source, dest, size in transfers}
+            for ii, future in enumerate(as_completed(futures)):
+                pb.update(ii + 1)
+    elapsed = time.monotonic() - start
+
+    nbytes = sum(size for future, size in futures.items() if future.exception() is None)
+    log.info(f"Transferred {len(transfers)} files, {nbytes / 2**20:.1f} MB in "
+             f"{elapsed:.1f} s ({nbytes / 2**20 / max(elapsed, 1e-6):.1f} MB/s)")
+    for future in futures:
+        future.result()
+
+
+def _etag_matches(path, etag):
+    """Whether the local file ``path`` has the S3 ``etag``.
+
+    The ETag of an object uploaded at once is the MD5 of its content. For a
+    multipart upload, it is the MD5 of the MD5s of the parts, followed by
+    ``-<number of parts>``; the part size is not recorded, so the default of
+    the AWS tools, 8 MiB, and the smallest size in whole MiB giving that
+    number of parts are tried.
+    """
+    digest, _, nparts = etag.strip('"').partition('-')
+    size = os.path.getsize(path)
+    if not nparts:
+        return _md5_parts(path, max(size, 1))[0].hex() == digest
+
+    nparts = int(nparts)
+    smallest = -(-size // nparts)
+    for part_size in {8 * 2**20, -(-smallest // 2**20) * 2**20}:
+        if -(-size // part_size) == nparts:
+            parts = _md5_parts(path, part_size)
+            if hashlib.md5(b''.join(parts), usedforsecurity=False).hexdigest() == digest:
+                return True
+    return False
+
+
+def _md5_parts(path, part_size, *, blocksize=2**20):
+    """The MD5 digests of the consecutive ``part_size`` bytes parts of the
+    file ``path``; a single digest for an empty file."""
+    digests = []
+    with open(path, 'rb') as fin:
+        while True:
+            md5 = hashlib.md5(usedforsecurity=False)
+            remaining = part_size
+            while remaining:
+                block = fin.read(min(blocksize, remaining))
+                if not block:
+                    break
+                md5.update(block)
+                remaining -= len(block)
+            if remaining == part_size and digests:
+                return digests
+            digests.append(md5.digest())
+            if remaining:
+                return digests
+
+
+def _batch_files(files, max_size):
+    """Split the ``(name, size)`` pairs of ``files`` in consecutive batches
+    of names with a total size of at most ``max_size``; a larger file is a
+    batch on its own.
+    """
+    batches = []
+    batch, batch_size = [], 0
+    for name, size in files:
+        if batch and batch_size + size > max_size:
+            batches.append(batch)
+            batch, batch_size = [], 0
+        batch.append(name)
+        batch_size += size
+    if batch:
+        batches.append(batch)
+    return batches
 
 
 Heasarc = HeasarcClass()
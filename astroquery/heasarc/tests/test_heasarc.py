@@ -1,14 +1,19 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
+import hashlib
+import io
 import os
 import pytest
+import tarfile
 import tempfile
 from unittest.mock import patch, PropertyMock
 from astropy.coordinates import SkyCoord
 from astropy.table import Table
 import astropy.units as u
 
-from astroquery.heasarc import Heasarc, HeasarcClass
+from astroquery.heasarc import Heasarc, HeasarcClass, conf
+from astroquery.heasarc.core import _batch_files, _etag_matches
+from astroquery.utils.mocks import MockResponse
 from astroquery.exceptions import InvalidQueryError
 
 try:
@@ -387,6 +392,112 @@ def test_download_data__exclude_rows_with_errors():
         assert not os.path.exists(f'{downloaddir}/data/file.txt')
 
 
+def test_download_data__sciserver_skip_copied():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        datadir = f'{tmpdir}/data'
+        downloaddir = f'{tmpdir}/download'
+        os.makedirs(f'{datadir}/sub', exist_ok=True)
+        for name in ['file.txt', 'sub/file.txt']:
+            with open(f'{datadir}/{name}', 'w') as fp:
+                fp.write('data')
+        tab = Table({'sciserver': [datadir]})
+        with patch('os.path.exists') as exists:
+            exists.return_value = True
+            Heasarc.download_data(tab, host="sciserver", location=downloaddir)
+            assert os.path.exists(f'{downloaddir}/data/sub/file.txt')
+
+            # same size and modification time: not copied again
+            with open(f'{downloaddir}/data/sub/file.txt', 'w') as fp:
+                fp.write('copy')
+            stat = os.stat(f'{datadir}/sub/file.txt')
+            os.utime(f'{downloaddir}/data/sub/file.txt', ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            Heasarc.download_data(tab, host="sciserver", location=downloaddir)
+            with open(f'{downloaddir}/data/sub/file.txt') as fp:
+                assert fp.read() == 'copy'
+
+            # a modified source is copied again
+            os.utime(f'{datadir}/sub/file.txt', (stat.st_atime + 10, stat.st_mtime + 10))
+            Heasarc.download_data(tab, host="sciserver", location=downloaddir)
+            with open(f'{downloaddir}/data/sub/file.txt') as fp:
+                assert fp.read() == 'data'
+
+
+def test_etag_matches(tmp_path):
+    content = os.urandom(3 * 2**20 + 5)
+    path = tmp_path / 'file'
+    path.write_bytes(content)
+
+    assert _etag_matches(path, f'"{hashlib.md5(content).hexdigest()}"')
+    assert not _etag_matches(path, f'"{hashlib.md5(content[:-1]).hexdigest()}"')
+
+    # multipart upload with 1 MiB parts
+    parts = [hashlib.md5(content[i:i + 2**20]).digest() for i in range(0, len(content), 2**20)]
+    etag = f'"{hashlib.md5(b"".join(parts)).hexdigest()}-{len(parts)}"'
+    assert _etag_matches(path, etag)
+    assert not _etag_matches(path, etag.replace('-4', '-5'))
+
+    empty = tmp_path / 'empty'
+    empty.write_bytes(b'')
+    assert _etag_matches(empty, hashlib.md5(b'').hexdigest())
+
+
+def test_batch_files():
+    files = [('a', 3), ('b', 3), ('c', 5), ('d', 1), ('e', 9), ('f', 0)]
+    assert _batch_files(files, 6) == [['a', 'b'], ['c', 'd'], ['e'], ['f']]
+    assert _batch_files(files, 100) == [['a', 'b', 'c', 'd', 'e', 'f']]
+    assert _batch_files([], 6) == []
+
+
+def test_download_data__stream(monkeypatch):
+    requested = []
+    broken = {'/FTP/obs/b/file.txt'}
+
+    def tar_request(self, method, url, data=None, **kwargs):
+        files = data['files'].strip('>&').split('&&>')
+        requested.append(files)
+        content = io.BytesIO()
+        with tarfile.open(fileobj=content, mode='w') as tfile:
+            for name in files:
+                body = name.encode()
+                info = tarfile.TarInfo(name.replace('/FTP/', ''))
+                info.size = len(body)
+                tfile.addfile(info, io.BytesIO(body))
+        content = content.getvalue()
+        if broken & set(files):
+            content = content[:100]
+        response = MockResponse(content)
+        response.raw = io.BytesIO(content)
+        return response
+
+    monkeypatch.setattr(HeasarcClass, '_request', tar_request)
+    monkeypatch.setattr(conf, 'max_batch_size', 20)
+    names = ['a', 'b', 'c', 'd', 'e']
+    links = Table({'access_url': [f'https://heasarc.gsfc.nasa.gov/FTP/obs/{name}/file.txt'
+                                  for name in names],
+                   'content_length': [10] * 5})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # the batch holding the broken file fails; the others are recorded
+        with pytest.raises(ValueError, match='An error occurred'):
+            Heasarc.download_data(links, location=tmpdir, stream=True)
+        assert sorted(requested) == [['/FTP/obs/a/file.txt', '/FTP/obs/b/file.txt'],
+                                     ['/FTP/obs/c/file.txt', '/FTP/obs/d/file.txt'],
+                                     ['/FTP/obs/e/file.txt']]
+        with open(f'{tmpdir}/heasarc-data.done') as fin:
+            assert sorted(fin.read().split()) == ['/FTP/obs/c/file.txt', '/FTP/obs/d/file.txt',
+                                                  '/FTP/obs/e/file.txt']
+
+        # a rerun only downloads the missing batch
+        broken.clear()
+        requested.clear()
+        Heasarc.download_data(links, location=tmpdir, stream=True)
+        assert requested == [['/FTP/obs/a/file.txt', '/FTP/obs/b/file.txt']]
+        assert not os.path.exists(f'{tmpdir}/heasarc-data.done')
+        for name in names:
+            with open(f'{tmpdir}/obs/{name}/file.txt') as fin:
+                assert fin.read() == f'/FTP/obs/{name}/file.txt'
+
+
 # S3 mock tests
 s3_bucket = "nasa-heasarc"
 s3_key1 = "some/location/file1.txt"
@@ -440,3 +551,20 @@ def test_s3_mock_directory(s3_mock):
         assert os.path.exists(f"{tmpdir}/location/file1.txt")
         assert os.path.exists(f"{tmpdir}/location/sub/file2.txt")
         assert os.path.exists(f"{tmpdir}/location/sub/sub2/file3.txt")
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.skipif("not DO_AWS_S3")
+def test_s3_mock_skip_present(s3_mock):
+    links = Table({"aws": [f"s3://{s3_bucket}/{s3_dir}"]})
+    Heasarc.enable_cloud(profile=False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Heasarc.download_data(links, host="aws", location=tmpdir)
+        with patch.object(Heasarc.s3_client, 'download_file') as download_file:
+            Heasarc.download_data(links, host="aws", location=tmpdir)
+            assert download_file.call_count == 0
+
+            with open(f"{tmpdir}/location/sub/file2.txt", "w") as fp:
+                fp.write("my other CONTENT")
+            Heasarc.download_data(links, host="aws", location=tmpdir)
+            assert download_file.call_count == 1
@@ -24,6 +24,16 @@ class Conf(_config.ConfigNamespace):
         30,
         'Time limit for connecting to JPL servers.')
 
+    max_url_length = _config.ConfigItem(
+        2000,
+        'Maximum length of the URL of a query. Longer lists of epochs are '
+        'split in several queries.')
+
+    max_workers = _config.ConfigItem(
+        4,
+        'Maximum number of queries sent at the same time to JPL Horizons for '
+        'long lists of epochs or of targets.')
+
     # JPL Horizons settings
 
     # quantities queried in ephemerides query (see
@@ -3,14 +3,15 @@
 # 1. standard library imports
 from collections import OrderedDict
 from typing import Mapping
+from urllib.parse import quote_plus, urlencode
 import warnings
 
 # 2. third party imports
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
 from numpy import nan
 from numpy import isnan
 from numpy import ndarray
-from astropy.table import Table, Column
+from astropy.table import Table, Column, vstack
 from astropy.io import ascii
 from astropy.time import Time
 from astropy import units as u
@@ -21,6 +22,7 @@ from astropy.utils.decorators import deprecated_renamed_argument, deprecated_att
 # commonly required local imports shown below as example
 # all Query classes should inherit from BaseQuery.
 from ..query import BaseQuery
+from ..exceptions import NoResultsWarning
 # async_to_sync generates the relevant query tools from _async methods
 from ..utils import async_to_sync
 # import configurable items declared in __init__.py
@@ -52,10 +54,11 @@ class HorizonsClass(BaseQuery):
         Parameters
         ----------
 
-        id : str or dict, required
+        id : str, dict or list, required
             Name, number, or designation of target object. Uses the same codes
-            as JPL Horizons. Arbitrary topocentric coordinates can be added in a
-            dict. The dict has to be of the form {``'lon'``: longitude in deg
+            as JPL Horizons. A list of targets is queried target by target,
+            and their results stacked in one table. Arbitrary topocentric
+            coordinates can be added in a dict. The dict has to be of the form {``'lon'``: longitude in deg
             (East positive, West negative), ``'lat'``: latitude in deg (North
             positive, South negative), ``'elevation'``: elevation in km above
             the reference ellipsoid, [``'body'``: Horizons body ID of the
@@ -191,6 +194,10 @@ class HorizonsClass(BaseQuery):
         # values as given
         if isinstance(_id, Mapping):
             self._id = self._prep_loc_dict(dict(_id), "id")
+        elif isinstance(_id, (list, tuple, ndarray)):
+            self._id = [self._prep_loc_dict(dict(target_id), "id")
+                        if isinstance(target_id, Mapping) else target_id
+                        for target_id in _id]
         else:
             self._id = _id
 
@@ -571,7 +578,7 @@ class HorizonsClass(BaseQuery):
 
         get_query_payload : boolean, optional
             When set to `True` the method returns the HTTP request parameters as
-            a dict, default: False
+            a dict, or a list of dicts for a list of targets, default: False
 
         get_raw_response : boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the data
@@ -615,35 +622,17 @@ class HorizonsClass(BaseQuery):
 
         URL = conf.horizons_server
 
-        # check for required information and assemble commanddline stub
+        # check for required information and assemble commandlines
         if self.id is None:
             raise ValueError("'id' parameter not set. Query aborted.")
-        elif isinstance(self.id, dict):
-            commandline = self._format_id_coords(self.id)
-        else:
-            commandline = str(self.id)
+        commandlines = [self._format_commandline(target_id, closest_apparition,
+                                                 no_fragments)
+                        for target_id in self._target_ids()]
+        commandline = commandlines[0]
         if self.location is None:
             self.location = '500@399'
         if self.epochs is None:
             self.epochs = Time.now().jd
-        # expand commandline based on self.id_type
-
-        if self.id_type in ['designation', 'name',
-                            'asteroid_name', 'comet_name']:
-            commandline = ({'designation': 'DES=',
-                            'name': 'NAME=',
-                            'asteroid_name': 'ASTNAM=',
-                            'comet_name': 'COMNAM='}[self.id_type] + commandline)
-        if self.id_type in ['smallbody', 'asteroid_name',
-                            'comet_name', 'designation']:
-            commandline += ';'
-            if isinstance(closest_apparition, bool):
-                if closest_apparition:
-                    commandline += ' CAP;'
-            else:
-                commandline += ' CAP{:s};'.format(closest_apparition)
-            if no_fragments:
-                commandline += ' NOFRAG;'
 
         request_payload = OrderedDict([
             ('format', 'text'),
@@ -703,6 +692,9 @@ class HorizonsClass(BaseQuery):
 
         # return request_payload if desired
         if get_query_payload:
+            if isinstance(self.id, list):
+                return [{**request_payload, 'COMMAND': '"' + commandline + '"'}
+                        for commandline in commandlines]
             return request_payload
 
         # set return_raw flag, if raw response desired
@@ -710,18 +702,7 @@ class HorizonsClass(BaseQuery):
             self.return_raw = True
 
         # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
-
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The uri used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
-
-        return response
+        return self._send_queries(URL, request_payload, commandlines, cache=cache)
 
     @deprecated_renamed_argument("get_raw_response", None, since="0.4.7",
                                  alternative="async methods")
@@ -823,7 +804,7 @@ class HorizonsClass(BaseQuery):
 
         get_query_payload : boolean, optional
             When set to ``True`` the method returns the HTTP request parameters
-            as a dict, default: False
+            as a dict, or a list of dicts for a list of targets, default: False
 
         get_raw_response: boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the data
@@ -858,37 +839,19 @@ class HorizonsClass(BaseQuery):
 
         URL = conf.horizons_server
 
-        # check for required information and assemble commandline stub
+        # check for required information and assemble commandlines
         if self.id is None:
             raise ValueError("'id' parameter not set. Query aborted.")
-        elif isinstance(self.id, dict):
-            commandline = self._format_id_coords(self.id)
-        else:
-            commandline = str(self.id)
+        commandlines = [self._format_commandline(target_id, closest_apparition,
+                                                 no_fragments)
+                        for target_id in self._target_ids()]
+        commandline = commandlines[0]
 
         if self.location is None:
             self.location = '500@10'
         if self.epochs is None:
             self.epochs = Time.now().jd
 
-        # expand commandline based on self.id_type
-        if self.id_type in ['designation', 'name',
-                            'asteroid_name', 'comet_name']:
-            commandline = ({'designation': 'DES=',
-                            'name': 'NAME=',
-                            'asteroid_name': 'ASTNAM=',
-                            'comet_name': 'COMNAM='}[self.id_type] + commandline)
-        if self.id_type in ['smallbody', 'asteroid_name',
-                            'comet_name', 'designation']:
-            commandline += ';'
-            if isinstance(closest_apparition, bool):
-                if closest_apparition:
-                    commandline += ' CAP;'
-            else:
-                commandline += ' CAP{:s};'.format(closest_apparition)
-            if no_fragments:
-                commandline += ' NOFRAG;'
-
         if isinstance(self.location, dict):
             raise ValueError(('cannot use topographic position in orbital '
                               'elements query'))
@@ -934,6 +897,9 @@ class HorizonsClass(BaseQuery):
 
         # return request_payload if desired
         if get_query_payload:
+            if isinstance(self.id, list):
+                return [{**request_payload, 'COMMAND': '"' + commandline + '"'}
+                        for commandline in commandlines]
             return request_payload
 
         # set return_raw flag, if raw response desired
@@ -941,18 +907,7 @@ class HorizonsClass(BaseQuery):
             self.return_raw = True
 
         # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
-
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The uri used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
-
-        return response
+        return self._send_queries(URL, request_payload, commandlines, cache=cache)
 
     @deprecated_renamed_argument("get_raw_response", None, since="0.4.7",
                                  alternative="async methods")
@@ -1043,7 +998,7 @@ class HorizonsClass(BaseQuery):
 
         get_query_payload : boolean, optional
             When set to `True` the method returns the HTTP request parameters as
-            a dict, default: False
+            a dict, or a list of dicts for a list of targets, default: False
 
         get_raw_response: boolean, optional
             Return raw data as obtained by JPL Horizons without parsing the data
@@ -1111,34 +1066,17 @@ class HorizonsClass(BaseQuery):
 
         URL = conf.horizons_server
 
-        # check for required information and assemble commandline stub
+        # check for required information and assemble commandlines
         if self.id is None:
             raise ValueError("'id' parameter not set. Query aborted.")
-        elif isinstance(self.id, dict):
-            commandline = self._format_id_coords(self.id)
-        else:
-            commandline = str(self.id)
+        commandlines = [self._format_commandline(target_id, closest_apparition,
+                                                 no_fragments)
+                        for target_id in self._target_ids()]
+        commandline = commandlines[0]
         if self.location is None:
             self.location = '500@10'
         if self.epochs is None:
             self.epochs = Time.now().jd
-        # expand commandline based on self.id_type
-        if self.id_type in ['designation', 'name',
-                            'asteroid_name', 'comet_name']:
-            commandline = ({'designation': 'DES=',
-                            'name': 'NAME=',
-                            'asteroid_name': 'ASTNAM=',
-                            'comet_name': 'COMNAM='}[self.id_type] + commandline)
-        if self.id_type in ['smallbody', 'asteroid_name',
-                            'comet_name', 'designation']:
-            commandline += ';'
-            if isinstance(closest_apparition, bool):
-                if closest_apparition:
-                    commandline += ' CAP;'
-            else:
-                commandline += ' CAP{:s};'.format(closest_apparition)
-            if no_fragments:
-                commandline += ' NOFRAG;'
         # configure request_payload for vectors query
         request_payload = OrderedDict([
             ('format', 'text'),
@@ -1187,6 +1125,9 @@ class HorizonsClass(BaseQuery):
 
         # return request_payload if desired
         if get_query_payload:
+            if isinstance(self.id, list):
+                return [{**request_payload, 'COMMAND': '"' + commandline + '"'}
+                        for commandline in commandlines]
             return request_payload
 
         # set return_raw flag, if raw response desired
@@ -1194,17 +1135,78 @@ class HorizonsClass(BaseQuery):
             self.return_raw = True
 
         # query and parse
-        response = self._request('GET', URL, params=request_payload,
-                                 timeout=self.TIMEOUT, cache=cache)
-        self.uri = response.url
+        return self._send_queries(URL, request_payload, commandlines, cache=cache)
 
-        # check length of uri
-        if len(self.uri) >= 2000:
-            warnings.warn(('The uri used in this query is very long '
-                           'and might have been truncated. The results of '
-                           'the query might be compromised. If you queried '
-                           'a list of epochs, consider querying a range.'))
+    def _target_ids(self):
+        """The list of the queried targets"""
+        return self.id if isinstance(self.id, list) else [self.id]
+
+    def _format_commandline(self, target_id, closest_apparition, no_fragments):
+        """Horizons ``COMMAND`` selecting the target ``target_id``"""
+        if isinstance(target_id, dict):
+            commandline = self._format_id_coords(target_id)
+        else:
+            commandline = str(target_id)
 
+        # expand commandline based on self.id_type
+        if self.id_type in ['designation', 'name',
+                            'asteroid_name', 'comet_name']:
+            commandline = ({'designation': 'DES=',
+                            'name': 'NAME=',
+                            'asteroid_name': 'ASTNAM=',
+                            'comet_name': 'COMNAM='}[self.id_type] + commandline)
+        if self.id_type in ['smallbody', 'asteroid_name',
+                            'comet_name', 'designation']:
+            commandline += ';'
+            if isinstance(closest_apparition, bool):
+                if closest_apparition:
+                    commandline += ' CAP;'
+            else:
+                commandline += ' CAP{:s};'.format(closest_apparition)
+            if no_fragments:
+                commandline += ' NOFRAG;'
+        return commandline
+
+    def _send_queries(self, url, request_payload, commandlines, *, cache=True):
+        """
+        Query ``request_payload`` for the target of each of ``commandlines``.
+
+        Lists of epochs making URLs longer than ``conf.max_url_length`` are
+        split in several requests. When there are several requests, they run
+        concurrently, up to ``conf.max_workers`` at a time, and a list of
+        responses is returned, holding the exception of the failed requests.
+        """
+        payloads, target_ids, targets = [], [], []
+        for target, (target_id, commandline) in enumerate(zip(self._target_ids(), commandlines)):
+            payload = {**request_payload, 'COMMAND': '"' + commandline + '"'}
+            for chunk in _split_tlist(url, payload, conf.max_url_length):
+                payloads.append(chunk)
+                target_ids.append(target_id)
+                targets.append(target)
+
+        if len(payloads) == 1 and not isinstance(self.id, list):
+            response = self._get_payload(url, payloads[0], cache=cache)
+            self.uri = response.url
+            return response
+
+        responses = self.query_many(
+            '_get_payload',
+            [dict(url=url, params=payload, cache=cache) for payload in payloads],
+            max_workers=conf.max_workers, return_exceptions=True)
+        self.uri = [None if isinstance(response, Exception) else response.url
+                    for response in responses]
+        return _HorizonsResponses(responses, target_ids, targets)
+
+    def _get_payload(self, url, params, *, cache=True):
+        """Send one Horizons request"""
+        response = self._request('GET', url, params=params,
+                                 timeout=self.TIMEOUT, cache=cache)
+        if response.status_code >= 400:
+            # don't cache any HTTP errored queries (especially when the API is down!)
+            try:
+                self._last_query.remove_cache_file(self.cache_location)
+            except (AttributeError, OSError):
+                pass
         return response
 
     # ---------------------------------- parser functions
@@ -1259,8 +1261,9 @@ class HorizonsClass(BaseQuery):
         Parameters
         ----------
 
-        response : `~requests.Response`
-            Response from server.
+        response : `~requests.Response` or list
+            Response from server, or responses of a query split in several
+            requests.
 
 
         Returns
@@ -1270,6 +1273,54 @@ class HorizonsClass(BaseQuery):
 
         """
 
+        if isinstance(response, _HorizonsResponses):
+            if self.return_raw:
+                self.return_raw = False
+                for resp in response:
+                    if isinstance(resp, Exception):
+                        raise resp
+                self._raw_response = [resp.text for resp in response]
+                return self._raw_response
+            return self._parse_responses(response)
+        return self._parse_response(response, self.id)
+
+    def _parse_responses(self, responses):
+        """
+        Parse the responses of a query split in several requests.
+
+        With a list of targets, the targets whose query failed are left out
+        of the table, with a warning listing them. The query fails if all
+        of them failed.
+        """
+        tables = {}
+        errors = {}
+        for resp, target_id, target in zip(responses, responses.target_ids, responses.targets):
+            if target in errors:
+                continue
+            try:
+                if isinstance(resp, Exception):
+                    raise resp
+                tables.setdefault(target, []).append(self._parse_response(resp, target_id))
+            except (ValueError, RequestException) as ex:
+                if not isinstance(self.id, list):
+                    raise
+                tables.pop(target, None)
+                errors[target] = f'{target_id}: {ex}'
+
+        if errors:
+            message = (f'Query failed for {len(errors)} of the {len(self.id)} targets:\n'
+                       + '\n'.join(errors.values()))
+            if not tables:
+                raise ValueError(message)
+            warnings.warn(message + '\nThe other targets are returned.', NoResultsWarning)
+        return vstack([table for target_tables in tables.values() for table in target_tables],
+                      join_type='outer', metadata_conflicts='silent')
+
+    def _parse_response(self, response, target_id):
+        """
+        Parse the response of a query of the target ``target_id``.
+        """
+
         self.last_response = response
         try:
             response.raise_for_status()
@@ -1291,11 +1342,21 @@ class HorizonsClass(BaseQuery):
             self.return_raw = False
             return self._raw_response
 
-        # split response by line break
-        src = response.text.split('\n')
+        text = response.text
+
+        # only the header, above the data block, holds metadata and error
+        # messages; the data block is sent to the C reader as it is
+        soe = text.find('$$SOE')
+        eoe = text.find('$$EOE', soe + 1) if soe >= 0 else -1
+        if soe >= 0 and eoe >= 0:
+            data_start = text.find('\n', soe) + 1
+            data_end = text.rfind('\n', 0, eoe) + 1
+            data_start = min(data_start, data_end)
+            src = text[:soe].split('\n')
+        else:
+            data_start = data_end = 0
+            src = text.split('\n')
 
-        data_start_idx = 0
-        data_end_idx = 0
         H, G = nan, nan
         M1, M2, k1, k2, phcof = nan, nan, nan, nan, nan
         headerline = []
@@ -1307,7 +1368,7 @@ class HorizonsClass(BaseQuery):
                 headerline[2] = 'solar_presence'
                 headerline[3] = "lunar_presence" if "Earth" in centername else "interfering_body"
                 headerline[-1] = '_dump'
-                if isinstance(self.id, dict) or str(self.id).startswith('g:'):
+                if isinstance(target_id, dict) or str(target_id).startswith('g:'):
                     headerline[4] = 'nearside_flag'
                     headerline[5] = 'illumination_flag'
             # read in elements header line
@@ -1318,12 +1379,6 @@ class HorizonsClass(BaseQuery):
             elif (self.query_type == 'vectors' and "JDTDB," in line):
                 headerline = str(line).split(',')
                 headerline[-1] = '_dump'
-            # identify end of data block
-            if "$$EOE" in line:
-                data_end_idx = idx
-            # identify start of data block
-            if "$$SOE" in line:
-                data_start_idx = idx + 1
             # read in targetname
             if "Target body name" in line:
                 targetname = line[18:50].strip()
@@ -1372,7 +1427,7 @@ class HorizonsClass(BaseQuery):
             # catch unknown target
             if ("Matching small-bodies" in line and "No matches found" in src[idx + 1]):
                 raise ValueError(('Unknown target ({:s}). Maybe try '
-                                  'different id_type?').format(self.id))
+                                  'different id_type?').format(str(target_id)))
             # catch any unavailability of ephemeris data
             if "No ephemeris for target" in line:
                 errormsg = line[line.find('No ephemeris for target'):]
@@ -1392,8 +1447,9 @@ class HorizonsClass(BaseQuery):
                 headerline = []
                 break
 
+        raw_data = text[data_start:data_end]
         if headerline == []:
-            err_msg = "".join(src[data_start_idx:data_end_idx])
+            err_msg = raw_data.replace('\n', '')
             if len(err_msg) > 0:
                 raise ValueError('Query failed with error message:\n'
                                  + err_msg)
@@ -1405,15 +1461,19 @@ class HorizonsClass(BaseQuery):
         headerline = [h.strip() for h in headerline]
 
         # remove all 'Cut-off' messages
-        raw_data = [line for line in src[data_start_idx:data_end_idx]
-                    if 'Cut-off' not in line]
-
-        # read in data
-        data = ascii.read(raw_data,
+        if 'Cut-off' in raw_data:
+            raw_data = '\n'.join(line for line in raw_data.split('\n')
+                                 if 'Cut-off' not in line)
+
+        # read in data with the C reader; the newline keeps a data string
+        # from being taken for a file name. The column types are inferred:
+        # the C reader does not take converters, and passing them would
+        # fall back to the pure Python reader
+        data = ascii.read(raw_data if raw_data.endswith('\n') else raw_data + '\n',
+                          format='no_header', delimiter=',', guess=False,
                           names=headerline,
                           fill_values=[('.n.a.', '0'),
-                                       ('n.a.', '0')],
-                          fast_reader=False)
+                                       ('n.a.', '0')])
         # force to a masked table
         data = Table(data, masked=True)
 
@@ -1483,5 +1543,44 @@ class HorizonsClass(BaseQuery):
         return data
 
 
+class _HorizonsResponses(list):
+    """
+    The responses of a query split in several requests, with the target of
+    each of them in ``target_ids``, and its index in the list of targets in
+    ``targets``.
+    """
+
+    def __init__(self, responses, target_ids, targets):
+        super().__init__(responses)
+        self.target_ids = target_ids
+        self.targets = targets
+
+
+def _split_tlist(url, payload, max_length):
+    """
+    Split the ``TLIST`` list of epochs of ``payload`` so that the URL of each
+    request stays shorter than ``max_length``, and return the payloads of the
+    requests.
+    """
+    epochs = payload.get('TLIST', '').split('\n')
+    if len(epochs) < 2:
+        return [payload]
+
+    # URL length without the epochs, then each epoch adds itself and an
+    # encoded newline
+    base_length = len(url) + len('?') + len(urlencode(
+        {key: value for key, value in payload.items() if key != 'TLIST'})) + len('&TLIST=')
+    chunks, chunk, length = [], [], base_length
+    for epoch in epochs:
+        epoch_length = len(quote_plus(epoch)) + len('%0A')
+        if chunk and length + epoch_length > max_length:
+            chunks.append(chunk)
+            chunk, length = [], base_length
+        chunk.append(epoch)
+        length += epoch_length
+    chunks.append(chunk)
+    return [{**payload, 'TLIST': '\n'.join(chunk)} for chunk in chunks]
+
+
 # the default tool for users to interact with is an instance of the Class
 Horizons = HorizonsClass()
@@ -2,6 +2,7 @@
 
 import pytest
 import os
+import requests
 from collections import OrderedDict
 
 from numpy.ma import is_masked
@@ -10,6 +11,7 @@ from astropy.utils.exceptions import AstropyDeprecationWarning
 from astropy import units as u
 
 from astroquery.utils.mocks import MockResponse
+from ...exceptions import NoResultsWarning
 from ...query import AstroQuery
 from ... import jplhorizons
 
@@ -75,6 +77,25 @@ def test_parse_result(patch_request):
         q.ephemerides()
 
 
+def test_parse_data_block():
+    with open(data_path(DATA_FILES['ephemerides-range']), 'rb') as f:
+        content = f.read()
+    q = jplhorizons.Horizons(id='Ceres')
+    q.query_type = 'ephemerides'
+    nrows = len(q._parse_result(MockResponse(content)))
+
+    # 'Cut-off' messages inside the data block are skipped
+    cutoff = content.replace(b'$$SOE\n', b'$$SOE\n Cut-off interval due to elevation limit\n')
+    assert len(q._parse_result(MockResponse(cutoff))) == nrows
+
+    # without a header line, the data block holds the error message
+    error = content.replace(b'Date__(UT)__HR:MN', b'Date')
+    soe, eoe = error.index(b'$$SOE\n') + 6, error.index(b'$$EOE')
+    error = error[:soe] + b' No site or date in range\n' + error[eoe:]
+    with pytest.raises(ValueError, match='No site or date in range'):
+        q._parse_result(MockResponse(error))
+
+
 def test_ephemerides_query(patch_request):
     # check values of Ceres for a given epoch
     # orbital uncertainty of Ceres is basically zero
@@ -280,6 +301,76 @@ def test_no_H(patch_request):
     assert 'H' not in res
 
 
+def test_split_tlist():
+    url = 'https://ssd.jpl.nasa.gov/api/horizons.api'
+    epochs = [str(2451544.5 + i / 7) for i in range(500)]
+    payload = jplhorizons.Horizons(id='Ceres', epochs=epochs).ephemerides(get_query_payload=True)
+    payloads = jplhorizons.core._split_tlist(url, payload, 2000)
+
+    assert len(payloads) > 1
+    assert '\n'.join(chunk['TLIST'] for chunk in payloads) == payload['TLIST']
+    for chunk in payloads:
+        assert chunk.keys() == payload.keys()
+        assert len(requests.Request('GET', url, params=chunk).prepare().url) <= 2000
+
+
+def test_ephemerides_epoch_batches(patch_request, monkeypatch):
+    requested = []
+
+    def request(self, request_type, url, **kwargs):
+        requested.append(kwargs['params']['TLIST'])
+        return nonremote_request(self, request_type, url, **kwargs)
+
+    monkeypatch.setattr(jplhorizons.core.HorizonsClass, '_request', request)
+    # one epoch per request
+    monkeypatch.setattr(jplhorizons.conf, 'max_url_length', 0)
+    epochs = [2451544.5 + i for i in range(6)]
+    obj = jplhorizons.Horizons(id='Ceres', location='500', epochs=epochs)
+    res = obj.ephemerides()
+
+    assert sorted(requested) == [str(epoch) for epoch in epochs]
+    assert len(obj.uri) == 6
+    # the canned response is the same for every epoch
+    assert len(res) == 6
+    assert all(res['targetname'] == "1 Ceres (A801 AA)")
+
+
+def test_ephemerides_many_targets(patch_request):
+    obj = jplhorizons.Horizons(id=['Ceres', '1935 UZ', 'Ceres'], location='500',
+                               epochs=2451544.5)
+    payloads = obj.ephemerides(get_query_payload=True)
+    assert [payload['COMMAND'] for payload in payloads] == ['"Ceres"', '"1935 UZ"', '"Ceres"']
+
+    res = obj.ephemerides()
+    assert res['targetname'][0] == res['targetname'][-1] == "1 Ceres (A801 AA)"
+    assert res['targetname'][1] != res['targetname'][0]
+    # H is only known for Ceres
+    assert list(res['H'].mask) == [False, True, False]
+
+
+def test_ephemerides_many_targets_failed(patch_request, monkeypatch):
+    def request(self, request_type, url, **kwargs):
+        if kwargs['params']['COMMAND'] == '"unreachable"':
+            raise requests.ConnectionError('Connection refused')
+        return nonremote_request(self, request_type, url, **kwargs)
+
+    monkeypatch.setattr(jplhorizons.core.HorizonsClass, '_request', request)
+    obj = jplhorizons.Horizons(id=['Ceres', 'tlist_error', '1935 UZ', 'unreachable'],
+                               location='500', epochs=2451544.5)
+    # the other targets are returned
+    with pytest.warns(NoResultsWarning,
+                      match='(?s)2 of the 4 targets.*tlist_error: .*unreachable: Connection refused'):
+        res = obj.ephemerides()
+    assert len(res) == 2
+    assert res['targetname'][0] == "1 Ceres (A801 AA)"
+    assert obj.uri[3] is None
+
+    # all the targets failed
+    obj = jplhorizons.Horizons(id=['tlist_error', 'unreachable'], location='500', epochs=2451544.5)
+    with pytest.raises(ValueError, match='2 of the 2 targets'):
+        obj.ephemerides()
+
+
 def test_id_type_deprecation():
     """Test deprecation warnings based on issue 1742.
 
@@ -29,6 +29,9 @@ class Conf(_config.ConfigNamespace):
     pagesize = _config.ConfigItem(
         50000,
         'Number of results to request at once from the STScI server.')
+    max_workers = _config.ConfigItem(
+        4,
+        'Maximum number of pages of results requested at once from the STScI server.')
 
 
 conf = Conf()
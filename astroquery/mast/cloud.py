@@ -27,7 +27,8 @@ class CloudAccess:  # pragma:no-cover
     Class encapsulating access to MAST data in the cloud.
     """
 
-    def __init__(self, provider="AWS", profile=None, verbose=False):
+    def __init__(self, provider="AWS", profile=None, verbose=False, *,
+                 multipart_threshold=8 * 2**20, max_concurrency=10):
         """
         Initialize class to enable downloading public files from S3
         instead of STScI servers.
@@ -42,6 +43,11 @@ class CloudAccess:  # pragma:no-cover
             Profile to use to identify yourself to the cloud provider (usually in ~/.aws/config).
         verbose : bool
             Default False. Display extra info and warnings if true.
+        multipart_threshold : int
+            Default 8 MB. Files larger than this many bytes are downloaded as
+            parts of that size, fetched concurrently.
+        max_concurrency : int
+            Default 10. Number of parts of a file downloaded at the same time.
         """
 
         # Dealing with deprecated argument
@@ -51,6 +57,7 @@ class CloudAccess:  # pragma:no-cover
 
         import boto3
         import botocore
+        from boto3.s3.transfer import TransferConfig
 
         self.supported_missions = ["mast:hst/product", "mast:tess/product", "mast:kepler", "mast:galex", "mast:ps1",
                                    "mast:jwst/product"]
@@ -61,6 +68,14 @@ class CloudAccess:  # pragma:no-cover
 
         self.pubdata_bucket = "stpubdata"
 
+        # boto3 clients are thread-safe, unlike their creation and the
+        # resources: one client serves all the (possibly concurrent) downloads.
+        self.s3_client = boto3.client('s3', config=self.config)
+        self.transfer_config = TransferConfig(multipart_threshold=multipart_threshold,
+                                              multipart_chunksize=multipart_threshold,
+                                              max_concurrency=max_concurrency,
+                                              use_threads=True)
+
         if verbose:
             log.info("Using the S3 STScI public dataset")
 
@@ -141,7 +156,7 @@ class CloudAccess:  # pragma:no-cover
             List of URIs generated from the data products, list way contain entries that are None
             if data_products includes products not found in the cloud.
         """
-        s3_client = self.boto3.client('s3', config=self.config)
+        s3_client = self.s3_client
         data_uris = data_products if isinstance(data_products, list) else data_products['dataURI']
         paths = utils.mast_relative_path(data_uris, verbose=verbose)
         if isinstance(paths, str):  # Handle the case where only one product was requested
@@ -189,9 +204,7 @@ class CloudAccess:  # pragma:no-cover
             Default is True. Whether to show download progress in the console.
         """
 
-        s3 = self.boto3.resource('s3', config=self.config)
-        s3_client = self.boto3.client('s3', config=self.config)
-        bkt = s3.Bucket(self.pubdata_bucket)
+        s3_client = self.s3_client
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             bucket_path = self.get_cloud_uri(data_product, False)
@@ -222,14 +235,13 @@ class CloudAccess:  # pragma:no-cover
 
                 # Bytes read tracks how much data has been received so far
                 # This variable will be updated in multiple threads below
-                global bytes_read
                 bytes_read = 0
 
                 progress_lock = threading.Lock()
 
                 def progress_callback(numbytes):
                     # Boto3 calls this from multiple threads pulling the data from S3
-                    global bytes_read
+                    nonlocal bytes_read
 
                     # This callback can be called in multiple threads
                     # Access to updating the console needs to be locked
@@ -237,6 +249,8 @@ class CloudAccess:  # pragma:no-cover
                         bytes_read += numbytes
                         pb.update(bytes_read)
 
-                bkt.download_file(bucket_path, local_path, Callback=progress_callback)
+                s3_client.download_file(self.pubdata_bucket, bucket_path, str(local_path),
+                                        Callback=progress_callback, Config=self.transfer_config)
         else:
-            bkt.download_file(bucket_path, local_path)
+            s3_client.download_file(self.pubdata_bucket, bucket_path, str(local_path),
+                                    Config=self.transfer_config)
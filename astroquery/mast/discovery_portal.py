@@ -11,10 +11,12 @@ import warnings
 import uuid
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 import numpy as np
 
-from urllib.parse import quote as urlencode
+from urllib.parse import quote as urlencode, unquote
 
 from astropy.table import Table, vstack, MaskedColumn
 
@@ -51,6 +53,28 @@ def _prepare_service_request_string(json_obj):
     return 'request={}'.format(urlencode(request_string))
 
 
+def _set_request_page(request_string, page):
+    """
+    Takes a url-safe Mashup request string and returns the request string for another page of results.
+
+    Parameters
+    ----------
+    request_string : str
+        URL encoded Mashup Request string, as returned by `_prepare_service_request_string`.
+    page : int
+        The page of results to request.
+
+    Returns
+    -------
+    response : str
+        URL encoded Mashup Request string.
+    """
+
+    json_obj = json.loads(unquote(request_string[len('request='):]))
+    json_obj['page'] = page
+    return _prepare_service_request_string(json_obj)
+
+
 def _json_to_table(json_obj, col_config=None):
     """
     Takes a JSON object as returned from a Mashup request and turns it into an `~astropy.table.Table`.
@@ -67,11 +91,12 @@ def _json_to_table(json_obj, col_config=None):
     response : `~astropy.table.Table`
     """
 
-    data_table = Table(masked=True)
-
     if not all(x in json_obj.keys() for x in ['fields', 'data']):
         raise KeyError("Missing required key(s) 'data' and/or 'fields.'")
 
+    rows = json_obj['data']
+    columns = []
+
     for col, atype in [(x['name'], x['type']) for x in json_obj['fields']]:
 
         # Removing "_selected_" column
@@ -89,22 +114,18 @@ def _json_to_table(json_obj, col_config=None):
         atype = reg_type[1]
         ignore_value = reg_type[2] if (ignore_value is None) else ignore_value
 
-        # Make the column list (don't assign final type yet or there will be errors)
-        col_data = np.array([x.get(col, ignore_value) for x in json_obj['data']], dtype=object)
-        if ignore_value is not None:
-            col_data[np.where(np.equal(col_data, None))] = ignore_value
-
-        # no consistent way to make the mask because np.equal fails on ''
-        # and array == value fails with None
-        if atype == 'str':
-            col_mask = (col_data == ignore_value)
-        else:
-            col_mask = np.equal(col_data, ignore_value)
+        # Gather the column values, then fill the typed column from them
+        try:
+            values = list(map(itemgetter(col), rows))
+        except KeyError:
+            # some rows leave the column out
+            values = [x.get(col) for x in rows]
+        col_data, col_mask = utils._column_data(values, atype, ignore_value)
 
         # add the column
-        data_table.add_column(MaskedColumn(col_data.astype(atype), name=col, mask=col_mask))
+        columns.append(MaskedColumn(col_data, name=col, mask=col_mask, copy=False))
 
-    return data_table
+    return Table(columns, masked=True, copy=False)
 
 
 @async_to_sync
@@ -123,6 +144,11 @@ class PortalAPI(BaseQuery):
 
     TIMEOUT = conf.timeout
     PAGESIZE = conf.pagesize
+    MAX_WORKERS = conf.max_workers
+
+    # Polling intervals (seconds) while the server is still executing a query
+    POLL_INTERVAL = 0.2
+    MAX_POLL_INTERVAL = 5
 
     _column_configs = dict()
     _current_service = None
@@ -149,6 +175,8 @@ class PortalAPI(BaseQuery):
         interferes with follow requests after an 'Executing' response was returned.)
         Also parameters that allow for file download through this method are removed
 
+        Once the first page of results tells how many pages there are, the
+        other pages are requested concurrently, ``MAX_WORKERS`` at a time.
 
         Parameters
         ----------
@@ -166,50 +194,78 @@ class PortalAPI(BaseQuery):
 
         Returns
         -------
-        response : `~requests.Response`
-            The response from the server.
+        response : list of `~requests.Response`
+            The responses from the server, one per page.
         """
 
         start_time = time.time()
-        all_responses = []
-        total_pages = 1
-        cur_page = 0
 
-        while cur_page < total_pages:
-            status = "EXECUTING"
+        response, result, status = self._request_page(method, url, params=params, data=data,
+                                                      headers=headers, files=files, stream=stream,
+                                                      auth=auth, start_time=start_time)
+        all_responses = [response]
 
-            while status == "EXECUTING":
-                response = super(PortalAPI, self)._request(method, url, params=params, data=data,
-                                                           headers=headers, files=files, cache=False,
-                                                           stream=stream, auth=auth)
+        if (status != "COMPLETE") or (not retrieve_all):
+            return all_responses
 
-                if (time.time() - start_time) >= self.TIMEOUT:
-                    raise TimeoutError("Timeout limit of {} exceeded.".format(self.TIMEOUT))
+        paging = result.get("paging")
+        if paging is None:
+            return all_responses
+        pages = range(paging['page'] + 1, paging['pagesFiltered'] + 1)
 
-                # Raising error based on HTTP status if necessary
-                response.raise_for_status()
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = [executor.submit(self._request_page, method, url, params=params,
+                                       data=_set_request_page(data, page), headers=headers,
+                                       files=files, stream=stream, auth=auth, start_time=start_time)
+                       for page in pages]
 
-                result = response.json()
+        for future in futures:
+            response, result, status = future.result()
+            all_responses.append(response)
+            if status != "COMPLETE":
+                break
 
-                if not result:  # kind of hacky, but col_config service returns nothing if there is an error
-                    status = "ERROR"
-                else:
-                    status = result.get("status")
+        return all_responses
 
-            all_responses.append(response)
+    def _request_page(self, method, url, *, params, data, headers, files, stream, auth, start_time):
+        """
+        Request one page of results, polling the server at increasing intervals
+        while it returns an 'EXECUTING' status.
 
-            if (status != "COMPLETE") or (not retrieve_all):
-                break
+        Returns
+        -------
+        response : `~requests.Response`
+        result : dict
+            The decoded JSON response.
+        status : str
+            The status of the query, e.g. 'COMPLETE' or 'ERROR'.
+        """
 
-            paging = result.get("paging")
-            if paging is None:
-                break
-            total_pages = paging['pagesFiltered']
-            cur_page = paging['page']
+        interval = self.POLL_INTERVAL
+        while True:
+            response = super()._request(method, url, params=params, data=data,
+                                        headers=headers, files=files, cache=False,
+                                        stream=stream, auth=auth)
 
-            data = data.replace("page%22%3A%20"+str(cur_page)+"%2C", "page%22%3A%20"+str(cur_page+1)+"%2C")
+            elapsed = time.time() - start_time
+            if elapsed >= self.TIMEOUT:
+                raise TimeoutError("Timeout limit of {} exceeded.".format(self.TIMEOUT))
 
-        return all_responses
+            # Raising error based on HTTP status if necessary
+            response.raise_for_status()
+
+            result = response.json()
+
+            if not result:  # kind of hacky, but col_config service returns nothing if there is an error
+                status = "ERROR"
+            else:
+                status = result.get("status")
+
+            if status != "EXECUTING":
+                return response, result, status
+
+            time.sleep(min(interval, self.TIMEOUT - elapsed))
+            interval = min(2 * interval, self.MAX_POLL_INTERVAL)
 
     def _get_col_config(self, service, fetch_name=None):
         """
@@ -284,7 +340,7 @@ class PortalAPI(BaseQuery):
             self._current_service = None  # clearing current service
 
         for resp in responses:
-            result = resp.json()
+            result = utils._load_json(resp)
 
             # check for error message
             if result['status'] == "ERROR":
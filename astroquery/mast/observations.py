@@ -6,7 +6,9 @@ MAST Observations
 This module contains various methods for querying MAST observations.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import io
 import warnings
 import time
 import os
@@ -20,6 +22,7 @@ import astropy.units as u
 import astropy.coordinates as coord
 
 from astropy.table import Table, Row, vstack
+from astropy.utils.console import ProgressBarOrSpinner
 from astroquery import log
 from astroquery.mast.cloud import CloudAccess
 
@@ -630,9 +633,7 @@ class ObservationsClass(MastQueryWithLogin):
         """
 
         # create the full data URL
-        base_url = base_url if base_url else self._portal_api_connection.MAST_DOWNLOAD_URL
-        data_url = base_url + "?uri=" + uri
-        escaped_url = base_url + "?uri=" + quote(uri, safe=":/")
+        data_url, escaped_url = self._data_urls(uri, base_url)
 
         # parse a local file path from local_path parameter.  Use current directory as default.
         filename = os.path.basename(uri)
@@ -686,7 +687,16 @@ class ObservationsClass(MastQueryWithLogin):
 
         return status, msg, url
 
-    def _download_files(self, products, base_dir, *, flat=False, cache=True, cloud_only=False, verbose=True):
+    def _data_urls(self, uri, base_url=None):
+        """
+        The download URL of the data URI ``uri``, as reported in the manifests,
+        and escaped, as requested.
+        """
+        base_url = base_url if base_url else self._portal_api_connection.MAST_DOWNLOAD_URL
+        return base_url + "?uri=" + uri, base_url + "?uri=" + quote(uri, safe=":/")
+
+    def _download_files(self, products, base_dir, *, flat=False, cache=True, cloud_only=False, verbose=True,
+                        max_workers=1):
         """
         Takes an `~astropy.table.Table` of data products and downloads them into the directory given by base_dir.
 
@@ -707,34 +717,127 @@ class ObservationsClass(MastQueryWithLogin):
             as is the default behavior. If cloud access is not enables this argument as no affect.
         verbose : bool, optional
             Default True. Whether to show download progress in the console.
+        max_workers : int, optional
+            Default 1. Number of products downloaded at the same time, each in its own thread.
+            With more than one worker, the products are downloaded from the cloud in a
+            thread pool, and from MAST by `~astroquery.downloads.DownloadManager`.
 
         Returns
         -------
         response : `~astropy.table.Table`
         """
 
-        manifest_array = []
+        # create the local file download paths, and their directories once
+        local_paths = []
         for data_product in products:
-
-            # create the local file download path
             if not flat:
                 local_path = os.path.join(base_dir, data_product['obs_collection'], data_product['obs_id'])
-                if not os.path.exists(local_path):
-                    os.makedirs(local_path)
             else:
                 local_path = base_dir
-            local_path = os.path.join(local_path, os.path.basename(data_product['productFilename']))
+            local_paths.append(os.path.join(local_path, os.path.basename(data_product['productFilename'])))
+        for directory in set(os.path.dirname(local_path) for local_path in local_paths):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
 
-            # download the files
-            status, msg, url = self.download_file(data_product["dataURI"], local_path=local_path,
-                                                  cache=cache, cloud_only=cloud_only, verbose=verbose)
+        def download(data_product, local_path, verbose):
+            return self.download_file(data_product["dataURI"], local_path=local_path,
+                                      cache=cache, cloud_only=cloud_only, verbose=verbose)
 
-            manifest_array.append([local_path, status, msg, url])
+        start_time = time.monotonic()
 
+        # download the files
+        if max_workers == 1:
+            results = [download(data_product, local_path, verbose)
+                       for data_product, local_path in zip(products, local_paths)]
+        else:
+            results = [None] * len(products)
+            # the products in the cloud are downloaded with the S3 client, the
+            # others, and the ones not found in the cloud, from MAST
+            mast_downloads = list(range(len(products)))
+            if self._cloud_connection is not None:
+                cloud_downloads = [index for index in mast_downloads
+                                   if self._cloud_connection.is_supported({'dataURI': products[index]['dataURI']})]
+                cloud_results = self._download_cloud_files(products, local_paths, cloud_downloads, cache=cache,
+                                                           verbose=verbose, max_workers=max_workers)
+                mast_downloads = sorted(set(mast_downloads) - set(cloud_downloads))
+                for index, downloaded in zip(cloud_downloads, cloud_results):
+                    if downloaded:
+                        results[index] = ("COMPLETE", None, None)
+                    elif cloud_only:
+                        log.warning("Skipping file...")
+                        results[index] = ("SKIPPED", None, None)
+                    else:
+                        log.warning("Falling back to mast download...")
+                        mast_downloads.append(index)
+                mast_downloads.sort()
+
+            data_urls = [self._data_urls(products[index]['dataURI']) for index in mast_downloads]
+            downloaded_paths = []
+            if mast_downloads:
+                downloaded_paths = self._download_many([escaped_url for _, escaped_url in data_urls],
+                                                       [local_paths[index] for index in mast_downloads],
+                                                       max_workers=max_workers, continuation=False, cache=cache,
+                                                       verbose=verbose, return_exceptions=True)
+            for index, (data_url, _), downloaded_path in zip(mast_downloads, data_urls, downloaded_paths):
+                if isinstance(downloaded_path, HTTPError):
+                    results[index] = ("ERROR", "HTTPError: {0}".format(downloaded_path), data_url)
+                elif isinstance(downloaded_path, Exception):
+                    raise downloaded_path
+                else:
+                    results[index] = ("COMPLETE", None, None)
+
+            for index, (status, _, _) in enumerate(results):
+                if status == "COMPLETE" and not os.path.isfile(local_paths[index]):
+                    results[index] = ("ERROR", "File was not downloaded",
+                                      self._data_urls(products[index]['dataURI'])[0])
+
+        elapsed = time.monotonic() - start_time
+        nbytes = sum(os.path.getsize(local_path) for local_path, (status, _, _) in zip(local_paths, results)
+                     if status == "COMPLETE" and os.path.isfile(local_path))
+        log.info(f"Retrieved {len(products)} products, {nbytes / 2**20:.1f} MB in {elapsed:.1f} s "
+                 f"({nbytes / 2**20 / max(elapsed, 1e-6):.1f} MB/s)")
+
+        manifest_array = [[local_path, status, msg, url]
+                          for local_path, (status, msg, url) in zip(local_paths, results)]
         manifest = Table(rows=manifest_array, names=('Local Path', 'Status', 'Message', "URL"))
 
         return manifest
 
+    def _download_cloud_files(self, products, local_paths, indices, *, cache=True, verbose=True, max_workers=1):
+        """
+        Download the products of ``indices`` from the cloud, ``max_workers`` at a time.
+
+        Returns
+        -------
+        downloaded : list of bool
+            Whether each product was downloaded, in the order of ``indices``.
+        """
+        def download(index):
+            try:
+                self._cloud_connection.download_file({'dataURI': products[index]['dataURI']}, local_paths[index],
+                                                     cache, False)
+                return True
+            except Exception as ex:
+                log.exception("Error pulling from S3 bucket: {}".format(ex))
+                return False
+
+        # Only show progress bar if logging level is INFO or lower.
+        if verbose and log.getEffectiveLevel() <= 20:
+            progress_stream = None  # Astropy default
+        else:
+            progress_stream = io.StringIO()
+
+        results = [None] * len(indices)
+        with ProgressBarOrSpinner(len(indices), f'Downloading {len(indices)} products from the cloud ...',
+                                  file=progress_stream) as pb:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(download, index): position
+                           for position, index in enumerate(indices)}
+                for count, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    pb.update(count)
+        return results
+
     def _download_curl_script(self, products, out_dir, verbose=True):
         """
         Takes an `~astropy.table.Table` of data products and downloads a curl script to pull the datafiles.
@@ -774,7 +877,7 @@ class ObservationsClass(MastQueryWithLogin):
 
     def download_products(self, products, *, download_dir=None, flat=False,
                           cache=True, curl_flag=False, mrp_only=False, cloud_only=False, verbose=True,
-                          **filters):
+                          max_workers=1, **filters):
         """
         Download data products.
         If cloud access is enabled, files will be downloaded from the cloud if possible.
@@ -808,6 +911,10 @@ class ObservationsClass(MastQueryWithLogin):
             as is the default behavior. If cloud access is not enables this argument as no affect.
         verbose : bool, optional
             Default True. Whether to show download progress in the console.
+        max_workers : int, optional
+            Default 1. Number of products downloaded at the same time, each in its own thread.
+            Large pulls (e.g. thousands of TESS or HST products) complete many times faster
+            with 4 to 8 workers. Has no effect when downloading the curl script.
         **filters :
             Filters to be applied.  Valid filters are all products fields returned by
             ``get_metadata("products")`` and 'extension' which is the desired file extension.
@@ -869,7 +976,8 @@ class ObservationsClass(MastQueryWithLogin):
                                             base_dir=base_dir, flat=flat,
                                             cache=cache,
                                             cloud_only=cloud_only,
-                                            verbose=verbose)
+                                            verbose=verbose,
+                                            max_workers=max_workers)
 
         return manifest
 
@@ -8,6 +8,7 @@ This module contains various methods for querying MAST microservice APIs.
 
 import time
 import warnings
+from operator import itemgetter
 
 import numpy as np
 
@@ -20,7 +21,7 @@ from ..utils import async_to_sync
 from ..utils.class_or_instance import class_or_instance
 from ..exceptions import InvalidQueryError, TimeoutError, NoResultsWarning
 
-from . import conf
+from . import conf, utils
 
 
 __all__ = ["ServiceAPI"]
@@ -41,7 +42,7 @@ def _json_to_table(json_obj, data_key='data'):
     -------
     response : `~astropy.table.Table`
     """
-    data_table = Table(masked=True)
+    columns = []
 
     if not all(x in json_obj.keys() for x in ['info', data_key]):
         raise KeyError(f"Missing required key(s) {data_key} and/or 'info.'")
@@ -79,32 +80,26 @@ def _json_to_table(json_obj, data_key='data'):
             col_type = np.float64
             ignore_value = -999
 
-        # Make the column list (don't assign final type yet or there will be errors)
+        # Make the column list
         try:
             # Step through data array of values
-            col_data = np.array([x[idx] for x in json_obj[data_key]], dtype=object)
+            values = list(map(itemgetter(idx), json_obj[data_key]))
         except KeyError:
             # it's not a data array, fall back to using column name as it is array of dictionaries
             try:
-                col_data = np.array([x[col_name] for x in json_obj[data_key]], dtype=object)
+                values = list(map(itemgetter(col_name), json_obj[data_key]))
             except KeyError:
                 # Skip column names not found in data
                 log.debug('Column %s was not found in data. Skipping...', col_name)
                 continue
-        if ignore_value is not None:
-            col_data[np.where(np.equal(col_data, None))] = ignore_value
 
-        # no consistent way to make the mask because np.equal fails on ''
-        # and array == value fails with None
-        if col_type == 'str':
-            col_mask = (col_data == ignore_value)
-        else:
-            col_mask = np.equal(col_data, ignore_value)
+        # Fill the typed column in a single pass over the values
+        col_data, col_mask = utils._column_data(values, col_type, ignore_value)
 
         # add the column
-        data_table.add_column(MaskedColumn(col_data.astype(col_type), name=col_name, mask=col_mask))
+        columns.append(MaskedColumn(col_data, name=col_name, mask=col_mask, copy=False))
 
-    return data_table
+    return Table(columns, masked=True, copy=False)
 
 
 @async_to_sync
@@ -232,7 +227,7 @@ class ServiceAPI(BaseQuery):
         response : `~astropy.table.Table`
         """
 
-        result = response.json()
+        result = utils._load_json(response)
         result_table = _json_to_table(result, data_key=data_key)
 
         # Check for no results
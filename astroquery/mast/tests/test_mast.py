@@ -4,8 +4,10 @@ import json
 import os
 import re
 from shutil import copyfile
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+from urllib.parse import unquote
 
+import numpy as np
 import pytest
 
 from astropy.table import Table, unique
@@ -16,6 +18,7 @@ import astropy.units as u
 from requests import HTTPError, Response
 
 from astroquery.mast.services import _json_to_table
+from astroquery.query import BaseQuery
 from astroquery.utils.mocks import MockResponse
 from astroquery.exceptions import (InvalidQueryError, InputWarning, MaxResultsWarning, NoResultsWarning,
                                    RemoteServiceError, ResolverError)
@@ -462,6 +465,34 @@ def test_mast_service_request_async(patch_post):
     assert output
 
 
+def test_portal_api_paging(monkeypatch):
+    requests = []
+
+    def request_mockreturn(self, method, url, data=None, **kwargs):
+        page = json.loads(unquote(data[len('request='):]))['page']
+        requests.append(page)
+        # page 3 is still executing on the first poll
+        status = 'EXECUTING' if requests.count(page) == 1 and page == 3 else 'COMPLETE'
+        result = {'status': status, 'paging': {'page': page, 'pagesFiltered': 5}}
+        return MockResponse(json.dumps(result).encode())
+
+    monkeypatch.setattr(BaseQuery, '_request', request_mockreturn)
+    portal = mast.discovery_portal.PortalAPI()
+    portal.POLL_INTERVAL = 0.01
+
+    request_string = mast.discovery_portal._prepare_service_request_string(
+        {'service': 'Mast.Caom.Cone', 'params': {}, 'format': 'json', 'pagesize': 10, 'page': 1})
+    responses = portal._request("POST", portal.MAST_REQUEST_URL, data=request_string)
+
+    assert [response.json()['paging']['page'] for response in responses] == [1, 2, 3, 4, 5]
+    assert sorted(requests) == [1, 2, 3, 3, 4, 5]
+
+    requests.clear()
+    responses = portal._request("POST", portal.MAST_REQUEST_URL, data=request_string, retrieve_all=False)
+    assert len(responses) == 1
+    assert requests == [1]
+
+
 def test_mast_service_request(patch_post):
     service = 'Mast.Caom.Cone'
     params = {'ra': 23.34086,
@@ -495,6 +526,37 @@ def test_mast_query(patch_post):
     assert "Please provide at least one filter." in str(invalid_query.value)
 
 
+def test_portal_json_to_table():
+    json_obj = {'fields': [{'name': 'ra', 'type': 'float'},
+                           {'name': 'objID', 'type': 'long'},
+                           {'name': 'target', 'type': 'string'},
+                           {'name': 'public', 'type': 'boolean'},
+                           {'name': '_selected_', 'type': 'boolean'}],
+                'data': [{'ra': 1.5, 'objID': 123456789012345678, 'target': 'M1', 'public': True},
+                         {'ra': None, 'objID': None, 'target': None, 'public': None},
+                         {'ra': -999, 'objID': 7, 'target': 'NaN'}]}
+
+    table = mast.discovery_portal._json_to_table(json_obj)
+    assert table.colnames == ['ra', 'objID', 'target', 'public']
+    assert table['ra'].dtype == np.float64
+    assert list(table['ra'].mask) == [False, False, False]
+    assert np.isnan(table['ra'][1])
+    assert table['objID'].dtype == np.int64
+    assert table['objID'][0] == 123456789012345678
+    assert list(table['objID'].mask) == [False, True, False]
+    assert list(table['target'].mask) == [False, True, False]
+    assert list(table['public'].mask) == [False, True, True]
+
+    col_config = {'ra': {'ignoreValue': -999}, 'objID': {'ignoreValue': 7}, 'target': {'ignoreValue': 'NaN'}}
+    table = mast.discovery_portal._json_to_table(json_obj, col_config)
+    assert list(table['ra'].mask) == [False, True, True]
+    assert list(table['objID'].mask) == [False, True, True]
+    assert list(table['target'].mask) == [False, True, True]
+
+    table = mast.discovery_portal._json_to_table(json_obj, {'ra': {'ignoreValue': 'NaN'}})
+    assert list(table['ra'].mask) == [False, True, False]
+
+
 def test_resolve_object(patch_post):
     obj = "TIC 307210830"
     tic_coord = SkyCoord(124.531756290083, -68.3129998725044, unit="deg")
@@ -707,6 +769,55 @@ def test_observations_download_products(patch_post, tmpdir):
     assert isinstance(result1, Table)
 
 
+def test_observations_download_products_concurrent(patch_post, tmp_path):
+    products = mast.Observations.get_product_list('2003738726')
+    uris = list(products['dataURI'])
+    calls = []
+
+    def download_many(urls, local_filepaths, **kwargs):
+        calls.append(urls)
+        results = []
+        for url, local_path in zip(urls, local_filepaths):
+            if url.endswith(uris[3]):
+                response = Response()
+                response.status_code = 404
+                results.append(HTTPError(response=response))
+                continue
+            with open(local_path, 'w') as f:
+                f.write(url)
+            results.append(local_path)
+        return results
+
+    # the even products are in the cloud, the first one fails to download from there
+    cloud = Mock()
+    cloud.is_supported.side_effect = lambda data_product: uris.index(data_product['dataURI']) % 2 == 0
+
+    def cloud_download(data_product, local_path, cache, verbose):
+        if data_product['dataURI'] == uris[0]:
+            raise RuntimeError('Not in the bucket')
+        with open(local_path, 'w') as f:
+            f.write('s3')
+
+    cloud.download_file.side_effect = cloud_download
+    patch_post.setattr(mast.Observations, '_cloud_connection', cloud)
+    patch_post.setattr(mast.Observations, '_download_many', download_many)
+
+    manifest = mast.Observations.download_products(products, download_dir=tmp_path, max_workers=4)
+    # the products not in the cloud, or failing there, go through the download manager at once
+    assert len(calls) == 1
+    assert [url.split('?uri=')[1] for url in calls[0]] == [uri for ii, uri in enumerate(uris)
+                                                           if ii == 0 or ii % 2]
+    assert list(manifest['Status']) == ['ERROR' if ii == 3 else 'COMPLETE' for ii in range(len(uris))]
+    assert manifest['Message'][3].startswith('HTTPError')
+    assert manifest['URL'][3].endswith('?uri=' + uris[3])
+    for ii, local_path in enumerate(manifest['Local Path']):
+        assert os.path.basename(local_path) == os.path.basename(uris[ii])
+        if ii != 3:
+            with open(local_path) as f:
+                content = f.read()
+            assert content == 's3' if ii and ii % 2 == 0 else content.endswith('?uri=' + uris[ii])
+
+
 def test_observations_download_file(patch_post, tmpdir):
     # pull a single data product
     products = mast.Observations.get_product_list('2003738726')
@@ -745,6 +856,28 @@ def test_observations_get_cloud_uri(mock_client, patch_post):
     mast.Observations.disable_cloud_dataset()
 
 
+@patch('boto3.client')
+def test_observations_cloud_download_file(mock_client, patch_post, tmp_path):
+    pytest.importorskip("boto3")
+
+    mock_client.return_value.head_object.return_value = {'ContentLength': 100}
+    mast.Observations.enable_cloud_dataset()
+    cloud = mast.Observations._cloud_connection
+    assert cloud.transfer_config.max_concurrency == 10
+
+    product = Table()
+    product['dataURI'] = ['mast:HST/product/u9o40504m_c3m.fits']
+    local_path = tmp_path / 'u9o40504m_c3m.fits'
+    cloud.download_file(product[0], local_path, verbose=False)
+
+    # One shared client, concurrent multipart transfers
+    mock_client.return_value.download_file.assert_called_once_with(
+        'stpubdata', 'hst/public/u9o4/u9o40504m/u9o40504m_c3m.fits', str(local_path),
+        Config=cloud.transfer_config)
+
+    mast.Observations.disable_cloud_dataset()
+
+
 @patch('boto3.client')
 def test_observations_get_cloud_uris(mock_client, patch_post):
     pytest.importorskip("boto3")
@@ -21,6 +21,11 @@ from ..version import version
 from ..exceptions import InputWarning, NoResultsWarning, ResolverError, InvalidQueryError
 from ..utils import commons
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 __all__ = []
 
@@ -70,6 +75,105 @@ def parse_type(dbtype):
     }.get(dbtype, (dbtype, dbtype, dbtype))
 
 
+def _load_json(response):
+    """
+    Decodes the JSON content of a response, using the faster orjson package when it is installed.
+
+    Parameters
+    ----------
+    response : `~requests.Response`
+        Response with a JSON content.
+
+    Returns
+    -------
+    response : dict or list
+        The decoded JSON object.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # e.g. NaN literals, which the json module accepts
+            pass
+    return response.json()
+
+
+def _column_data(values, col_type, ignore_value):
+    """
+    Takes the list of the values of a column, as decoded from JSON, and returns the typed column data
+    and its mask.
+
+    Missing values (None) are replaced by ``ignore_value``, and entries equal to ``ignore_value`` are masked.
+    Float, integer and string columns are filled directly in typed arrays; other columns go through
+    an intermediate object array.
+
+    Parameters
+    ----------
+    values : list
+        The column values, None for missing values.
+    col_type : type or str
+        The column data type, e.g. ``np.float64``, ``np.int64`` or ``str``.
+    ignore_value
+        Value standing for missing values, or None.
+
+    Returns
+    -------
+    response : tuple
+        The column data `~numpy.ndarray` and its mask.
+    """
+
+    numeric_ignore = isinstance(ignore_value, (int, float, np.number)) and not isinstance(ignore_value, bool)
+
+    if col_type is np.float64 and (numeric_ignore or isinstance(ignore_value, str)):
+        try:
+            nan_ignore = np.isnan(float(ignore_value))
+            # None values become NaN, which JSON numbers cannot be
+            col_data = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if nan_ignore:
+                # A missing value is NaN either way, only a "NaN" string flags it as masked
+                if isinstance(ignore_value, str):
+                    return col_data, np.isnan(col_data)
+                return col_data, np.zeros(len(col_data), dtype=bool)
+            if numeric_ignore:
+                col_data[np.isnan(col_data)] = ignore_value
+                return col_data, col_data == ignore_value
+
+    elif col_type is np.int64 and numeric_ignore:
+        try:
+            col_data = np.array(values, dtype=np.int64)
+        except (TypeError, ValueError):
+            try:
+                col_data = np.array([ignore_value if x is None else x for x in values], dtype=np.int64)
+            except (TypeError, ValueError):
+                col_data = None
+        if col_data is not None:
+            return col_data, col_data == ignore_value
+
+    elif col_type in (str, "str") and isinstance(ignore_value, str):
+        if None in values:
+            values = [ignore_value if x is None else x for x in values]
+        col_data = np.array(values, dtype=str)
+        return col_data, col_data == ignore_value
+
+    # Make the column list (don't assign final type yet or there will be errors)
+    col_data = np.array(values, dtype=object)
+    if ignore_value is not None:
+        col_data[np.where(np.equal(col_data, None))] = ignore_value
+
+    # no consistent way to make the mask because np.equal fails on ''
+    # and array == value fails with None
+    if col_type in (str, "str"):
+        col_mask = (col_data == ignore_value)
+    else:
+        col_mask = np.equal(col_data, ignore_value)
+
+    return col_data.astype(col_type), col_mask
+
+
 def _simple_request(url, params=None):
     """
     Light wrapper on requests.session().get basically to make monkey patched testing easier/more effective.
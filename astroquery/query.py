@@ -1,8 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import abc
+import asyncio
+import contextvars
+import copy
 import inspect
 import pickle
-import copy
 import getpass
 import hashlib
 import keyring
@@ -11,9 +13,13 @@ import os
 import platform
 import requests
 import textwrap
+import threading
+import time
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 
 from astropy.config import paths
 import astropy.units as u
@@ -24,21 +30,118 @@ from astropy.utils import deprecated
 import pyvo
 
 from astroquery import version, log, cache_conf
+from astroquery.cache import get_cache_index, enforce_cache_limits, write_response, read_response
+from astroquery.connections import shared_adapter, async_send
+from astroquery.downloads import DownloadManager
 from astroquery.utils import system_tools
 
 
 __all__ = ['BaseVOQuery', 'BaseQuery', 'QueryWithLogin']
 
 
-def to_cache(response, cache_file):
+def to_cache(response, cache_file, service=None):
+    if not isinstance(response, requests.Response):
+        log.debug("Not caching {0} object".format(type(response).__name__))
+        return
+
     log.debug("Caching data to {0}".format(cache_file))
 
-    response = copy.deepcopy(response)
-    if hasattr(response, 'request'):
-        for key in tuple(response.request.hooks.keys()):
-            del response.request.hooks[key]
-    with open(cache_file, "wb") as f:
-        pickle.dump(response, f, protocol=4)
+    size = write_response(response, cache_file, compression=cache_conf.cache_compression)
+
+    get_cache_index().add(cache_file, service, size)
+    enforce_cache_limits()
+
+
+class _HostRateLimiter:
+    """
+    Spaces out the requests made to each host by at least ``1 / rate``
+    seconds, across all the threads sharing the limiter.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).hostname
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _RateLimitedSession(requests.Session):
+
+    def __init__(self, limiter):
+        super().__init__()
+        self._limiter = limiter
+
+    def request(self, method, url, *args, **kwargs):
+        self._limiter.wait(url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def _clone_session(session, limiter=None, *, session_class=requests.Session):
+    """
+    A new session with the settings, cookies and (shared) adapters of ``session``.
+    """
+    clone = session_class() if limiter is None else _RateLimitedSession(limiter)
+    clone.headers = session.headers.copy()
+    clone.cookies = session.cookies.copy()
+    clone.auth = session.auth
+    clone.proxies = dict(session.proxies)
+    clone.hooks = {event: list(hooks) for event, hooks in session.hooks.items()}
+    clone.params = dict(session.params)
+    clone.stream = session.stream
+    clone.verify = session.verify
+    clone.cert = session.cert
+    clone.max_redirects = session.max_redirects
+    clone.trust_env = session.trust_env
+    clone.adapters = session.adapters.copy()
+    return clone
+
+
+# Set while a coroutine query method collects the request made by the
+# corresponding *_async method, see BaseQuery._arun
+_deferred_requests = contextvars.ContextVar('deferred_requests', default=None)
+
+
+class _NotDeferrable(BaseException):
+    # A BaseException, so that the query methods catching Exception do not
+    # swallow it
+    pass
+
+
+class _CollectingSession(requests.Session):
+    """
+    The session of a query method run by `BaseQuery._arun` to collect its
+    request: sending a request without going through `BaseQuery._request`
+    raises `_NotDeferrable`, before anything is sent.
+    """
+
+    def send(self, request, **kwargs):
+        raise _NotDeferrable('send')
+
+
+class _DeferredRequest:
+    """
+    Stands in for the response of a request collected by `BaseQuery._request`,
+    to be sent later from the event loop. Using it as a response raises
+    `_NotDeferrable`.
+    """
+
+    def __init__(self, query, **kwargs):
+        self.__dict__['query'] = query
+        self.__dict__['kwargs'] = kwargs
+
+    def __getattr__(self, name):
+        raise _NotDeferrable(name)
+
+    def __setattr__(self, name, value):
+        raise _NotDeferrable(name)
 
 
 def _replace_none_iterable(iterable):
@@ -110,27 +213,35 @@ class AstroQuery:
         return self._hash
 
     def request_file(self, cache_location):
-        fn = cache_location.joinpath(self.hash() + ".pickle")
+        fn = cache_location.joinpath(self.hash() + ".response")
         return fn
 
-    def from_cache(self, cache_location, cache_timeout):
+    def from_cache(self, cache_location, cache_timeout, service=None):
         request_file = self.request_file(cache_location)
+        cache_index = get_cache_index()
         try:
+            entry = cache_index.lookup(request_file, touch=True)
+            if entry is None:
+                # Cache file written before the index existed, register it
+                stat = request_file.stat()
+                cache_index.add(request_file, service, stat.st_size, created=stat.st_mtime)
+                created = stat.st_mtime
+            else:
+                created = entry[1]
+
             if cache_timeout is None:
                 expired = False
             else:
                 current_time = datetime.now(timezone.utc)
-                cache_time = datetime.fromtimestamp(request_file.stat().st_mtime, timezone.utc)
+                cache_time = datetime.fromtimestamp(created, timezone.utc)
                 expired = current_time-cache_time > timedelta(seconds=cache_timeout)
             if not expired:
-                with open(request_file, "rb") as f:
-                    response = pickle.load(f)
-                if not isinstance(response, requests.Response):
-                    response = None
+                response = read_response(request_file)
             else:
                 log.debug(f"Cache expired for {request_file}...")
                 response = None
         except FileNotFoundError:
+            cache_index.remove(request_file)
             response = None
         if response:
             log.debug("Retrieved data from {0}".format(request_file))
@@ -142,6 +253,7 @@ class AstroQuery:
         (successful request, but failed return)
         """
         request_file = self.request_file(cache_location)
+        get_cache_index().remove(request_file)
 
         if request_file.exists:
             request_file.unlink()
@@ -188,6 +300,8 @@ class BaseVOQuery:
         if not hasattr(self, '_session'):
             # We don't want to override another, e.g. already authenticated session from another baseclass
             self._session = requests.Session()
+            self._session.mount('https://', shared_adapter)
+            self._session.mount('http://', shared_adapter)
 
         user_agents = self._session.headers['User-Agent'].split()
         if 'astroquery' in user_agents[0]:
@@ -214,8 +328,15 @@ class BaseQuery(metaclass=LoginABCMeta):
     is implemented as an abstract class and must not be directly instantiated.
     """
 
+    # Whether the coroutines of the query methods may collect their request to
+    # send it from the event loop, see _arun
+    _deferrable = True
+
     def __init__(self):
         self._session = requests.Session()
+        # Connections are pooled across all services, see astroquery.connections
+        self._session.mount('https://', shared_adapter)
+        self._session.mount('http://', shared_adapter)
         self._session.hooks['response'].append(self._response_hook)
         self._session.headers['User-Agent'] = (
             f"astroquery/{version.version} Python/{platform.python_version()} ({platform.system()}) "
@@ -228,6 +349,172 @@ class BaseQuery(metaclass=LoginABCMeta):
         """ init a fresh copy of self """
         return self.__class__(*args, **kwargs)
 
+    def query_many(self, method_name, list_of_kwargs, *, max_workers=4, rate_limit=None,
+                   ordered=True, return_exceptions=False):
+        """
+        Run the query method ``method_name`` once for each set of keyword
+        arguments of ``list_of_kwargs``, concurrently.
+
+        Each worker thread queries through its own copy of the service, with
+        its own session, so the concurrent queries do not interfere with each
+        other. The copies share the cache and the connection pools of the
+        service.
+
+        Parameters
+        ----------
+        method_name : str
+            Name of the query method, e.g. ``'query_object'`` to get the
+            parsed results or ``'query_object_async'`` to get the server
+            responses.
+        list_of_kwargs : iterable of dict
+            The keyword arguments of each query.
+        max_workers : int
+            Maximum number of queries running at the same time.
+        rate_limit : float or None
+            Maximum number of requests per second sent to each host. `None`
+            means no limit.
+        ordered : bool
+            If True (default), return the list of the results in the order
+            of ``list_of_kwargs``. If False, return a generator yielding
+            ``(index, result)`` pairs as the queries complete, ``index``
+            being the position of the query in ``list_of_kwargs``.
+        return_exceptions : bool
+            If True, an exception raised by a query is returned as its result.
+            Otherwise (default), the first exception is raised and the queries
+            that have not started yet are cancelled.
+
+        Returns
+        -------
+        results : list or generator
+            See ``ordered``.
+
+        Examples
+        --------
+        >>> from astroquery.vizier import Vizier
+        >>> results = Vizier.query_many('query_object',
+        ...                             [{'object_name': name} for name in ('M1', 'M31')],
+        ...                             rate_limit=5)  # doctest: +REMOTE_DATA
+        """
+        getattr(self, method_name)  # fail early on a wrong method name
+        list_of_kwargs = list(list_of_kwargs)
+        limiter = None if rate_limit is None else _HostRateLimiter(rate_limit)
+        local = threading.local()
+
+        def run(kwargs):
+            service = getattr(local, 'service', None)
+            if service is None:
+                service = local.service = copy.copy(self)
+                service._session = _clone_session(self._session, limiter)
+            try:
+                return getattr(service, method_name)(**kwargs)
+            except Exception as ex:
+                if return_exceptions:
+                    return ex
+                raise
+
+        def results():
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(run, kwargs): index
+                           for index, kwargs in enumerate(list_of_kwargs)}
+                try:
+                    for future in as_completed(futures):
+                        yield futures[future], future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+        if not ordered:
+            return results()
+
+        ordered_results = [None] * len(list_of_kwargs)
+        for index, result in results():
+            ordered_results[index] = result
+        return ordered_results
+
+    async def _arun(self, async_method_name, sync_method_name, *args, **kwargs):
+        """
+        Run the query method ``async_method_name`` as a coroutine.
+
+        The method is first called, in a thread, with `_request` collecting,
+        rather than sending, the request. If the method returns the response
+        of that single request untouched, the request is sent from the event
+        loop and the response parsed with ``_parse_result``. Otherwise, e.g. if
+        the method needs the response itself, or downloads files, the
+        synchronous ``sync_method_name`` runs in a thread instead.
+
+        A request sent with the session of the service without going through
+        `_request` stops the collection before it is sent. The requests sent
+        by other clients, e.g. a TAP service created before with its own
+        session, cannot be stopped: services using such clients set
+        ``_deferrable`` to False, so that their coroutines always run the
+        synchronous method in a thread.
+        """
+        verbose = kwargs.pop('verbose', False)
+
+        def collect():
+            service = copy.copy(self)
+            service._session = _clone_session(self._session, session_class=_CollectingSession)
+            deferred = []
+            # to_thread runs this in a copy of the context
+            _deferred_requests.set(deferred)
+            try:
+                return getattr(service, async_method_name)(*args, **kwargs), deferred
+            except _NotDeferrable:
+                return None, None
+
+        if self._deferrable:
+            result, deferred = await asyncio.to_thread(collect)
+        else:
+            result, deferred = None, None
+
+        if deferred is not None and (kwargs.get('get_query_payload') or kwargs.get('field_help')):
+            return result
+
+        if deferred is None or len(deferred) > 1 or (deferred and result is not deferred[0]):
+            service = copy.copy(self)
+            service._session = _clone_session(self._session)
+            return await asyncio.to_thread(getattr(service, sync_method_name),
+                                           *args, verbose=verbose, **kwargs)
+
+        # Without deferred request, the method did not go through _request and
+        # already returned the response
+        response = await self._asend(deferred[0]) if deferred else result
+        if isinstance(response, requests.Response):
+            response.raise_for_status()
+        return await asyncio.to_thread(self._parse_result, response, verbose=verbose)
+
+    async def _asend(self, deferred):
+        """
+        Send a request collected by `_request` from the event loop, using the
+        cache like `_request` does.
+        """
+        query, kwargs = deferred.query, deferred.kwargs
+        cache = kwargs['cache']
+        if cache is None:
+            cache = cache_conf.cache_active
+
+        if cache:
+            response = query.from_cache(self.cache_location, cache_conf.cache_timeout,
+                                        service=self.name)
+            if response:
+                self._last_query = query
+                return response
+
+        request = self._session.prepare_request(requests.Request(
+            query.method, query.url, params=query.params, data=query.data,
+            headers=query.headers, files=query.files, json=query.json,
+            auth=kwargs['auth']))
+        response = await async_send(request, timeout=query.timeout, verify=kwargs['verify'],
+                                    cert=self._session.cert,
+                                    allow_redirects=kwargs['allow_redirects'])
+        self._session.cookies.update(response.cookies)
+        response = requests.hooks.dispatch_hook('response', self._session.hooks, response)
+
+        if cache:
+            to_cache(response, query.request_file(self.cache_location), service=self.name)
+        self._last_query = query
+        return response
+
     def _response_hook(self, response, *args, **kwargs):
         loglevel = log.getEffectiveLevel()
 
@@ -278,8 +565,11 @@ class BaseQuery(metaclass=LoginABCMeta):
 
     def clear_cache(self):
         """Removes all cache files."""
-        for fle in self.cache_location.glob("*.pickle"):
-            fle.unlink()
+        # .pickle files were written by astroquery versions before 0.4.11
+        for pattern in ("*.response", "*.pickle"):
+            for fle in self.cache_location.glob(pattern):
+                fle.unlink()
+        get_cache_index().remove_location(self.cache_location)
 
     def _request(self, method, url,
                  params=None, data=None, headers=None,
@@ -343,6 +633,17 @@ class BaseQuery(metaclass=LoginABCMeta):
             is True.
         """
 
+        deferred = _deferred_requests.get()
+        if deferred is not None:
+            if save:
+                raise _NotDeferrable('save')
+            request = _DeferredRequest(
+                AstroQuery(method, url, params=params, data=data, headers=headers,
+                           files=files, timeout=timeout, json=json),
+                cache=cache, auth=auth, verify=verify, allow_redirects=allow_redirects)
+            deferred.append(request)
+            return request
+
         if cache is None:  # Global caching not overridden
             cache = cache_conf.cache_active
 
@@ -368,13 +669,15 @@ class BaseQuery(metaclass=LoginABCMeta):
             query = AstroQuery(method, url, params=params, data=data, headers=headers,
                                files=files, timeout=timeout, json=json)
             if not cache:
-                with cache_conf.set_temp("cache_active", False):
-                    response = query.request(self._session, stream=stream,
-                                             auth=auth, verify=verify,
-                                             allow_redirects=allow_redirects,
-                                             json=json)
+                # Not toggling cache_conf here: it is global, and queries may
+                # run concurrently (see query_many)
+                response = query.request(self._session, stream=stream,
+                                         auth=auth, verify=verify,
+                                         allow_redirects=allow_redirects,
+                                         json=json)
             else:
-                response = query.from_cache(self.cache_location, cache_conf.cache_timeout)
+                response = query.from_cache(self.cache_location, cache_conf.cache_timeout,
+                                            service=self.name)
                 if not response:
                     response = query.request(self._session,
                                              self.cache_location,
@@ -383,7 +686,7 @@ class BaseQuery(metaclass=LoginABCMeta):
                                              allow_redirects=allow_redirects,
                                              verify=verify,
                                              json=json)
-                    to_cache(response, query.request_file(self.cache_location))
+                    to_cache(response, query.request_file(self.cache_location), service=self.name)
 
             self._last_query = query
             return response
@@ -457,15 +760,16 @@ class BaseQuery(metaclass=LoginABCMeta):
                 # bytes are indexed from 0:
                 # https://en.wikipedia.org/wiki/List_of_HTTP_header_fields#range-request-header
                 end = "{0}".format(length-1) if length is not None else ""
-                self._session.headers['Range'] = "bytes={0}-{1}".format(existing_file_length,
-                                                                        end)
-                log.debug(f"Continuing with range={self._session.headers['Range']}")
+                # The Range header goes with this request only: the session
+                # may be shared with other threads
+                headers = dict(kwargs.pop('headers', None) or {})
+                headers['Range'] = "bytes={0}-{1}".format(existing_file_length, end)
+                log.debug(f"Continuing with range={headers['Range']}")
 
                 response = self._session.request(method, url,
                                                  timeout=timeout, stream=True,
-                                                 auth=auth, **kwargs)
+                                                 auth=auth, headers=headers, **kwargs)
                 response.raise_for_status()
-                del self._session.headers['Range']
 
         elif cache and os.path.exists(local_filepath):
             if length is not None:
@@ -537,6 +841,52 @@ class BaseQuery(metaclass=LoginABCMeta):
         response.close()
         return local_filepath
 
+    def _download_many(self, urls, local_filepaths, *, max_workers=4, split_size=None,
+                       range_workers=4, timeout=None, auth=None, continuation=True,
+                       cache=False, method="GET", verbose=True, return_exceptions=False,
+                       **kwargs):
+        """
+        Download several files concurrently with the local ``_session``.
+
+        The files are written to ``.part`` files renamed once complete, and
+        interrupted downloads are resumed, see
+        `~astroquery.downloads.DownloadManager`.
+
+        Parameters
+        ----------
+        urls : list of str
+        local_filepaths : list of str
+        max_workers : int
+            Number of files downloaded at the same time.
+        split_size : int or None
+            Files larger than ``split_size`` bytes are downloaded as
+            ``range_workers`` parallel byte ranges. `None` never splits files.
+        range_workers : int
+        timeout : int
+        auth : dict or None
+        continuation : bool
+            Resume the downloads interrupted by an earlier run.
+        cache : bool
+            Skip the files already downloaded. Defaults to False.
+        method : "GET" or "POST"
+        verbose : bool
+            Whether to show download progress. Defaults to True.
+        return_exceptions : bool
+            Return the exception of a failed download in place of its path,
+            instead of raising it.
+
+        Returns
+        -------
+        local_filepaths : list
+            The paths of the downloaded files (or exceptions), in the order
+            of ``urls``.
+        """
+        manager = DownloadManager(self._session, max_workers=max_workers, split_size=split_size,
+                                  range_workers=range_workers, timeout=timeout, auth=auth,
+                                  continuation=continuation, cache=cache, verbose=verbose)
+        return manager.download(urls, local_filepaths, method=method,
+                                return_exceptions=return_exceptions, **kwargs)
+
 
 @deprecated(since="v0.4.7", message=("The suspend_cache function is deprecated,"
                                      "Use the conf set_temp function instead."))
@@ -33,6 +33,22 @@ class Conf(_config.ConfigNamespace):
         -1,
         'Maximum number of rows that will be fetched from the result.')
 
+    max_workers = _config.ConfigItem(
+        # SIMBAD asks for no more than 6 queries per second
+        4,
+        'Maximum number of queries running at the same time when an '
+        'uploaded table longer than the upload limit is split in chunks.')
+
+    cache_memory_limit = _config.ConfigItem(
+        2**28,
+        'Maximum size in bytes of the query results cached in memory. '
+        'The least recently used results are dropped first.')
+
+    cache_on_disk = _config.ConfigItem(
+        False,
+        'Whether to also cache the query results in the astroquery cache '
+        'directory, where they are kept across sessions.')
+
     # should be columns of 'basic'
     default_columns = ["main_id", "ra", "dec", "coo_err_maj", "coo_err_min",
                        "coo_err_angle", "coo_wavelength", "coo_bibcode"]
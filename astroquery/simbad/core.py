@@ -1,22 +1,35 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """SIMBAD query class for accessing the SIMBAD Service"""
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import copy
 from dataclasses import dataclass, field
 from difflib import get_close_matches
-from functools import lru_cache
 import gc
+import hashlib
+import os
+from pathlib import Path
 import re
+import sys
+import tempfile
+import threading
+import time
 from typing import Any
 import warnings
 
 import astropy.coordinates as coord
+from astropy.config import paths
+from astropy.io.votable import from_table, parse_single_table
+from astropy.io.votable.tree import VOTableFile
 from astropy.table import Table, Column, vstack
 import astropy.units as u
 from astropy.utils import deprecated
 from astropy.utils.decorators import deprecated_renamed_argument
 import numpy as np
 
+from astroquery import log, cache_conf
+from astroquery.cache import get_cache_index, enforce_cache_limits
 from astroquery.query import BaseVOQuery
 from astroquery.utils import commons
 from astroquery.exceptions import NoResultsWarning
@@ -24,7 +37,7 @@ from astroquery.simbad.utils import (_catch_deprecated_fields_with_arguments,
                                      _wildcard_to_regexp, CriteriaTranslator,
                                      query_criteria_fields)
 
-from pyvo.dal import TAPService, TAPQuery
+from pyvo.dal import DALResults, TAPService, TAPQuery
 from . import conf
 
 
@@ -49,14 +62,189 @@ def _adql_parameter(entry: str):
     return entry.replace("'", "''")
 
 
-@lru_cache(256)
-def _cached_query_tap(tap, query: str, *, maxrec=10000, async_job=False, timeout=None):
+def _upload_length(upload):
+    """Number of rows of an upload table, `None` for an URL or a file."""
+    if isinstance(upload, VOTableFile):
+        return upload.get_first_table().nrows
+    if isinstance(upload, (Table, DALResults)):
+        return len(upload)
+    return None
+
+
+def _upload_to_table(upload):
+    """The `~astropy.table.Table` of an upload table."""
+    if isinstance(upload, VOTableFile):
+        return upload.get_first_table().to_table()
+    if isinstance(upload, DALResults):
+        return upload.to_table()
+    return upload
+
+
+def _upload_digest(upload):
+    """Hash of the content of an upload table, `None` for an URL or a file."""
+    if _upload_length(upload) is None:
+        return None
+    digest = hashlib.sha256()
+    for column in _upload_to_table(upload).itercols():
+        if not isinstance(column, np.ndarray):
+            # mixin columns (Time, SkyCoord...) are not hashed
+            return None
+        data = np.ma.getdata(column)
+        digest.update(f"{column.info.name}\0{data.dtype.str}\0{data.shape}\0{column.info.unit}\0".encode())
+        if data.dtype.kind == "O":
+            digest.update("\0".join(map(str, data.ravel())).encode())
+        else:
+            digest.update(np.ascontiguousarray(data).tobytes())
+        digest.update(np.ma.getmaskarray(column).tobytes())
+    return digest.hexdigest()
+
+
+def _table_nbytes(table):
+    """Approximate memory footprint of a table, in bytes."""
+    nbytes = 0
+    for column in table.itercols():
+        data = np.ma.getdata(column)
+        nbytes += data.nbytes + getattr(getattr(column, "mask", None), "nbytes", 0)
+        if data.dtype.kind == "O":
+            nbytes += sum(map(sys.getsizeof, data.ravel()))
+    return nbytes
+
+
+class _TapCache:
+    """Results of the SIMBAD TAP queries, kept in memory and optionally on disk.
+
+    The tables in memory fit in ``conf.cache_memory_limit`` bytes, the least
+    recently used ones are dropped first. With ``conf.cache_on_disk``, they are
+    also written as VOTable files in the astroquery cache directory, where they
+    outlive the session and count in the astroquery-wide cache size limit.
+    Both tiers expire after ``cache_conf.cache_timeout`` seconds.
+    """
+    service = "Simbad"
+
+    def __init__(self):
+        self._tables = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tables)
+
+    @property
+    def nbytes(self):
+        """Size of the tables in memory, in bytes."""
+        return self._nbytes
+
+    @property
+    def location(self):
+        return Path(paths.get_cache_dir(), "astroquery", self.service)
+
+    def get(self, key):
+        """Return a copy of the cached table for ``key``, or `None`."""
+        timeout = cache_conf.cache_timeout
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None:
+                table, _, created = entry
+                if timeout is None or time.time() - created <= timeout:
+                    self._tables.move_to_end(key)
+                    return table.copy()
+                self._drop(key)
+        if not conf.cache_on_disk:
+            return None
+        table, created = self._read(key)
+        if table is None:
+            return None
+        self._keep(key, table, created)
+        return table.copy()
+
+    def put(self, key, table):
+        """Cache ``table`` under ``key`` and return a copy of it."""
+        created = time.time()
+        if conf.cache_on_disk:
+            self._write(key, table, created)
+        self._keep(key, table, created)
+        return table.copy()
+
+    def clear(self):
+        """Drop the tables in memory and remove the cache files."""
+        with self._lock:
+            self._tables.clear()
+            self._nbytes = 0
+        for path in self.location.glob("tap-*.xml"):
+            path.unlink(missing_ok=True)
+        get_cache_index().remove_location(self.location)
+
+    def _drop(self, key):
+        entry = self._tables.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+    def _keep(self, key, table, created):
+        nbytes = _table_nbytes(table)
+        limit = conf.cache_memory_limit
+        with self._lock:
+            self._drop(key)
+            if nbytes > limit:
+                return
+            self._tables[key] = (table, nbytes, created)
+            self._nbytes += nbytes
+            while self._nbytes > limit:
+                self._drop(next(iter(self._tables)))
+
+    def _file(self, key):
+        return self.location / f"tap-{key}.xml"
+
+    def _read(self, key):
+        path = self._file(key)
+        cache_index = get_cache_index()
+        entry = cache_index.lookup(path, touch=True)
+        if entry is None:
+            return None, None
+        created = entry[1]
+        timeout = cache_conf.cache_timeout
+        if timeout is not None and time.time() - created > timeout:
+            log.debug(f"Cache expired for {path}...")
+            cache_index.remove(path)
+            path.unlink(missing_ok=True)
+            return None, None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                table = parse_single_table(path).to_table(use_names_over_ids=True)
+        except FileNotFoundError:
+            cache_index.remove(path)
+            return None, None
+        log.debug(f"Retrieved data from {path}")
+        return table, created
+
+    def _write(self, key, table, created):
+        path = self._file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with open(fd, "wb") as f, warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                # the VOTable round trip gives back the table parsed by pyvo,
+                # object columns of strings included
+                from_table(table).to_xml(f, tabledata_format="binary2")
+                size = f.tell()
+            os.replace(tmp_file, path)
+        except BaseException:
+            Path(tmp_file).unlink(missing_ok=True)
+            raise
+        get_cache_index().add(path, self.service, size, created=created)
+        enforce_cache_limits()
+
+
+_tap_cache = _TapCache()
+
+
+def _cached_query_tap(tap, query: str, *, maxrec=10000, async_job=False, timeout=None, uploads=None):
     """Cache version of query TAP.
 
-    This private function is called when query_tap is executed without an
-    ``uploads`` extra keyword argument. This is a work around because
-    `~astropy.table.Table` objects are not hashable and thus cannot
-    be used as arguments for a function decorated with lru_cache.
+    The results are cached on the URL of the service, the query, ``maxrec``
+    and a hash of the content of the uploaded tables. Queries uploading an
+    URL or a file are not cached.
 
     Parameters
     ----------
@@ -75,15 +263,31 @@ def _cached_query_tap(tap, query: str, *, maxrec=10000, async_job=False, timeout
     timeout: int, optional
         The execution duration for the asynchronous query. If 'async_job' is true, then
         this has to be provided.
+    uploads : dict, optional
+        The tables to upload, by name.
 
     Returns
     -------
     `~astropy.table.Table`
         The response returned by SIMBAD.
     """
+    key = None
+    if cache_conf.cache_active:
+        upload_digests = [(name, _upload_digest(upload)) for name, upload in sorted((uploads or {}).items())]
+        if all(upload_digest is not None for _, upload_digest in upload_digests):
+            key = hashlib.sha256(repr((tap.baseurl, query, int(maxrec), upload_digests)).encode()).hexdigest()
+            table = _tap_cache.get(key)
+            if table is not None:
+                return table
     if async_job:
-        return tap.run_async(query, maxrec=maxrec, execution_duration=timeout).to_table()
-    return tap.search(query, maxrec=maxrec).to_table()
+        table = tap.run_async(query, maxrec=maxrec, execution_duration=timeout, uploads=uploads).to_table()
+    elif uploads:
+        table = tap.run_sync(query, maxrec=maxrec, uploads=uploads).to_table()
+    else:
+        table = tap.search(query, maxrec=maxrec).to_table()
+    if key is None:
+        return table
+    return _tap_cache.put(key, table)
 
 
 @dataclass(frozen=True)
@@ -194,6 +398,14 @@ class SimbadClass(BaseVOQuery):
             self._tap = TAPService(baseurl=tap_url, session=self._session)
         return self._tap
 
+    def _ensure_tap(self):
+        """Create the TAP service, if needed.
+
+        Called before concurrent queries, so that they all share the same
+        service instead of each thread creating its own.
+        """
+        return self.tap
+
     @property
     def hardlimit(self):
         """The maximum number of lines for SIMBAD's output."""
@@ -739,10 +951,16 @@ class SimbadClass(BaseVOQuery):
         for join in joins:
             left_joins.append(_Join(join.table, join.column_left,
                                     join.column_right, "LEFT JOIN"))
-        return self._query(top, columns, left_joins, instance_criteria,
-                           from_table=upload_name,
-                           get_query_payload=get_query_payload,
-                           script_infos=upload)
+        result = self._query(top, columns, left_joins, instance_criteria,
+                             from_table=upload_name,
+                             get_query_payload=get_query_payload,
+                             script_infos=upload)
+        if get_query_payload or len(upload) <= self.uploadlimit:
+            return result
+        # longer lists are split in chunks (see query_tap), whose results are
+        # stacked in any order; object_number_id keeps the input order
+        result.sort("object_number_id", kind="stable")
+        return result if top == -1 else result[:top]
 
     @deprecated_renamed_argument(["equinox", "epoch", "cache"],
                                  new_name=[None]*3,
@@ -1441,7 +1659,11 @@ class SimbadClass(BaseVOQuery):
         uploads : `~astropy.table.Table` | `~astropy.io.votable.tree.VOTableFile` | `~pyvo.dal.DALResults`
             Any number of local tables to be used in the *query*. In the *query*, these tables
             are referred as *TAP_UPLOAD.table_alias* where *TAP_UPLOAD* is imposed and *table_alias*
-            is the keyword name you chose. The maximum number of lines for the uploaded tables is 200000.
+            is the keyword name you chose. SIMBAD accepts up to
+            `~astroquery.simbad.SimbadClass.uploadlimit` lines (200000) per uploaded table. One
+            longer table is split in chunks of that size: the query runs once per chunk,
+            ``conf.max_workers`` at a time, and the results are stacked. Clauses such as TOP,
+            ORDER BY, DISTINCT or aggregates then apply to each chunk separately.
         async_job: bool, optional
             When set to `True`, the query will be executed in asynchronous mode. This is
             better for very long queries, as it prevents transient failures to abort the
@@ -1450,6 +1672,7 @@ class SimbadClass(BaseVOQuery):
         get_query_payload : bool, default=False
             When set to ``True`` the method returns the HTTP request parameters without
             querying SIMBAD. The ADQL string is in the 'QUERY' key of the payload.
+            With an upload split in chunks, this is the list of the payloads of the chunks.
 
         Returns
         -------
@@ -1524,29 +1747,61 @@ class SimbadClass(BaseVOQuery):
             raise ValueError("Query string contains an odd number of single quotes."
                              " Escape the unpaired single quote by doubling it.\n"
                              "ex: 'Barnard's galaxy' -> 'Barnard''s galaxy'.")
+        chunked_uploads = self._split_uploads(uploads)
         if get_query_payload:
+            if chunked_uploads is not None:
+                return [dict(TAPQuery(self.SIMBAD_URL, query, maxrec=maxrec, uploads=chunk_uploads))
+                        for chunk_uploads in chunked_uploads]
             return dict(TAPQuery(self.SIMBAD_URL, query, maxrec=maxrec, uploads=uploads))
-        # without uploads we call the version with cache
         if uploads == {}:
             return _cached_query_tap(self.tap, query, maxrec=maxrec,
                                      async_job=async_job, timeout=self.timeout)
-        # with uploads it has to be without cache
-        if async_job:
-            return self.tap.run_async(query, maxrec=maxrec,
-                                      execution_duration=self.timeout,
-                                      uploads=uploads).to_table()
-        return self.tap.run_sync(query, maxrec=maxrec, uploads=uploads).to_table()
+        if chunked_uploads is None:
+            return self._run_with_uploads(query, maxrec, async_job, uploads)
+        self._ensure_tap()
+        with ThreadPoolExecutor(max_workers=conf.max_workers) as executor:
+            results = list(executor.map(
+                lambda chunk_uploads: self._run_with_uploads(query, maxrec, async_job, chunk_uploads),
+                chunked_uploads))
+        return vstack(results, metadata_conflicts="silent")
 
     @staticmethod
     def clear_cache():
-        """Clear the cache of SIMBAD."""
-        _cached_query_tap.cache_clear()
+        """Clear the cache of SIMBAD, in memory and on disk."""
+        _tap_cache.clear()
         gc.collect()
 
     # -----------------------------
     # Utility methods for query TAP
     # -----------------------------
 
+    def _split_uploads(self, uploads):
+        """Split the upload table longer than the upload limit in chunks.
+
+        Returns `None` if all the tables fit in one query, else the list of
+        the ``uploads`` of each chunk.
+        """
+        if not uploads:
+            return None
+        lengths = {name: _upload_length(upload) for name, upload in uploads.items()}
+        too_long = [name for name, length in lengths.items()
+                    if length is not None and length > self.uploadlimit]
+        if not too_long:
+            return None
+        if len(too_long) > 1:
+            raise ValueError(f"The uploaded tables {', '.join(too_long)} have more than "
+                             f"{self.uploadlimit} lines. Only one of them can be split "
+                             "in several queries.")
+        name = too_long[0]
+        table = _upload_to_table(uploads[name])
+        return [dict(uploads, **{name: table[start:start + self.uploadlimit]})
+                for start in range(0, len(table), self.uploadlimit)]
+
+    def _run_with_uploads(self, query, maxrec, async_job, uploads):
+        """Run a query with uploads, cached on the content of the uploaded tables."""
+        return _cached_query_tap(self.tap, query, maxrec=maxrec, async_job=async_job,
+                                 timeout=self.timeout, uploads=uploads)
+
     def _get_query_parameters(self):
         """Get the current building blocks of an ADQL query."""
         return tuple(map(copy.deepcopy, (self.ROW_LIMIT, self.columns_in_output, self.joins, self.criteria)))
@@ -1,7 +1,9 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from pathlib import Path
 import re
+from unittest.mock import Mock
 
+from astropy.config import paths
 from astropy.coordinates import SkyCoord
 from astropy.io.votable import parse_single_table
 from astropy.table import Table
@@ -15,6 +17,7 @@ import pytest
 from .. import conf
 from ... import simbad
 from .test_simbad_remote import multicoords
+from astroquery import cache_conf
 from astroquery.exceptions import NoResultsWarning
 
 
@@ -24,6 +27,15 @@ FK4_COORDS = SkyCoord(ra=84.90759 * u.deg, dec=-80.89403 * u.deg, frame="fk4")
 FK5_COORDS = SkyCoord(ra=83.82207 * u.deg, dec=-80.86667 * u.deg, frame="fk5")
 
 
+@pytest.fixture(autouse=True)
+def _temporary_cache(tmp_path):
+    """Start each test with an empty cache, in a temporary cache directory."""
+    with paths.set_temp_cache(tmp_path):
+        simbad.SimbadClass.clear_cache()
+        yield
+        simbad.SimbadClass.clear_cache()
+
+
 @pytest.fixture()
 def _mock_simbad_class(monkeypatch):
     """Avoid a TAP request for properties in the tests."""
@@ -590,6 +602,136 @@ def test_query_tap_cache_call(monkeypatch):
     assert simbad.Simbad.query_tap("select top 1 * from basic") == msg
 
 
+@pytest.mark.usefixtures("_mock_simbad_class")
+def test_query_tap_cache(monkeypatch):
+    calls = []
+
+    def search(self, query, maxrec):
+        calls.append(query)
+        return Mock(to_table=lambda: Table([["M 1", "M 2"]], names=["main_id"], dtype=[object]))
+
+    monkeypatch.setattr(TAPService, "search", search)
+    result = simbad.Simbad.query_tap("select main_id from basic")
+    result["main_id"][0] = "changed"
+    assert list(simbad.Simbad.query_tap("select main_id from basic")["main_id"]) == ["M 1", "M 2"]
+    assert len(calls) == 1
+    # maxrec is part of the key
+    simbad.Simbad.query_tap("select main_id from basic", maxrec=1)
+    assert len(calls) == 2
+    # results larger than the memory budget are not kept
+    with conf.set_temp("cache_memory_limit", 10):
+        simbad.Simbad.query_tap("select top 1 main_id from basic")
+        simbad.Simbad.query_tap("select top 1 main_id from basic")
+    assert len(calls) == 4
+    assert len(simbad.core._tap_cache) == 2
+    # expired results are queried again
+    with cache_conf.set_temp("cache_timeout", -1):
+        simbad.Simbad.query_tap("select main_id from basic")
+    assert len(calls) == 5
+    # no cache at all
+    with cache_conf.set_temp("cache_active", False):
+        simbad.Simbad.query_tap("select main_id from basic")
+    assert len(calls) == 6
+    simbad.Simbad.clear_cache()
+    assert len(simbad.core._tap_cache) == 0
+    assert simbad.core._tap_cache.nbytes == 0
+
+
+@pytest.mark.usefixtures("_mock_simbad_class")
+def test_query_tap_cache_uploads(monkeypatch):
+    calls = []
+
+    def run_sync(self, query, maxrec, uploads):
+        calls.append(query)
+        return Mock(to_table=lambda: uploads["letters"].copy())
+
+    monkeypatch.setattr(TAPService, "run_sync", run_sync)
+    query = "SELECT * FROM TAP_UPLOAD.letters"
+    simbad.Simbad.query_tap(query, letters=Table([["a", "b"]], names=["alphabet"]))
+    # same content in another table
+    simbad.Simbad.query_tap(query, letters=Table([["a", "b"]], names=["alphabet"]))
+    assert len(calls) == 1
+    simbad.Simbad.query_tap(query, letters=Table([["a", "c"]], names=["alphabet"]))
+    simbad.Simbad.query_tap(query, letters=Table([["a", "b"]], names=["letter"]))
+    assert len(calls) == 3
+    # an URL is not cached
+    monkeypatch.setattr(TAPService, "run_sync", lambda self, query, maxrec, uploads: Mock(
+        to_table=lambda: calls.append(query) or Table()))
+    simbad.Simbad.query_tap(query, letters="https://example.org/letters.xml")
+    simbad.Simbad.query_tap(query, letters="https://example.org/letters.xml")
+    assert len(calls) == 5
+
+
+@pytest.mark.usefixtures("_mock_simbad_class")
+def test_query_tap_cache_on_disk(monkeypatch):
+    calls = []
+    table = Table([["M 1", "M 2"], [1.5, 2.5]], names=["main_id", "ra"], dtype=[object, float])
+    table["ra"].unit = u.deg
+
+    def search(self, query, maxrec):
+        calls.append(query)
+        return Mock(to_table=lambda: table.copy())
+
+    monkeypatch.setattr(TAPService, "search", search)
+    monkeypatch.setattr(conf, "cache_on_disk", True)
+    simbad.Simbad.query_tap("select main_id, ra from basic")
+    cache_files = list(Path(paths.get_cache_dir(), "astroquery", "Simbad").glob("tap-*.xml"))
+    assert len(cache_files) == 1
+    # a new session reads the file
+    monkeypatch.setattr(simbad.core, "_tap_cache", simbad.core._TapCache())
+    result = simbad.Simbad.query_tap("select main_id, ra from basic")
+    assert len(calls) == 1
+    assert result.dtype == table.dtype
+    assert result["ra"].unit == u.deg
+    assert list(result["main_id"]) == ["M 1", "M 2"]
+    simbad.Simbad.clear_cache()
+    assert not cache_files[0].exists()
+    simbad.Simbad.query_tap("select main_id, ra from basic")
+    assert len(calls) == 2
+
+
+@pytest.mark.usefixtures("_mock_simbad_class")
+def test_query_tap_upload_chunks(monkeypatch):
+    monkeypatch.setattr(simbad.SimbadClass, "uploadlimit", 2)
+    letters = Table([["a", "b", "c", "d", "e"]], names=["alphabet"])
+    other = Table([[1]], names=["number"])
+    payloads = simbad.Simbad.query_tap("SELECT * FROM TAP_UPLOAD.letters", get_query_payload=True,
+                                       letters=letters, other=other)
+    assert len(payloads) == 3
+    assert all(payload["UPLOAD"] == payloads[0]["UPLOAD"] for payload in payloads)
+
+    def run_sync(self, query, maxrec, uploads):
+        assert len(uploads["letters"]) <= 2
+        assert uploads["other"] is other
+        return Mock(to_table=lambda: uploads["letters"].copy())
+
+    monkeypatch.setattr(TAPService, "run_sync", run_sync)
+    result = simbad.Simbad.query_tap("SELECT * FROM TAP_UPLOAD.letters", letters=letters, other=other)
+    assert list(result["alphabet"]) == ["a", "b", "c", "d", "e"]
+
+    with pytest.raises(ValueError, match="Only one of them can be split"):
+        simbad.Simbad.query_tap("SELECT * FROM TAP_UPLOAD.letters", letters=letters, numbers=letters)
+
+
+@pytest.mark.usefixtures("_mock_simbad_class")
+def test_query_objects_upload_chunks(monkeypatch):
+    monkeypatch.setattr(simbad.SimbadClass, "uploadlimit", 2)
+    names = ["m1", "m2", "m3", "m4", "m5"]
+
+    def run_sync(self, query, maxrec, uploads):
+        # the chunks come back in reverse order
+        return Mock(to_table=lambda: uploads["script_infos"][::-1])
+
+    monkeypatch.setattr(TAPService, "run_sync", run_sync)
+    simbad_instance = simbad.Simbad()
+    result = simbad_instance.query_objects(names)
+    assert list(result["object_number_id"]) == [1, 2, 3, 4, 5]
+    assert list(result["user_specified_id"]) == names
+
+    simbad_instance.ROW_LIMIT = 3
+    assert len(simbad_instance.query_objects(names)) == 3
+
+
 @pytest.mark.usefixtures("_mock_simbad_class")
 def test_empty_response_warns(monkeypatch):
     # return something of length zero
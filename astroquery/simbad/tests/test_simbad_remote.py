@@ -9,7 +9,8 @@ from astropy.table import Table
 
 from astroquery.exceptions import NoResultsWarning
 from astroquery.simbad import Simbad
-from astroquery.simbad.core import _cached_query_tap, _Column, _Join
+from astroquery.simbad import core
+from astroquery.simbad.core import _Column, _Join
 
 from pyvo.dal.exceptions import DALOverflowWarning
 
@@ -164,9 +165,9 @@ class TestSimbad:
         with pytest.raises(ValueError, match="Query string contains an odd number of single quotes.*"):
             Simbad.query_tap("'''")
         # test the cache
-        assert _cached_query_tap.cache_info().currsize != 0
+        assert len(core._tap_cache) != 0
         Simbad.clear_cache()
-        assert _cached_query_tap.cache_info().currsize == 0
+        assert len(core._tap_cache) == 0
 
     def test_async_query(self):
         adql = "select top 1 main_id from basic"
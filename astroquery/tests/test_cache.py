@@ -1,3 +1,4 @@
+import pickle
 import requests
 import os
 import pytest
@@ -8,6 +9,7 @@ from datetime import datetime
 from astropy.config import paths
 
 from astroquery.query import QueryWithLogin
+from astroquery.cache import CacheIndex, get_cache_index, write_response, read_response
 from astroquery import cache_conf
 
 URL1 = "http://fakeurl.edu"
@@ -159,10 +161,10 @@ def test_timeout(changing_mocked_response, monkeypatch):
     resp = mytest.test_func(URL1)  # should access cached value
     assert resp.content == TEXT1
 
-    # Changing the file date so the cache will consider it expired
+    # Changing the indexed creation date so the cache will consider it expired
     cache_file = next(mytest.cache_location.iterdir())
     modTime = mktime(datetime(1970, 1, 1).timetuple())
-    os.utime(cache_file, (modTime, modTime))
+    get_cache_index().add(cache_file, mytest.name, cache_file.stat().st_size, created=modTime)
 
     resp = mytest.test_func(URL1)
     assert resp.content == TEXT2  # now see the new response
@@ -212,3 +214,126 @@ def test_deactivate_with_set_temp(changing_mocked_response):
         assert len(os.listdir(mytest.cache_location)) == 0
 
     assert cache_conf.cache_active is True
+
+
+def test_timeout_unindexed(changing_mocked_response):
+    cache_conf.reset()
+
+    mytest = CacheTestClass()
+    mytest.clear_cache()
+
+    resp = mytest.test_func(URL1)  # should be cached
+    assert resp.content == TEXT1
+
+    # Cache files missing from the index fall back to the file date
+    cache_file = next(mytest.cache_location.iterdir())
+    get_cache_index().remove(cache_file)
+    modTime = mktime(datetime(1970, 1, 1).timetuple())
+    os.utime(cache_file, (modTime, modTime))
+
+    resp = mytest.test_func(URL1)
+    assert resp.content == TEXT2
+
+
+def test_cache_index(changing_mocked_response, tmp_path):
+    cache_conf.reset()
+
+    with paths.set_temp_cache(tmp_path):
+        mytest = CacheTestClass()
+        cache_index = get_cache_index()
+        assert cache_index.total_size() == 0
+
+        mytest.test_func(URL1)
+        mytest.test_func(URL2)
+        cache_files = list(mytest.cache_location.iterdir())
+        assert len(cache_files) == 2
+
+        total = sum(fle.stat().st_size for fle in cache_files)
+        assert cache_index.total_size() == total
+        assert cache_index.total_size(service=mytest.name) == total
+        assert cache_index.total_size(service="Other") == 0
+
+        mytest.clear_cache()
+        assert cache_index.total_size() == 0
+
+
+def test_size_limit(changing_mocked_response, tmp_path):
+    cache_conf.reset()
+
+    with paths.set_temp_cache(tmp_path):
+        mytest = CacheTestClass()
+        mytest.test_func(URL1)
+        first_file = next(mytest.cache_location.iterdir())
+        entry_size = first_file.stat().st_size
+
+        with cache_conf.set_temp("cache_size_limit", entry_size * 2):
+            mytest.test_func(URL2)
+            assert len(os.listdir(mytest.cache_location)) == 2
+
+            # Hitting the first entry makes the second the least recently used
+            mytest.test_func(URL1)
+            mytest.test_func("http://fakeurl.org")
+
+            assert len(os.listdir(mytest.cache_location)) == 2
+            assert first_file.exists()
+            assert get_cache_index().total_size() <= entry_size * 2
+
+
+def test_evict_expired(tmp_path):
+    cache_index = CacheIndex(tmp_path / "index.sqlite")
+
+    old_file = tmp_path / "old.pickle"
+    new_file = tmp_path / "new.pickle"
+    old_file.write_bytes(b"old")
+    new_file.write_bytes(b"new")
+    cache_index.add(old_file, "Test", 3, created=0)
+    cache_index.add(new_file, "Test", 3)
+
+    assert cache_index.evict(timeout=3600) == [str(old_file)]
+    assert not old_file.exists()
+    assert new_file.exists()
+    assert cache_index.lookup(old_file) is None
+    assert cache_index.lookup(new_file)[0] == 3
+
+
+@pytest.mark.parametrize('compression', ['none', 'gzip', 'zstd'])
+def test_response_roundtrip(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+
+    request = requests.Request("POST", URL1, data={"target": "M1"}).prepare()
+    response = requests.Response()
+    response._content = b"<VOTABLE>" + bytes(range(256)) * 100 + b"</VOTABLE>"
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = URL1
+    response.encoding = "utf-8"
+    response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "text/xml"})
+    response.request = request
+
+    cache_file = tmp_path / "entry.response"
+    size = write_response(response, cache_file, compression=compression)
+    assert size == cache_file.stat().st_size
+    if compression != 'none':
+        assert size < len(response.content)
+
+    cached = read_response(cache_file)
+    assert isinstance(cached, requests.Response)
+    assert cached.content == response.content
+    assert cached.status_code == 200
+    assert cached.reason == "OK"
+    assert cached.url == URL1
+    assert cached.encoding == "utf-8"
+    assert cached.headers["content-type"] == "text/xml"
+    assert cached.request.method == "POST"
+    assert cached.request.url == request.url
+    assert cached.request.body == "target=M1"
+    assert cached.request.headers["Content-Type"] == request.headers["Content-Type"]
+
+
+def test_read_foreign_file(tmp_path):
+    # e.g. a pickled response written by an older astroquery version
+    cache_file = tmp_path / "entry.response"
+    cache_file.write_bytes(pickle.dumps(_create_response(TEXT1), protocol=4))
+
+    assert read_response(cache_file) is None
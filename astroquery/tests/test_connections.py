@@ -0,0 +1,117 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from astroquery import connections
+from astroquery.connections import configure_host, get_adapter, close_connections, shared_adapter
+from astroquery.query import BaseQuery
+
+
+class DummyQuery(BaseQuery):
+
+    def fetch(self, url):
+        return self._request("GET", url, cache=False)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        if self.path == "/unavailable" and self.server.failures:
+            self.server.failures -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"Penguin"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=walrus")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.connections = set()
+    httpd.failures = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    configure_host("127.0.0.1", **{key: None for key in connections._SETTINGS})
+    close_connections()
+
+
+def test_shared_connections(server):
+    url = f"http://127.0.0.1:{server.server_port}/"
+    query = DummyQuery()
+    assert query._session.get_adapter(url) is shared_adapter
+
+    assert query.fetch(url).content == b"Penguin"
+    assert query().fetch(url).content == b"Penguin"
+    assert DummyQuery().fetch(url).content == b"Penguin"
+
+    # All three services reused the same keep-alive connection
+    assert len(server.connections) == 1
+
+    # Closing a session leaves the shared pools alone
+    query._session.close()
+    assert DummyQuery().fetch(url).content == b"Penguin"
+    assert len(server.connections) == 1
+
+
+def test_configure_host():
+    configure_host("example.org", pool_maxsize=3)
+    try:
+        adapter = get_adapter("example.org")
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == 3
+        assert get_adapter("example.org") is adapter
+        assert get_adapter("example.com")._pool_maxsize == 10
+
+        configure_host("example.org", pool_maxsize=None)
+        assert get_adapter("example.org")._pool_maxsize == 10
+    finally:
+        close_connections()
+
+    with pytest.raises(TypeError, match="pool_size"):
+        configure_host("example.org", pool_size=3)
+
+
+def test_retries(server):
+    url = f"http://127.0.0.1:{server.server_port}/unavailable"
+
+    server.failures = 1
+    assert DummyQuery().fetch(url).status_code == 503
+
+    server.failures = 1
+    configure_host("127.0.0.1", max_retries=2, retry_backoff_factor=0)
+    assert DummyQuery().fetch(url).status_code == 200
+
+
+def test_http2_adapter(server):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+
+    url = f"http://127.0.0.1:{server.server_port}/"
+    configure_host("127.0.0.1", http2=True)
+    assert isinstance(get_adapter("127.0.0.1"), connections.HTTP2Adapter)
+
+    query = DummyQuery()
+    response = query.fetch(url)
+    assert response.status_code == 200
+    assert response.content == b"Penguin"
+    assert response.headers["content-length"] == "7"
+    assert query._session.cookies["session"] == "walrus"
+
+    response = query._request("GET", url, stream=True, cache=False)
+    assert b"".join(response.iter_content(3)) == b"Penguin"
+    assert len(server.connections) == 1
@@ -0,0 +1,155 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from astroquery import cache_conf
+from astroquery.connections import aclose_connections
+from astroquery.query import BaseQuery
+from astroquery.utils import async_to_sync
+
+pytest.importorskip("httpx")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+        name = parse_qs(urlparse(self.path).query)["name"][0]
+        body = name.upper().encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=walrus")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.hits = httpd.active = httpd.max_active = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@async_to_sync
+class CoroutineQueries(BaseQuery):
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def query_object_async(self, name, *, get_query_payload=False, cache=False):
+        """
+        Query an object.
+        """
+        payload = {"name": name}
+        if get_query_payload:
+            return payload
+        return self._request("GET", self.url, params=payload, cache=cache)
+
+    def query_checked_async(self, name):
+        """
+        Query an object, looking at the response before returning it.
+        """
+        response = self._request("GET", self.url, params={"name": name}, cache=False)
+        response.raise_for_status()
+        return response
+
+    def query_resolved_async(self, name):
+        """
+        Query an object resolved with the session, without going through
+        _request, looking at the response before returning it.
+        """
+        name = self._session.get(self.url, params={"name": name}).text.lower()
+        response = self._request("GET", self.url, params={"name": name}, cache=False)
+        response.raise_for_status()
+        return response
+
+    def _parse_result(self, response, verbose=False):
+        return response.text
+
+
+def run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await aclose_connections()
+
+    return asyncio.run(main())
+
+
+def test_generated_coroutines():
+    assert CoroutineQueries.aquery_object.__name__ == "aquery_object"
+    assert "Coroutine version of ``query_object``" in CoroutineQueries.aquery_object.__doc__
+
+
+def test_concurrent_queries(server):
+    service = CoroutineQueries(f"http://127.0.0.1:{server.server_port}/")
+    names = [f"target{ii}" for ii in range(20)]
+
+    async def query_all():
+        return await asyncio.gather(*[service.aquery_object(name) for name in names])
+
+    assert run(query_all()) == [name.upper() for name in names]
+    assert server.hits == 20
+    assert server.max_active > 1
+    assert service._session.cookies["session"] == "walrus"
+
+
+def test_shared_cache(server, tmp_path):
+    cache_conf.reset()
+    service = CoroutineQueries(f"http://127.0.0.1:{server.server_port}/")
+    service.cache_location = tmp_path
+
+    assert service.query_object("m1", cache=True) == "M1"
+    assert run(service.aquery_object("m1", cache=True)) == "M1"
+    assert server.hits == 1
+
+    assert run(service.aquery_object("m31", cache=True)) == "M31"
+    assert service.query_object("m31", cache=True) == "M31"
+    assert server.hits == 2
+
+
+def test_payload_and_fallback(server):
+    service = CoroutineQueries(f"http://127.0.0.1:{server.server_port}/")
+
+    assert run(service.aquery_object("m1", get_query_payload=True)) == {"name": "m1"}
+    assert server.hits == 0
+
+    # The method looks at the response, so it runs in a thread instead
+    assert run(service.aquery_checked("m1")) == "M1"
+    assert server.hits == 1
+
+
+def test_direct_session_fallback(server):
+    service = CoroutineQueries(f"http://127.0.0.1:{server.server_port}/")
+
+    # The request sent with the session is stopped while the request is
+    # collected, and only sent by the method run in a thread
+    assert run(service.aquery_resolved("m1")) == "M1"
+    assert server.hits == 2
+
+    service._deferrable = False
+    assert run(service.aquery_object("m31")) == "M31"
+    assert server.hits == 3
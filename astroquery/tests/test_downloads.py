@@ -0,0 +1,191 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from astroquery.downloads import DownloadManager
+from astroquery.exceptions import RemoteServiceError
+from astroquery.query import BaseQuery
+
+
+def content(name):
+    return (name.encode() * 50000)[:50000]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        body = content(self.path)
+        start, end = 0, len(body) - 1
+        range_header = self.headers.get("Range")
+        with server.lock:
+            server.ranges.append(range_header)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+
+        if range_header and server.accept_ranges:
+            first, last = range_header.split("=")[1].split("-")
+            start, end = int(first), int(last) if last else end
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+        else:
+            self.send_response(200)
+        if server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        body = body[start:end + 1]
+        if range_header in server.cut:
+            # Drop the connection midway
+            server.cut.remove(range_header)
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.ranges = []
+    httpd.active = httpd.max_active = 0
+    httpd.accept_ranges = True
+    httpd.cut = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_many(server, tmp_path):
+    names = [f"/file{ii}" for ii in range(8)]
+    urls = [f"http://127.0.0.1:{server.server_port}{name}" for name in names]
+    paths = [tmp_path / f"file{ii}" for ii in range(8)]
+
+    result = BaseQuery()._download_many(urls, paths, max_workers=4)
+
+    assert result == [str(path) for path in paths]
+    for name, path in zip(names, paths):
+        assert path.read_bytes() == content(name)
+    assert server.max_active > 1
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_split_ranges(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/big"
+    session = requests.Session()
+    session.headers["X-Service"] = "walrus"
+    manager = DownloadManager(session, split_size=10000, range_workers=4)
+
+    manager.download([url], [tmp_path / "big"])
+
+    assert (tmp_path / "big").read_bytes() == content("/big")
+    assert sorted(server.ranges[1:]) == ["bytes=0-12499", "bytes=12500-24999",
+                                         "bytes=25000-37499", "bytes=37500-49999"]
+    assert manager.nbytes == 50000
+    # Ranges are sent with each request, never set on the shared session
+    assert "Range" not in session.headers
+
+
+def test_resume(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/resumed"
+    path = tmp_path / "resumed"
+    manager = DownloadManager(requests.Session())
+    manager.blocksize = 1000
+
+    server.cut = [None]
+    with pytest.raises(requests.exceptions.RequestException):
+        manager.download([url], [path])
+
+    assert not path.exists()
+    journal = json.loads((tmp_path / "resumed.part.json").read_text())
+    done = (tmp_path / "resumed.part").stat().st_size
+    assert journal["segments"] == [[0, 49999, done]]
+    assert 0 < done < 50000
+
+    manager.download([url], [path])
+    assert path.read_bytes() == content("/resumed")
+    assert server.ranges[-1] == f"bytes={done}-49999"
+    assert manager.nbytes == 50000 - done
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_resume_split(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/split"
+    path = tmp_path / "split"
+    manager = DownloadManager(requests.Session(), split_size=10000, range_workers=2)
+    manager.blocksize = 1000
+
+    server.cut = ["bytes=25000-49999"]
+    with pytest.raises(requests.exceptions.RequestException):
+        manager.download([url], [path])
+    (_, _, done0), (start, end, done1) = json.loads((tmp_path / "split.part.json").read_text())["segments"]
+    assert done0 == 25000
+    assert 0 < done1 < 25000
+
+    manager.download([url], [path])
+    assert path.read_bytes() == content("/split")
+    assert server.ranges[-1] == f"bytes={25000 + done1}-49999"
+    assert manager.nbytes == 25000 - done1
+
+
+def test_no_ranges(server, tmp_path):
+    server.accept_ranges = False
+    url = f"http://127.0.0.1:{server.server_port}/whole"
+    path = tmp_path / "whole"
+    manager = DownloadManager(requests.Session(), split_size=10000)
+
+    server.cut = [None]
+    with pytest.raises(requests.exceptions.RequestException):
+        manager.download([url], [path])
+    # Without range support there is no journal, the download restarts
+    assert not (tmp_path / "whole.part.json").exists()
+
+    manager.download([url], [path])
+    assert path.read_bytes() == content("/whole")
+    assert server.ranges == [None, None]
+
+
+def test_cache_and_exceptions(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/cached"
+    path = tmp_path / "cached"
+    path.write_bytes(content("/cached"))
+    manager = DownloadManager(requests.Session(), cache=True)
+
+    missing = tmp_path / "missing" / "file"
+    result = manager.download([url, url], [path, missing], return_exceptions=True)
+    assert result[0] == str(path)
+    assert isinstance(result[1], OSError)
+    assert manager.nbytes == 0
+
+    with pytest.raises(OSError):
+        manager.download([url], [missing])
+
+
+def test_range_ignored(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/ignored"
+    path = tmp_path / "ignored"
+    manager = DownloadManager(requests.Session(), split_size=10000, range_workers=2)
+
+    server.cut = ["bytes=25000-49999"]
+    with pytest.raises(requests.exceptions.RequestException):
+        manager.download([url], [path])
+
+    server.accept_ranges = False
+    with pytest.raises(RemoteServiceError, match="range request"):
+        manager.download([url], [path])
@@ -2,10 +2,13 @@
 import pytest
 import requests
 import logging
+import threading
+import time
 from pathlib import Path
 from requests.models import Response
 from requests.structures import CaseInsensitiveDict
 from astroquery.query import BaseQuery, BaseVOQuery
+from astroquery.utils import async_to_sync
 from astroquery.utils.mocks import MockResponse
 from itertools import product
 
@@ -149,9 +152,11 @@ def patch_get(monkeypatch, mock_response, mock_head_response):
             return response
 
         response = EnhancedMockResponse(TEST_FILE_CONTENT)
-        # Copy any headers from the session
+        # Copy any headers from the session and from the request
         for key, value in self.headers.items():
             response.headers[key] = value
+        for key, value in (kwargs.get('headers') or {}).items():
+            response.headers[key] = value
         return response
 
     monkeypatch.setattr(requests.Session, 'request', mock_request)
@@ -405,3 +410,84 @@ def test_download_file_caching(base_query, patch_get, tmp_path, log_level):
 
     # Reset logging level after test
     log.setLevel('INFO')
+
+
+@async_to_sync
+class ManyQueries(BaseQuery):
+
+    def query_object_async(self, name, *, cache=False):
+        """
+        Query an object.
+        """
+        return self._request("GET", f"http://example.org/{name}", cache=cache)
+
+    def _parse_result(self, response, verbose=False):
+        return response.content.decode()
+
+
+@pytest.fixture
+def patch_many(monkeypatch):
+    state = {"active": 0, "max_active": 0, "times": [], "sessions": set()}
+    lock = threading.Lock()
+
+    def mock_request(self, method, url, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+            state["times"].append(time.monotonic())
+            state["sessions"].add(id(self))
+        name = url.rsplit("/", 1)[-1]
+        # later queries complete first
+        time.sleep(0.02 * (5 - int(name)) if name.isdigit() else 0)
+        with lock:
+            state["active"] -= 1
+        if name == "fail":
+            raise requests.exceptions.ConnectionError("no route")
+        response = MockResponse(content=name.upper().encode())
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "request", mock_request)
+    return state
+
+
+def test_query_many(patch_many):
+    service = ManyQueries()
+    kwargs = [{"name": str(ii)} for ii in range(5)]
+
+    results = service.query_many("query_object", kwargs, max_workers=3)
+    assert results == ["0", "1", "2", "3", "4"]
+    assert 1 < patch_many["max_active"] <= 3
+    # each worker uses its own session, never the one of the service
+    assert 1 < len(patch_many["sessions"]) <= 3
+    assert id(service._session) not in patch_many["sessions"]
+
+    responses = service.query_many("query_object_async", kwargs[:2])
+    assert [response.content for response in responses] == [b"0", b"1"]
+
+
+def test_query_many_as_completed(patch_many):
+    results = ManyQueries().query_many("query_object", [{"name": str(ii)} for ii in range(5)],
+                                       max_workers=5, ordered=False)
+    results = list(results)
+    assert sorted(results) == [(ii, str(ii)) for ii in range(5)]
+    assert results[0] == (4, "4")
+
+
+def test_query_many_exceptions(patch_many):
+    kwargs = [{"name": "1"}, {"name": "fail"}]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        ManyQueries().query_many("query_object", kwargs)
+
+    results = ManyQueries().query_many("query_object", kwargs, return_exceptions=True)
+    assert results[0] == "1"
+    assert isinstance(results[1], requests.exceptions.ConnectionError)
+
+    with pytest.raises(AttributeError):
+        ManyQueries().query_many("query_nothing", kwargs)
+
+
+def test_query_many_rate_limit(patch_many):
+    ManyQueries().query_many("query_object", [{"name": "x"}] * 4, max_workers=4, rate_limit=20)
+    times = sorted(patch_many["times"])
+    assert times[-1] - times[0] >= 3 / 20 * 0.9
@@ -12,7 +12,9 @@ from .docstr_chompers import remove_sections
 
 def async_to_sync(cls):
     """
-    Convert all query_x_async methods to query_x methods
+    Convert all query_x_async methods to query_x methods, and to aquery_x
+    coroutines for the classes supporting asyncio
+    (`~astroquery.query.BaseQuery` subclasses).
 
     (see
     https://stackoverflow.com/questions/18048341/add-methods-to-a-class-generated-from-other-methods
@@ -38,6 +40,14 @@ def async_to_sync(cls):
 
         return newmethod
 
+    def create_coroutine(async_method_name, sync_method_name):
+
+        @class_or_instance
+        async def newcoroutine(self, *args, **kwargs):
+            return await self._arun(async_method_name, sync_method_name, *args, **kwargs)
+
+        return newcoroutine
+
     methods = list(cls.__dict__.keys())
 
     for k in list(methods):
@@ -56,9 +66,31 @@ def async_to_sync(cls):
 
             setattr(cls, newmethodname, newmethod)
 
+            coroutinename = 'a' + newmethodname
+            if hasattr(cls, '_arun') and coroutinename not in methods:
+                newcoroutine = create_coroutine(k, newmethodname)
+
+                newcoroutine.fn.__doc__ = async_to_sync_coroutine_docstr(newmethod.fn.__doc__,
+                                                                         newmethodname)
+                newcoroutine.fn.__name__ = coroutinename
+                newcoroutine.__name__ = coroutinename
+
+                functools.update_wrapper(newcoroutine, newcoroutine.fn)
+
+                setattr(cls, coroutinename, newcoroutine)
+
     return cls
 
 
+def async_to_sync_coroutine_docstr(doc, method_name):
+    """
+    Turn the docstring of a query method into the one of its coroutine version
+    """
+    firstline = ("Coroutine version of ``{0}``, to be awaited in an asyncio "
+                 "event loop.\n".format(method_name))
+    return "\n".join(['', firstline] + doc.lstrip('\n').split('\n'))
+
+
 def async_to_sync_docstr(doc, *, returntype='table'):
     """
     Strip of the "Returns" component of a docstr and replace it with "Returns a
@@ -20,13 +20,15 @@ import mimetypes
 import os
 import platform
 import requests
+import threading
 import time
+import weakref
 
-from astroquery import version
+from astroquery import version, connection_conf
 from astroquery.utils.tap import taputils
 from astroquery.utils.tap.xmlparser import utils
 
-__all__ = ['TapConn']
+__all__ = ['TapConn', 'ConnectionHandler', 'close_connections']
 
 CONTENT_TYPE_POST_DEFAULT = "application/x-www-form-urlencoded"
 
@@ -741,7 +743,171 @@ class TapConn:
                f"\n\tPort: {self.__connPort}\n\tSSL Port: {self.__connPortSsl}"
 
 
+class _PooledResponse(httplib.HTTPResponse):
+    """HTTP response recording whether its body was read to the end"""
+
+    complete = False
+    # Weak reference to the _PooledConnection of the response
+    pooled_connection = None
+
+    def _close_conn(self):
+        # Called when the end of the body is reached, or from close()
+        if not getattr(self, '_closing', False):
+            self.complete = True
+            conn = self.pooled_connection and self.pooled_connection()
+            if conn is not None:
+                conn._response_complete = True
+        super()._close_conn()
+
+    def close(self):
+        if self.fp is not None:
+            self._closing = True
+        super().close()
+
+
+class _PooledConnection:
+    """Keep-alive connection of the TAP connection pool
+
+    A connection can take a new request once the response of its previous
+    one is closed or dropped, or once that request has failed. A request on
+    a reused connection that the server has meanwhile closed is sent again
+    on a new socket.
+    """
+
+    response_class = _PooledResponse
+
+    def _pool_init(self):
+        self._reserved = False
+        self._response = None
+        self._response_complete = True
+        self._reused = False
+        self._request_args = None
+        self.nconnects = 0
+
+    def is_free(self):
+        if self._reserved:
+            return False
+        response = self._response and self._response()
+        return response is None or response.isclosed()
+
+    def reserve(self):
+        self._reserved = True
+        if not self._response_complete:
+            # The previous body was not read to the end, the rest of it
+            # would be taken for the next response
+            self.close()
+        self._response = None
+        self._response_complete = True
+
+    def _release(self):
+        # The request failed: the socket may be in any state
+        self.close()
+        self._reserved = False
+
+    def connect(self):
+        self.nconnects += 1
+        super().connect()
+
+    def request(self, method, url, body=None, headers={}, **kwargs):
+        self._reused = self.sock is not None
+        self._request_args = (method, url, body, headers, kwargs)
+        try:
+            try:
+                super().request(method, url, body, headers, **kwargs)
+            except (BrokenPipeError, ConnectionResetError):
+                if not self._reused:
+                    raise
+                self.close()
+                super().request(method, url, body, headers, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+    def getresponse(self):
+        try:
+            try:
+                response = super().getresponse()
+            except (httplib.RemoteDisconnected, ConnectionResetError):
+                # Keep-alive connection dropped by the server while idle
+                if not self._reused:
+                    raise
+                self.close()
+                method, url, body, headers, kwargs = self._request_args
+                super().request(method, url, body, headers, **kwargs)
+                response = super().getresponse()
+        except BaseException:
+            self._release()
+            raise
+        # Only weak references to the response, so that a response dropped
+        # before the end of its body frees the connection
+        self._HTTPConnection__response = None
+        response.pooled_connection = weakref.ref(self)
+        self._response = weakref.ref(response)
+        self._response_complete = response.complete
+        self._reserved = False
+        return response
+
+
+class _PooledHTTPConnection(_PooledConnection, httplib.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool_init()
+
+
+class _PooledHTTPSConnection(_PooledConnection, httplib.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool_init()
+
+
+# Keep-alive connections shared by all the ConnectionHandler objects, keyed
+# by (scheme, host, port), the most recently used last
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pooled_connection(scheme, host, port):
+    with _pools_lock:
+        pool = _pools.setdefault((scheme, host, port), [])
+        for i, conn in enumerate(pool):
+            if conn.is_free():
+                pool.append(pool.pop(i))
+                conn.reserve()
+                return conn
+        if scheme == "https":
+            conn = _PooledHTTPSConnection(host, port)
+        else:
+            conn = _PooledHTTPConnection(host, port)
+        conn.reserve()
+        if len(pool) >= max(connection_conf.pool_maxsize, 1):
+            # All busy: the least recently used connection leaves the pool
+            # and is dropped by its user once done, e.g. a response that
+            # is never read
+            pool.pop(0)
+        pool.append(conn)
+        return conn
+
+
+def close_connections():
+    """Closes all the keep-alive connections opened by the TAP services"""
+    with _pools_lock:
+        for pool in _pools.values():
+            for conn in pool:
+                conn.close()
+        _pools.clear()
+
+
 class ConnectionHandler:
+    """HTTP(s) connection handler (creator)
+
+    The connections are kept alive and shared by all the handlers, so that
+    successive requests to the same host, port and scheme, e.g. the phase
+    polls of a job, reuse the same socket instead of repeating the TCP and
+    TLS handshakes. A connection is handed out again once the response of
+    its previous request has been fully read, which makes the handlers safe
+    to use from several threads.
+    """
+
     def __init__(self, host, port, sslport):
         self.__connHost = host
         self.__connPort = port
@@ -755,7 +921,9 @@ class ConnectionHandler:
         else:
             if verbose:
                 print("------>http")
-            return httplib.HTTPConnection(self.__connHost, self.__connPort)
+            return _get_pooled_connection("http", self.__connHost,
+                                          self.__connPort)
 
     def get_connection_secure(self, verbose):
-        return httplib.HTTPSConnection(self.__connHost, self.__connPortSsl)
+        return _get_pooled_connection("https", self.__connHost,
+                                      self.__connPortSsl)
@@ -63,40 +63,22 @@ class DummyResponse:
                 if self.zip_bytes is None:
                     with open(v, 'rb') as file:
                         self.zip_bytes = file.read()
+                data = self.zip_bytes
+            else:
+                data = v.encode(encoding='utf_8', errors='strict')
 
             if size is None or size < 0:
-
-                if v.endswith('zip'):
-                    return self.zip_bytes
-
                 # read all
-                return v.encode(encoding='utf_8', errors='strict')
+                return data
             else:
-                is_zip = False
-
-                if v.endswith('zip'):
-                    is_zip = True
-                    bodyLength = len(self.zip_bytes)
-                    v = self.zip_bytes
-                else:
-                    bodyLength = len(v)
-
-                if self.index < 0:
-                    return ""
-                if size >= bodyLength:
-                    size = bodyLength - 1
-                if size <= 0:
-                    return ""
-                endPos = self.index + size
-                tmp = v[self.index:endPos]
-                self.index = endPos
-                if endPos >= (bodyLength - 1):
-                    self.index = -1
-
-                if is_zip:
-                    return tmp
-                else:
-                    return tmp.encode(encoding='utf_8', errors='strict')
+                if self.index >= len(data):
+                    # end of the body: the next reads start it again, so
+                    # that a response can be used by several tests
+                    self.index = 0
+                    return b""
+                tmp = data[self.index:self.index + size]
+                self.index += len(tmp)
+                return tmp
 
     def close(self):
         self.index = 0
@@ -15,8 +15,14 @@ Created on 30 jun. 2016
 
 """
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-from astroquery.utils.tap.conn.tapconn import TapConn
+import pytest
+
+from astroquery.utils.tap.conn import tapconn
+from astroquery.utils.tap.conn.tapconn import TapConn, close_connections
 from astroquery.utils.tap.conn.tests.DummyConn import DummyConn
 
 
@@ -25,6 +31,37 @@ def data_path(filename):
     return os.path.join(data_dir, filename)
 
 
+class StubTapHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        body = b"<VOTABLE/>" * 1000
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubTapHandler)
+    httpd.connections = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    close_connections()
+
+
 def test_get():
     conn = DummyConn("http")
     conn.response.status = 222
@@ -171,3 +208,73 @@ def test_get_file_from_header():
     result = tap.get_file_from_header(headers)
 
     assert (result == "my_file.vot.gz")
+
+
+def test_pooled_connections(server):
+    host, port = server.server_address
+    tap = TapConn(ishttps=False, host=host, server_context="tap", port=port)
+    other = TapConn(ishttps=False, host=host, server_context="tap", port=port)
+
+    for conn in (tap, other, tap):
+        assert conn.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+        assert conn.execute_tappost("sync", "QUERY=SELECT").read() == b"<VOTABLE/>" * 1000
+    assert len(server.connections) == 1
+
+    # An unread response keeps its connection busy
+    pending = tap.execute_tapget("sync")
+    assert other.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+    assert len(server.connections) == 2
+    pending.read()
+
+    # A response closed before its end does not leave data on the connection
+    close_connections()
+    response = tap.execute_tapget("sync")
+    response.read(10)
+    response.close()
+    assert tap.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+    assert len(server.connections) == 4
+
+
+def test_pooled_connections_failed_request(server, monkeypatch):
+    host, port = server.server_address
+    tap = TapConn(ishttps=False, host=host, server_context="tap", port=port)
+    assert tap.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+    conn = tapconn._pools[("http", host, port)][0]
+
+    def reset(self, *args, **kwargs):
+        raise ConnectionResetError("Connection reset by peer")
+
+    # The request fails before getresponse on a new socket
+    monkeypatch.setattr(tapconn.httplib.HTTPConnection, "request", reset)
+    conn.close()
+    with pytest.raises(ConnectionResetError):
+        tap.execute_tapget("sync")
+    monkeypatch.undo()
+    assert conn.is_free()
+    assert conn.sock is None
+
+    assert tap.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+    assert tapconn._pools[("http", host, port)] == [conn]
+
+
+def test_pooled_connections_dropped_response(server):
+    host, port = server.server_address
+    tap = TapConn(ishttps=False, host=host, server_context="tap", port=port)
+
+    # A response dropped before its end frees its connection
+    tap.execute_tapget("sync").read(10)
+    assert tap.execute_tapget("sync").read() == b"<VOTABLE/>" * 1000
+    assert len(tapconn._pools[("http", host, port)]) == 1
+    assert len(server.connections) == 2
+
+
+def test_pooled_connections_threads(server):
+    host, port = server.server_address
+    tap = TapConn(ishttps=False, host=host, server_context="tap", port=port)
+
+    def get(_):
+        return tap.execute_tapget("sync").read()
+
+    with ThreadPoolExecutor(4) as executor:
+        assert set(executor.map(get, range(40))) == {b"<VOTABLE/>" * 1000}
+    assert len(server.connections) <= 4
@@ -16,6 +16,7 @@ Modified on 1 jun. 2021 by mhsarmiento
 import getpass
 import os
 import tempfile
+import time
 from urllib.parse import urlencode
 
 import requests
@@ -26,7 +27,7 @@ from astroquery.utils.tap import taputils
 from astroquery.utils.tap.conn.tapconn import TapConn
 from astroquery.utils.tap.gui.login import LoginDialog
 from astroquery.utils.tap.model.filter import Filter
-from astroquery.utils.tap.model.job import Job
+from astroquery.utils.tap.model.job import Job, _ACTIVE_PHASES
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap.xmlparser.groupSaxParser import GroupSaxParser
 from astroquery.utils.tap.xmlparser.jobListSaxParser import JobListSaxParser
@@ -593,6 +594,67 @@ class Tap:
                 j.connHandler = self.__connHandler
         return jobs
 
+    def wait_for_jobs(self, jobs, *, timeout=None, poll_interval=0.5,
+                      max_poll_interval=10, backoff_factor=1.5, verbose=False):
+        """Waits until several asynchronous jobs are finished
+
+        The jobs are polled together, the phases of all the unfinished jobs
+        being requested in each round. The interval between two rounds starts
+        at ``poll_interval`` seconds and grows by ``backoff_factor`` up to
+        ``max_poll_interval`` seconds. The jobs in PENDING phase are started.
+
+        Parameters
+        ----------
+        jobs : list of Job objects, mandatory
+            asynchronous jobs
+        timeout : float, optional, default None
+            maximum time to wait, in seconds. None waits forever.
+        poll_interval : float, optional, default 0.5
+            initial interval between two rounds of polls, in seconds
+        max_poll_interval : float, optional, default 10
+            maximum interval between two rounds of polls, in seconds
+        backoff_factor : float, optional, default 1.5
+            growth of the interval after each round
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Returns
+        -------
+        A list with the final phase of each job
+
+        Raises
+        ------
+        TimeoutError
+            if some jobs are not finished after ``timeout`` seconds
+        """
+        jobs = list(jobs)
+        phases = [None] * len(jobs)
+        for job in jobs:
+            job._run_if_pending(verbose=verbose)
+        start_time = time.monotonic()
+        interval = poll_interval
+        active = list(range(len(jobs)))
+        while True:
+            round_time = time.monotonic()
+            for i in active:
+                phases[i] = jobs[i].get_phase(update=True).upper().strip()
+                if verbose:
+                    print(f"Job {jobs[i].jobid} status: {phases[i]}")
+            active = [i for i in active if phases[i] in _ACTIVE_PHASES]
+            if not active:
+                return phases
+            now = time.monotonic()
+            delay = interval - (now - round_time)
+            if timeout is not None:
+                remaining = timeout - (now - start_time)
+                if remaining <= 0:
+                    raise TimeoutError(f"{len(active)} of {len(jobs)} jobs not finished after {timeout} s: "
+                                       f"{', '.join(str(jobs[i].jobid) for i in active)}")
+                delay = min(delay, remaining)
+            if delay > 0:
+                time.sleep(delay)
+            interval = min(interval * backoff_factor, max_poll_interval)
+
     def __appendData(self, args):
         return urlencode(args)
 
@@ -27,6 +27,9 @@ from astroquery.utils.tap.xmlparser import utils
 
 __all__ = ['Job']
 
+# UWS phases of a job that has not ended yet
+_ACTIVE_PHASES = ('PENDING', 'QUEUED', 'EXECUTING')
+
 
 class Job:
     """Job class
@@ -247,6 +250,43 @@ class Job:
             self.__load_async_job_results()
             return self.results
 
+    def iter_results(self, *, chunk_rows=100000, verbose=False):
+        """Iterates over the job results by batches of rows
+        This method will block if the job is asynchronous and the job has not
+        finished yet. The results are streamed from the server, or read from
+        the output file, and only one batch of rows is decoded in memory at a
+        time. They are not kept in the job.
+
+        Parameters
+        ----------
+        chunk_rows : int, optional, default 100000
+            number of rows of each batch
+        verbose : bool, optional, default 'False'
+            flag to display information about the process
+
+        Yields
+        ------
+        The job results (astropy.table) by batches of ``chunk_rows`` rows.
+        Only the csv, ecsv and votable formats can be read by batches.
+        """
+        if self.results is not None:
+            for start in range(0, max(len(self.results), 1), chunk_rows):
+                yield self.results[start:start + chunk_rows]
+            return
+        output_format = self.parameters['format']
+        if modelutils.check_file_exists(self.outputFile):
+            with open(self.outputFile, 'rb') as f:
+                yield from utils.iter_http_response(f, output_format, chunk_rows=chunk_rows,
+                                                    use_names_over_ids=self.use_names_over_ids)
+            return
+        # Try to load from server: only async
+        if not self.async_:
+            # sync: result is in a file
+            return
+        response = self.__get_async_results_response(debug=verbose)
+        yield from utils.iter_http_response(response, output_format, chunk_rows=chunk_rows,
+                                            use_names_over_ids=self.use_names_over_ids)
+
     def set_results(self, results):
         """Sets the job results
 
@@ -304,41 +344,115 @@ class Job:
                     print(f"Saving results to: {output}")
                 self.connHandler.dump_to_file(output, response)
 
-    def wait_for_job_end(self, *, verbose=False):
+    def wait_for_job_end(self, *, verbose=False, timeout=None, poll_interval=0.5,
+                         max_poll_interval=10, backoff_factor=1.5, wait=None):
         """Waits until a job is finished
 
+        The phase of the job is first polled every ``poll_interval`` seconds,
+        the interval growing by ``backoff_factor`` after each poll up to
+        ``max_poll_interval`` seconds.
+
         Parameters
         ----------
         verbose : bool, optional, default 'False'
             flag to display information about the process
+        timeout : float, optional, default None
+            maximum time to wait, in seconds. None waits forever.
+        poll_interval : float, optional, default 0.5
+            initial interval between two polls, in seconds
+        max_poll_interval : float, optional, default 10
+            maximum interval between two polls, in seconds
+        backoff_factor : float, optional, default 1.5
+            growth of the interval after each poll
+        wait : int, optional, default None
+            if set, use the UWS blocking requests (``WAIT`` parameter): the
+            service answers as soon as the phase of the job changes, or after
+            at most ``wait`` seconds. Services not supporting them answer at
+            once, the polling then goes on with the backoff above.
+
+        Returns
+        -------
+        A tuple (HTTP status of the last request, phase of the job)
+
+        Raises
+        ------
+        TimeoutError
+            if the job is not finished after ``timeout`` seconds
         """
         currentResponse = None
-        responseData = None
         lphase = None
         # execute job if not running
-        if self._phase == 'PENDING':
-            log.info("Job in PENDING phase, sending phase=RUN request.")
-            try:
-                self.start(verbose=verbose)
-            except Exception as ex:
-                # ignore
-                if verbose:
-                    print("Exception when trying to start job", ex)
+        self._run_if_pending(verbose=verbose)
+        start_time = time.monotonic()
+        interval = poll_interval
         while True:
-            responseData = self.get_phase(update=True)
+            request_time = time.monotonic()
+            if wait and lphase is not None:
+                lwait = wait
+                if timeout is not None:
+                    lwait = max(1, min(wait, int(timeout - (request_time - start_time))))
+                responseData = self._wait_for_phase_change(lphase, lwait)
+            else:
+                responseData = self.get_phase(update=True)
             currentResponse = self.__last_phase_response_status
 
             lphase = responseData.upper().strip()
             if verbose:
                 print(f"Job {self.jobid} status: {lphase}")
-            if ("PENDING" != lphase and "QUEUED" != lphase and "EXECUTING" != lphase):
+            if lphase not in _ACTIVE_PHASES:
                 break
             # PENDING, QUEUED, EXECUTING, COMPLETED, ERROR, ABORTED, UNKNOWN,
             # HELD, SUSPENDED, ARCHIVED:
-            time.sleep(0.5)
+            now = time.monotonic()
+            delay = interval - (now - request_time)
+            if timeout is not None:
+                remaining = timeout - (now - start_time)
+                if remaining <= 0:
+                    raise TimeoutError(f"Job {self.jobid} still in phase {lphase} after {timeout} s")
+                delay = min(delay, remaining)
+            if delay > 0:
+                time.sleep(delay)
+            interval = min(interval * backoff_factor, max_poll_interval)
         return currentResponse, lphase
 
+    def _run_if_pending(self, *, verbose=False):
+        if self._phase == 'PENDING':
+            log.info("Job in PENDING phase, sending phase=RUN request.")
+            try:
+                self.start(verbose=verbose)
+            except Exception as ex:
+                # ignore
+                if verbose:
+                    print("Exception when trying to start job", ex)
+
+    def _wait_for_phase_change(self, phase, wait):
+        """Blocks until the job leaves ``phase``, for at most ``wait`` seconds
+        (UWS 1.1 blocking behaviour), and returns the new phase.
+        """
+        # jobSaxParser imports this module
+        from astroquery.utils.tap.xmlparser.jobSaxParser import JobSaxParser
+
+        context = f"async/{self.jobid}?{urlencode({'WAIT': wait, 'PHASE': phase})}"
+        response = self.connHandler.execute_tapget(context)
+
+        self.__last_phase_response_status = response.status
+        if response.status != 200:
+            errMsg = taputils.get_http_response_error(response)
+            print(response.status, errMsg)
+            raise requests.exceptions.HTTPError(errMsg)
+
+        jobs = JobSaxParser(async_job=True).parseData(response)
+        self._phase = str(jobs[0]._phase)
+        return self._phase
+
     def __load_async_job_results(self, *, debug=False):
+        resultsResponse = self.__get_async_results_response(debug=debug)
+        outputFormat = self.parameters['format']
+        results = utils.read_http_response(resultsResponse,
+                                           outputFormat, use_names_over_ids=self.use_names_over_ids)
+        self.set_results(results)
+
+    def __get_async_results_response(self, *, debug=False):
         wjResponse, phase = self.wait_for_job_end()
         subContext = f"async/{self.jobid}/results/result"
         resultsResponse = self.connHandler.execute_tapget(subContext)
@@ -363,10 +477,7 @@ class Job:
                 print(resultsResponse.status, errMsg)
                 raise requests.exceptions.HTTPError(errMsg)
             else:
-                outputFormat = self.parameters['format']
-                results = utils.read_http_response(resultsResponse,
-                                                   outputFormat, use_names_over_ids=self.use_names_over_ids)
-                self.set_results(results)
+                return resultsResponse
 
     def __handle_redirect_if_required(self, resultsResponse, *, verbose=False):
         # Thanks @emeraldTree24
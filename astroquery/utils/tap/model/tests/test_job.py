@@ -74,6 +74,33 @@ def test_job_get_results(capsys, tmpdir):
     assert 'Saving results to:' in capsys.readouterr().out
 
 
+def test_job_iter_results():
+    job = Job(async_job=True)
+    jobid = "12345"
+    job.jobid = jobid
+    job.parameters['format'] = "votable"
+    responseCheckPhase = DummyResponse(200)
+    responseCheckPhase.set_data(method='GET', body='COMPLETED')
+    connHandler = DummyConnHandler()
+    connHandler.set_response(f"async/{jobid}/phase", responseCheckPhase)
+    responseGetData = DummyResponse(200)
+    responseGetData.set_data(
+        method="GET",
+        body=(Path(__file__).with_name("data") / "result_1.vot").read_text())
+    connHandler.set_response(f"async/{jobid}/results/result", responseGetData)
+    job.connHandler = connHandler
+
+    chunks = list(job.iter_results(chunk_rows=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0].colnames == ['alpha', 'delta', 'source_id', 'table1_oid']
+    # The results are streamed, not kept in the job
+    assert job.results is None
+
+    res = job.get_results()
+    assert [len(chunk) for chunk in job.iter_results(chunk_rows=2)] == [2, 1]
+    assert job.results is res
+
+
 def test_job_phase():
     job = Job(async_job=True)
     jobid = "12345"
@@ -99,3 +126,67 @@ def test_job_phase():
     except ValueError:
         # ok
         pass
+
+
+def _running_job(connHandler, phase="EXECUTING"):
+    job = Job(async_job=True, connhandler=connHandler)
+    job.jobid = "12345"
+    job.set_phase(phase)
+    return job
+
+
+def test_job_wait_backoff(monkeypatch):
+    responsePhase = DummyResponse(200)
+    responsePhase.set_data(method='GET', body='EXECUTING')
+    connHandler = DummyConnHandler()
+    connHandler.set_response("async/12345/phase", responsePhase)
+    job = _running_job(connHandler)
+
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        if len(sleeps) == 6:
+            responsePhase.set_data(method='GET', body='COMPLETED')
+
+    monkeypatch.setattr("astroquery.utils.tap.model.job.time.sleep", sleep)
+    assert job.wait_for_job_end(poll_interval=1, max_poll_interval=4, backoff_factor=2) == (200, 'COMPLETED')
+    assert job.get_phase() == 'COMPLETED'
+    assert sleeps == pytest.approx([1, 2, 4, 4, 4, 4], abs=0.05)
+
+
+def test_job_wait_timeout(monkeypatch):
+    responsePhase = DummyResponse(200)
+    responsePhase.set_data(method='GET', body='QUEUED')
+    connHandler = DummyConnHandler()
+    connHandler.set_response("async/12345/phase", responsePhase)
+    job = _running_job(connHandler)
+
+    clock = [0.]
+
+    def sleep(delay):
+        clock[0] += delay
+
+    monkeypatch.setattr("astroquery.utils.tap.model.job.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("astroquery.utils.tap.model.job.time.sleep", sleep)
+    with pytest.raises(TimeoutError, match="12345 still in phase QUEUED"):
+        job.wait_for_job_end(timeout=10, poll_interval=3, backoff_factor=1)
+    assert clock[0] == 10
+
+
+def test_job_wait_blocking(monkeypatch):
+    responsePhase = DummyResponse(200)
+    responsePhase.set_data(method='GET', body='EXECUTING')
+    responseJob = DummyResponse(200)
+    responseJob.set_data(method='GET', body=(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<uws:job xmlns:uws="http://www.ivoa.net/xml/UWS/v1.0">'
+        '<uws:jobId>12345</uws:jobId><uws:phase>COMPLETED</uws:phase></uws:job>\n'))
+    connHandler = DummyConnHandler()
+    connHandler.set_response("async/12345/phase", responsePhase)
+    connHandler.set_response("async/12345?WAIT=30&PHASE=EXECUTING", responseJob)
+    job = _running_job(connHandler)
+
+    monkeypatch.setattr("astroquery.utils.tap.model.job.time.sleep", lambda delay: None)
+    assert job.wait_for_job_end(wait=30) == (200, 'COMPLETED')
+    assert connHandler.request == "async/12345?WAIT=30&PHASE=EXECUTING"
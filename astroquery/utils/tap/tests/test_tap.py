@@ -24,6 +24,7 @@ from astroquery.utils.tap import taputils
 from astroquery.utils.tap.conn.tests.DummyConnHandler import DummyConnHandler
 from astroquery.utils.tap.conn.tests.DummyResponse import DummyResponse
 from astroquery.utils.tap.core import TapPlus
+from astroquery.utils.tap.model.job import Job
 from astroquery.utils.tap.model.tapcolumn import TapColumn
 
 
@@ -593,6 +594,38 @@ def test_list_async_jobs():
     assert jobs[1].get_phase() == 'ERROR'
 
 
+def test_wait_for_jobs(monkeypatch):
+    conn_handler = DummyConnHandler()
+    tap = TapPlus(url="http://test:1111/tap", connhandler=conn_handler)
+    responses = {}
+    jobs = []
+    for jobid, phase in [('1', 'EXECUTING'), ('2', 'QUEUED'), ('3', 'COMPLETED')]:
+        responses[jobid] = DummyResponse(200)
+        responses[jobid].set_data(method='GET', body=phase)
+        conn_handler.set_response(f"async/{jobid}/phase", responses[jobid])
+        job = Job(async_job=True, connhandler=conn_handler)
+        job.jobid = jobid
+        job.set_phase('EXECUTING')
+        jobs.append(job)
+
+    polls = []
+
+    def sleep(delay):
+        polls.append(delay)
+        if len(polls) == 1:
+            responses['1'].set_data(method='GET', body='ERROR')
+        elif len(polls) == 3:
+            responses['2'].set_data(method='GET', body='COMPLETED')
+
+    monkeypatch.setattr("astroquery.utils.tap.core.time.sleep", sleep)
+    assert tap.wait_for_jobs(jobs, poll_interval=1, backoff_factor=2) == ['ERROR', 'COMPLETED', 'COMPLETED']
+    assert polls == pytest.approx([1, 2, 4], abs=0.05)
+
+    responses['2'].set_data(method='GET', body='EXECUTING')
+    with pytest.raises(TimeoutError, match="1 of 3 jobs not finished after 0 s: 2"):
+        tap.wait_for_jobs(jobs, timeout=0)
+
+
 def test_data():
     conn_handler = DummyConnHandler()
     tap = TapPlus(url="http://test:1111/tap",
@@ -15,8 +15,14 @@ Created on 30 jun. 2016
 
 """
 
+import gzip
+import io
 import os
 
+import numpy as np
+import pytest
+from astropy.table import vstack
+
 from astroquery.utils.tap.xmlparser import utils
 from astroquery.utils.tap.xmlparser.jobListSaxParser import JobListSaxParser
 from astroquery.utils.tap.xmlparser.jobSaxParser import JobSaxParser
@@ -156,6 +162,107 @@ def test_job_results_parser_ecsv():
     file.close()
 
 
+def test_read_http_response_gzip():
+    with open(data_path('1714556098855O-result.vot'), 'rb') as file:
+        body = file.read()
+    result_table = utils.read_http_response(io.BytesIO(gzip.compress(body)), 'votable_gzip')
+    assert len(result_table.columns) == 152
+    assert 'SOURCE_ID' in result_table.columns
+
+
+def test_open_http_response_spooled(monkeypatch):
+    monkeypatch.setattr(utils, 'SPOOL_MAX_SIZE', 100)
+    monkeypatch.setattr(utils, 'READ_CHUNK_SIZE', 64)
+    body = b"solution_id,source_id\n" + b"1,2\n" * 1000
+    with utils.open_http_response(io.BytesIO(gzip.compress(body))) as data:
+        assert not isinstance(data, io.BytesIO)
+        assert data.read() == body
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 2, 5, 100])
+def test_iter_http_response_votable(chunk_rows, monkeypatch):
+    # BINARY2 serialization, read by small blocks
+    monkeypatch.setattr(utils, 'READ_CHUNK_SIZE', 100)
+    with open(data_path('test_job_results.xml'), 'rb') as file:
+        expected = utils.read_http_response(file, 'votable')
+    with open(data_path('test_job_results.xml'), 'rb') as file:
+        chunks = list(utils.iter_http_response(file, 'votable', chunk_rows=chunk_rows))
+    assert [len(chunk) for chunk in chunks[:-1]] == [chunk_rows] * (len(chunks) - 1)
+    result_table = vstack(chunks)
+    assert result_table.colnames == expected.colnames
+    for name in expected.colnames:
+        assert np.all(np.ma.getmaskarray(result_table[name]) == np.ma.getmaskarray(expected[name]))
+        assert np.all(np.ma.filled(result_table[name] == expected[name], True))
+
+
+def test_iter_http_response_tabledata():
+    body = b"""<?xml version="1.0" encoding="UTF-8"?>
+<VOTABLE version="1.4" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">
+<RESOURCE type="results">
+<INFO name="QUERY" value="SELECT * FROM t WHERE ra > 10"/>
+<TABLE>
+<FIELD name="source_id" datatype="long"/>
+<FIELD name="ra" datatype="double" unit="deg"/>
+<DATA><TABLEDATA>
+<TR><TD>1</TD><TD>10.5</TD></TR>
+<TR><TD>2</TD><TD>11.5</TD></TR>
+<TR><TD>3</TD><TD>12.5</TD></TR>
+</TABLEDATA></DATA>
+</TABLE>
+<INFO name="QUERY_STATUS" value="OK"/>
+</RESOURCE>
+</VOTABLE>
+"""
+    chunks = list(utils.iter_http_response(io.BytesIO(gzip.compress(body)), 'votable', chunk_rows=2))
+    assert [list(chunk['source_id']) for chunk in chunks] == [[1, 2], [3]]
+    assert chunks[0]['ra'].unit == 'deg'
+
+
+@pytest.mark.parametrize('data', [
+    b'<DATA><TABLEDATA>\n</TABLEDATA></DATA>',
+    b'<DATA><BINARY2><STREAM encoding="base64">\n</STREAM></BINARY2></DATA>',
+    # as written by astropy for an empty table
+    b''])
+def test_iter_http_response_votable_empty(data):
+    body = b"""<?xml version="1.0" encoding="UTF-8"?>
+<VOTABLE version="1.4" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">
+<RESOURCE type="results">
+<TABLE>
+<FIELD name="source_id" datatype="long"/>
+<FIELD name="ra" datatype="double" unit="deg"/>
+""" + data + b"""
+</TABLE>
+</RESOURCE>
+</VOTABLE>
+"""
+    chunks = list(utils.iter_http_response(io.BytesIO(body), 'votable', chunk_rows=2))
+    assert len(chunks) == 1
+    assert len(chunks[0]) == 0
+    assert chunks[0].colnames == ['source_id', 'ra']
+    assert chunks[0]['ra'].unit == 'deg'
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'ecsv'])
+def test_iter_http_response_text(output_format):
+    with open(data_path(f'1714556098855O-result.{output_format}'), 'rb') as file:
+        expected = utils.read_http_response(file, output_format)
+    with open(data_path(f'1714556098855O-result.{output_format}'), 'rb') as file:
+        chunks = list(utils.iter_http_response(file, output_format, chunk_rows=1))
+    assert len(chunks) == 1
+    assert chunks[0].colnames == expected.colnames
+    assert chunks[0]['solution_id'].dtype == np.uint64
+
+
+def test_iter_http_response_csv_quoted():
+    body = b'source_id,comment\n1,"multi\nline"\n2,b\n3,c\n'
+    chunks = list(utils.iter_http_response(io.BytesIO(body), 'csv', chunk_rows=2))
+    assert [list(chunk['source_id']) for chunk in chunks] == [[1, 2], [3]]
+    assert chunks[0]['comment'][0] == 'multi\nline'
+
+    with pytest.raises(ValueError, match='cannot be read by batches'):
+        next(utils.iter_http_response(io.BytesIO(b'{}'), 'json'))
+
+
 def __check_table(table, qualifiedName, numColumns, columnsData, size_bytes=None):
     assert str(table.get_qualified_name()) == str(qualifiedName)
     c = table.columns
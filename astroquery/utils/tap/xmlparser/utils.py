@@ -14,10 +14,15 @@ Created on 30 jun. 2016
 
 
 """
+import base64
+import binascii
 import gzip
 import io
+import itertools
 import json
+import re
 import sys
+import tempfile
 import warnings
 
 import numpy as np
@@ -27,31 +32,95 @@ from astropy.table import Table as APTable
 from astropy.table.table import Table
 from astropy.utils.exceptions import AstropyWarning
 
+# Decompressed results larger than this are spooled to a temporary file
+SPOOL_MAX_SIZE = 64 * 1024 ** 2
+
+# Size of the blocks read from the responses
+READ_CHUNK_SIZE = 1024 ** 2
+
+GZIP_MAGIC = b'\x1f\x8b'
+
 
 def util_create_string_from_buffer(buffer):
     return ''.join(map(str, buffer))
 
 
-def read_http_response(response, output_format, *, correct_units=True, use_names_over_ids=False):
-    astropy_format = get_suitable_astropy_format(output_format)
+class _PrefixedStream(io.RawIOBase):
+    """Readable stream returning ``prefix`` and then the rest of ``stream``"""
 
-    # If we want to use astropy.table, we have to read the data
-    data = io.BytesIO(response.read())
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.prefix:
+            n = min(len(buffer), len(self.prefix))
+            buffer[:n] = self.prefix[:n]
+            self.prefix = self.prefix[n:]
+            return n
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_http_response(response):
+    """Returns the body of a response as a seekable binary file
+
+    The body is decompressed on the fly when it starts with the gzip magic
+    bytes, and copied by blocks in memory, or to a temporary file once
+    larger than `SPOOL_MAX_SIZE` bytes, so that at most one copy of the
+    results exists.
+
+    Parameters
+    ----------
+    response : HTTP(s) response object or binary file, mandatory
+        response to read
+
+    Returns
+    -------
+    A file object positioned at the start of the (decompressed) body
+    """
+    magic = response.read(len(GZIP_MAGIC))
+    stream = _PrefixedStream(magic, response)
+    if magic == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream, mode='rb')
+    spool = io.BytesIO()
+    while True:
+        block = stream.read(READ_CHUNK_SIZE)
+        if not block:
+            break
+        if isinstance(spool, io.BytesIO) and spool.tell() + len(block) > SPOOL_MAX_SIZE:
+            spooled = tempfile.TemporaryFile()
+            spooled.write(spool.getbuffer())
+            spool = spooled
+        spool.write(block)
+    spool.seek(0)
+    return spool
 
-    try:
-        if astropy_format == 'votable':
-            result = APTable.read(io.BytesIO(gzip.decompress(data.read())), format=astropy_format,
-                                  use_names_over_ids=use_names_over_ids)
-        else:
-            result = APTable.read(io.BytesIO(gzip.decompress(data.read())), format=astropy_format)
 
-    except OSError:
-        # data is not a valid gzip file by BadGzipFile.
+def _read_ascii_table(data, astropy_format):
+    with warnings.catch_warnings():
+        # Capturing the warning and converting the objid column to int64 is necessary for consistency as
+        # it was converted to string on systems with default integer int32 due to an overflow.
+        if sys.platform.startswith('win'):
+            warnings.filterwarnings("ignore", category=AstropyWarning,
+                                    message=r'OverflowError converting to IntType in column.*')
+        result = APTable.read(data, format=astropy_format)
+        if 'solution_id' in result.columns:
+            result['solution_id'] = result['solution_id'].astype(np.uint64)
+    return result
+
+
+def read_http_response(response, output_format, *, correct_units=True, use_names_over_ids=False):
+    astropy_format = get_suitable_astropy_format(output_format)
 
+    # If we want to use astropy.table, we have to read the data
+    with open_http_response(response) as data:
         if output_format == 'json':
 
-            # Set the file’s current position
-            data.seek(0)
             data_json = json.load(data)
 
             if data_json.get('data') and data_json.get('metadata'):
@@ -69,20 +138,13 @@ def read_http_response(response, output_format, *, correct_units=True, use_names
                     result[col_name].meta = {'metadata': v}
 
             else:
+                data.seek(0)
                 result = APTable.read(data, format=astropy_format)
 
         elif astropy_format == 'votable':
             result = APTable.read(data, format=astropy_format, use_names_over_ids=use_names_over_ids)
         else:
-            with warnings.catch_warnings():
-                # Capturing the warning and converting the objid column to int64 is necessary for consistency as
-                # it was converted to string on systems with default integer int32 due to an overflow.
-                if sys.platform.startswith('win'):
-                    warnings.filterwarnings("ignore", category=AstropyWarning,
-                                            message=r'OverflowError converting to IntType in column.*')
-                result = APTable.read(data, format=astropy_format)
-                if 'solution_id' in result.columns:
-                    result['solution_id'] = result['solution_id'].astype(np.uint64)
+            result = _read_ascii_table(data, astropy_format)
 
     if correct_units:
         modify_unrecognized_table_units(result)
@@ -90,6 +152,279 @@ def read_http_response(response, output_format, *, correct_units=True, use_names
     return result
 
 
+def iter_http_response(response, output_format, *, chunk_rows=100000, correct_units=True,
+                       use_names_over_ids=False):
+    """Reads the results of a response by batches of rows
+
+    Only one batch of rows is decoded in memory at a time. The response is
+    decompressed on the fly, see `open_http_response`.
+
+    Parameters
+    ----------
+    response : HTTP(s) response object or binary file, mandatory
+        response to read
+    output_format : str, mandatory
+        results format: 'csv', 'ecsv' or a VOTable format ('votable',
+        'votable_plain', 'votable_gzip'), with TABLEDATA, BINARY or
+        BINARY2 serialization
+    chunk_rows : int, optional, default 100000
+        number of rows of each batch
+    correct_units : bool, optional, default True
+        replace the units not recognized by astropy
+    use_names_over_ids : bool, optional, default False
+        use the ``name`` attributes of the VOTable columns as column names
+
+    Yields
+    ------
+    The results (`~astropy.table.Table`) by batches of ``chunk_rows`` rows.
+    A result without rows yields one empty table.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be a positive integer")
+    astropy_format = get_suitable_astropy_format(output_format)
+    with open_http_response(response) as data:
+        if astropy_format == 'votable':
+            chunks = (APTable.read(io.BytesIO(chunk), format=astropy_format,
+                                   use_names_over_ids=use_names_over_ids)
+                      for chunk in _iter_votable_chunks(data, chunk_rows))
+        elif astropy_format in ('ascii.csv', 'ascii.ecsv'):
+            chunks = (_read_ascii_table(chunk, astropy_format)
+                      for chunk in _iter_text_chunks(data, chunk_rows,
+                                                     comments=astropy_format == 'ascii.ecsv'))
+        else:
+            raise ValueError(f"Results in {output_format} format cannot be read by batches of rows, "
+                             "use csv, ecsv or votable")
+        for result in chunks:
+            if correct_units:
+                modify_unrecognized_table_units(result)
+            yield result
+
+
+def _iter_records(lines):
+    # A record goes on while a quoted value is open (odd number of quotes)
+    record = ''
+    for line in lines:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ''
+    if record:
+        yield record
+
+
+def _iter_text_chunks(data, chunk_rows, *, comments=False):
+    """Splits a CSV (or ECSV, ``comments=True``) file in documents of at most
+    ``chunk_rows`` rows, each starting with the header of the file.
+    """
+    lines = (line.decode('utf-8') for line in data)
+    header = []
+    for line in lines:
+        header.append(line)
+        if not (comments and line.startswith('#')):
+            break
+    # The column names may be quoted over several lines
+    records = _iter_records(itertools.chain(header[-1:], lines))
+    header = header[:-1]
+    header = ''.join(header) + next(records, '')
+    rows = []
+    yielded = False
+    for record in records:
+        if not record.strip():
+            continue
+        rows.append(record)
+        if len(rows) == chunk_rows:
+            yield header + ''.join(rows)
+            rows = []
+            yielded = True
+    if rows or not yielded:
+        yield header + ''.join(rows)
+
+
+# Sizes in bytes of the VOTable binary datatypes, 'bit' is handled apart
+_VOTABLE_SIZES = {'boolean': 1, 'unsignedByte': 1, 'short': 2, 'int': 4, 'long': 8,
+                  'char': 1, 'unicodeChar': 2, 'float': 4, 'double': 8,
+                  'floatComplex': 8, 'doubleComplex': 16}
+
+_XML_SKIPPED = re.compile(rb'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<!DOCTYPE[^>]*>', re.DOTALL)
+_XML_TAG = re.compile(rb'<(/?)([\w:.-]+)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(/?)>', re.DOTALL)
+_XML_ATTRIBUTE = re.compile(rb'([\w:.-]+)\s*=\s*(["\'])(.*?)\2', re.DOTALL)
+_DATA_START = re.compile(rb'<(TABLEDATA|BINARY2?)\b[^>]*>\s*(?:<STREAM\b([^>]*)>)?', re.DOTALL)
+
+
+def _read_votable_header(data):
+    """Reads the VOTable up to the rows of its first table
+
+    Returns the header, the serialization of the rows (TABLEDATA, BINARY or
+    BINARY2), the closing tags of the document and the bytes already read
+    after the header. A VOTable without data element, e.g. an empty table
+    written by astropy, is returned whole as the header, with no
+    serialization.
+    """
+    buffer = b''
+    while True:
+        match = _DATA_START.search(buffer)
+        # The STREAM element may still be on its way
+        if match and (match.group(1) == b'TABLEDATA' or match.group(2) is not None):
+            break
+        block = data.read(READ_CHUNK_SIZE)
+        if not block:
+            if match:
+                break
+            return buffer, None, b'', b''
+        buffer += block
+    header = buffer[:match.end()]
+    serialization = match.group(1).decode()
+    if serialization != 'TABLEDATA':
+        attributes = dict((key, value) for key, _, value
+                          in _XML_ATTRIBUTE.findall(match.group(2) or b''))
+        if attributes.get(b'encoding') != b'base64' or b'href' in attributes:
+            raise ValueError("Only VOTable binary data embedded with base64 encoding can be read by batches")
+
+    open_tags = []
+    for closing, name, _, empty in _XML_TAG.findall(_XML_SKIPPED.sub(b'', header)):
+        if empty:
+            continue
+        if closing:
+            open_tags.pop()
+        else:
+            open_tags.append(name)
+    footer = b''.join(b'</' + name + b'>' for name in reversed(open_tags))
+    return header, serialization, footer, buffer[match.end():]
+
+
+def _votable_fields(header):
+    """The fields of the first table of the header, as (datatype, arraysize)"""
+    fields = []
+    for closing, name, attributes, _ in _XML_TAG.findall(_XML_SKIPPED.sub(b'', header)):
+        if name == b'FIELD' and not closing:
+            attributes = dict((key, value) for key, _, value in _XML_ATTRIBUTE.findall(attributes))
+            fields.append((attributes[b'datatype'].decode(),
+                           attributes.get(b'arraysize', b'').decode()))
+        elif name == b'TABLE' and closing:
+            fields = []
+    return fields
+
+
+def _binary_row_parser(fields, serialization):
+    """Returns a function giving the size of the row starting at an offset
+    of a BINARY or BINARY2 buffer, or None if the row is incomplete.
+    """
+    layout = []
+    for datatype, arraysize in fields:
+        dimensions = arraysize.split('x') if arraysize else ['1']
+        variable = dimensions[-1].endswith('*')
+        count = 1
+        for dimension in dimensions[:-1] if variable else dimensions:
+            count *= int(dimension)
+        layout.append((datatype, _VOTABLE_SIZES.get(datatype), count, variable))
+    mask_size = (len(fields) + 7) // 8 if serialization == 'BINARY2' else 0
+
+    def row_size(buffer, offset):
+        position = offset + mask_size
+        for datatype, size, count, variable in layout:
+            if variable:
+                if position + 4 > len(buffer):
+                    return None
+                count *= int.from_bytes(buffer[position:position + 4], 'big')
+                position += 4
+            if datatype == 'bit':
+                position += (count + 7) // 8
+            else:
+                position += count * size
+        if position > len(buffer):
+            return None
+        return position - offset
+
+    return row_size
+
+
+def _iter_votable_chunks(data, chunk_rows):
+    """Splits a VOTable in documents holding at most ``chunk_rows`` rows of
+    its first table.
+    """
+    header, serialization, footer, buffer = _read_votable_header(data)
+    if serialization is None:
+        yield header
+        return
+    if serialization == 'TABLEDATA':
+        rows = _iter_tabledata_rows(data, buffer)
+    else:
+        rows = _iter_binary_rows(data, buffer, _binary_row_parser(_votable_fields(header),
+                                                                  serialization))
+    chunk = []
+    yielded = False
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield _votable_chunk(header, chunk, footer, serialization)
+            chunk = []
+            yielded = True
+    if chunk or not yielded:
+        yield _votable_chunk(header, chunk, footer, serialization)
+
+
+def _votable_chunk(header, rows, footer, serialization):
+    if serialization == 'TABLEDATA':
+        body = b''.join(rows)
+    else:
+        body = base64.b64encode(b''.join(rows))
+    return header + body + footer
+
+
+def _iter_tabledata_rows(data, buffer):
+    offset = 0
+    while True:
+        end = buffer.find(b'</TR>', offset)
+        if end >= 0:
+            end += len(b'</TR>')
+            yield buffer[offset:end]
+            offset = end
+            continue
+        if buffer.find(b'</TABLEDATA>', offset) >= 0:
+            return
+        block = data.read(READ_CHUNK_SIZE)
+        if not block:
+            return
+        # Trim the rows already split once per block
+        buffer = buffer[offset:] + block
+        offset = 0
+
+
+def _iter_binary_rows(data, text, row_size):
+    buffer = bytearray()
+    offset = 0
+    pending = b''
+    finished = False
+    while True:
+        size = row_size(buffer, offset)
+        if size is not None:
+            yield bytes(buffer[offset:offset + size])
+            offset += size
+            continue
+        if finished:
+            return
+        # Decode the next base64 block, up to the end of the stream
+        end = text.find(b'<')
+        if end >= 0:
+            text = text[:end]
+            finished = True
+        elif not text:
+            text = data.read(READ_CHUNK_SIZE)
+            if not text:
+                finished = True
+            continue
+        encoded = pending + b''.join(text.split())
+        text = b''
+        usable = len(encoded) - len(encoded) % 4
+        pending = encoded[usable:]
+        del buffer[:offset]
+        offset = 0
+        try:
+            buffer += base64.b64decode(encoded[:usable], validate=True)
+        except binascii.Error as ex:
+            raise ValueError(f"Invalid base64 data in the VOTable results: {ex}") from ex
+
+
 def get_suitable_astropy_format(output_format):
     if 'ecsv' == output_format:
         return 'ascii.ecsv'
@@ -42,6 +42,11 @@ class Conf(_config.ConfigNamespace):
         'Maximum number of rows that will be fetched from the result '
         '(set to -1 for unlimited).')
 
+    max_targets_per_request = _config.ConfigItem(
+        10000,
+        'Maximum number of targets sent in one request by a multi-target '
+        'region query. Longer lists of targets are split in several requests.')
+
 
 conf = Conf()
 
@@ -5,10 +5,10 @@ import os
 import warnings
 import json
 import copy
-import re
 
 from io import BytesIO
 
+import numpy as np
 import astropy.units as u
 import astropy.coordinates as coord
 import astropy.table as tbl
@@ -18,6 +18,7 @@ import astropy.io.votable as votable
 from astropy.io import ascii, fits
 from pyvo import registry
 
+from .. import cache_conf
 from ..query import BaseQuery
 from ..utils import commons
 from ..utils import async_to_sync
@@ -401,16 +402,13 @@ class VizierClass(BaseQuery):
             catalog=catalog)
         if get_query_payload:
             return data_payload
-        response = self._request(
-            method='POST', url=self._server_to_url(return_type=return_type),
-            data=data_payload, timeout=self.TIMEOUT, cache=cache)
-        return response
+        return self._post_payload(data_payload, return_type=return_type, cache=cache)
 
     def query_region_async(self, coordinates, *, radius=None, inner_radius=None,
                            width=None, height=None, catalog=None,
                            get_query_payload=False, cache=True,
                            return_type='votable', column_filters={},
-                           frame='fk5'):
+                           frame='fk5', max_workers=4):
         """
         Serves the same purpose as `query_region` but only
         returns the HTTP response rather than the parsed result.
@@ -450,11 +448,20 @@ class VizierClass(BaseQuery):
         cache : bool
             Defaults to True. If set overrides global caching behavior.
             See :ref:`caching documentation <astroquery_cache>`.
+        max_workers : int, optional
+            Lists of more than ``conf.max_targets_per_request`` targets are
+            split in several requests, up to ``max_workers`` of them running
+            at the same time. Their results are merged, the ``_q`` column
+            still referring to the rows of ``coordinates``.
 
         Returns
         -------
-        response : `requests.Response`
-            The response of the HTTP request.
+        response : `requests.Response` or list
+            The response of the HTTP request. With more than
+            ``conf.max_targets_per_request`` targets, the list of the
+            responses of the requests the targets were split in, which
+            `~astroquery.vizier.VizierClass._parse_result` merges in one
+            `~astroquery.utils.TableList`.
 
         """
         if frame not in ('galactic', 'fk5', 'icrs'):
@@ -468,18 +475,10 @@ class VizierClass(BaseQuery):
             target = commons.parse_coordinates(coordinates).transform_to(frame)
 
             if not target.isscalar:
-                center["-c"] = []
-                for pos in target:
-                    if frame == 'galactic':
-                        glon_deg = pos.l.to_string(unit="deg", decimal=True, precision=8)
-                        glat_deg = pos.b.to_string(unit="deg", decimal=True, precision=8,
-                                                   alwayssign=True)
-                        center["-c"] += ["G{}{}".format(glon_deg, glat_deg)]
-                    else:
-                        ra_deg = pos.ra.to_string(unit="deg", decimal=True, precision=8)
-                        dec_deg = pos.dec.to_string(unit="deg", decimal=True,
-                                                    precision=8, alwayssign=True)
-                        center["-c"] += ["{}{}".format(ra_deg, dec_deg)]
+                if frame == 'galactic':
+                    center["-c"] = _format_positions(target.l, target.b, galactic=True)
+                else:
+                    center["-c"] = _format_positions(target.ra, target.dec)
                 columns += ["_q"]  # Always request reference to input table
             else:
                 if frame == 'galactic':
@@ -495,17 +494,11 @@ class VizierClass(BaseQuery):
         elif isinstance(coordinates, tbl.Table):
             if (("_RAJ2000" in coordinates.keys()) and ("_DEJ2000" in
                                                         coordinates.keys())):
-                center["-c"] = []
                 sky_coord = coord.SkyCoord(coordinates["_RAJ2000"],
                                            coordinates["_DEJ2000"],
                                            unit=(coordinates["_RAJ2000"].unit,
                                                  coordinates["_DEJ2000"].unit))
-                for (ra, dec) in zip(sky_coord.ra, sky_coord.dec):
-                    ra_deg = ra.to_string(unit="deg", decimal=True,
-                                          precision=8)
-                    dec_deg = dec.to_string(unit="deg", decimal=True,
-                                            precision=8, alwayssign=True)
-                    center["-c"] += ["{}{}".format(ra_deg, dec_deg)]
+                center["-c"] = _format_positions(sky_coord.ra, sky_coord.dec)
                 columns += ["_q"]  # Always request reference to input table
             else:
                 raise ValueError("Table must contain '_RAJ2000' and "
@@ -530,6 +523,25 @@ class VizierClass(BaseQuery):
             raise Exception(
                 "At least one of radius, width/height must be specified")
 
+        # Split long lists of targets in several requests
+        max_targets = conf.max_targets_per_request
+        if isinstance(center["-c"], list) and len(center["-c"]) > max_targets:
+            offsets = range(0, len(center["-c"]), max_targets)
+            payloads = [self._args_to_payload(
+                center={**center, "-c": center["-c"][offset:offset + max_targets]},
+                columns=columns, catalog=catalog, column_filters=column_filters)
+                for offset in offsets]
+
+            if get_query_payload:
+                return payloads
+
+            responses = self.query_many(
+                '_post_payload',
+                [dict(data_payload=payload, return_type=return_type, cache=cache)
+                 for payload in payloads],
+                max_workers=max_workers)
+            return _ChunkedResponses(responses, offsets)
+
         # Prepare payload
         data_payload = self._args_to_payload(center=center, columns=columns,
                                              catalog=catalog, column_filters=column_filters)
@@ -537,9 +549,22 @@ class VizierClass(BaseQuery):
         if get_query_payload:
             return data_payload
 
+        return self._post_payload(data_payload, return_type=return_type, cache=cache)
+
+    def _post_payload(self, data_payload, *, return_type='votable', cache=True):
+        """
+        Send a query payload to the VizieR server.
+
+        The ``asu-tsv`` responses that are not cached are streamed, so that
+        `iter_tsv_tables` can parse their tables as they are downloaded. A
+        cached response is read to the end to be written in the cache.
+        """
+        if cache is None:
+            cache = cache_conf.cache_active
         response = self._request(
             method='POST', url=self._server_to_url(return_type=return_type),
-            data=data_payload, timeout=self.TIMEOUT, cache=cache)
+            data=data_payload, timeout=self.TIMEOUT, cache=cache,
+            stream=(return_type == 'asu-tsv' and not cache))
         return response
 
     def query_constraints_async(self, *, catalog=None, return_type='votable',
@@ -591,10 +616,7 @@ class VizierClass(BaseQuery):
             center={'-c.rd': 180})
         if get_query_payload:
             return data_payload
-        response = self._request(
-            method='POST', url=self._server_to_url(return_type=return_type),
-            data=data_payload, timeout=self.TIMEOUT, cache=cache)
-        return response
+        return self._post_payload(data_payload, return_type=return_type, cache=cache)
 
     def _args_to_payload(self, *args, **kwargs):
         """
@@ -752,6 +774,10 @@ class VizierClass(BaseQuery):
             as a string.
 
         """
+        if isinstance(response, _ChunkedResponses):
+            return self._merge_chunked_results(response, verbose=verbose,
+                                               invalid=invalid)
+
         if response.content[:5] == b'<?xml':
             try:
                 return _parse_vizier_votable(
@@ -773,6 +799,74 @@ class VizierClass(BaseQuery):
             return fits.open(BytesIO(response.content),
                              ignore_missing_end=True)
 
+    def iter_tsv_tables(self, response, *, chunk_size=2**20):
+        """
+        Parse the tables of an ``asu-tsv`` response one by one, while it is
+        being downloaded.
+
+        The response is only downloaded progressively if the query was sent
+        with ``cache=False``. Otherwise it is read to the end to be written
+        in the cache, before the first table is parsed.
+
+        Parameters
+        ----------
+        response : `requests.Response`
+            The response of a query method called with
+            ``return_type='asu-tsv'``, e.g.
+            `~astroquery.vizier.VizierClass.query_region_async`.
+        chunk_size : int
+            Number of bytes read from the response at a time.
+
+        Yields
+        ------
+        table : `~astropy.table.Table`
+            The tables of the response, with their catalog name in
+            ``table.meta['name']``. A table of the response split in several
+            blocks is yielded once per block.
+
+        Examples
+        --------
+        >>> from astroquery.vizier import Vizier
+        >>> response = Vizier.query_object_async(
+        ...     "HD 226868", catalog=["NOMAD", "UCAC"],
+        ...     return_type='asu-tsv', cache=False)  # doctest: +REMOTE_DATA
+        >>> for table in Vizier.iter_tsv_tables(response):  # doctest: +REMOTE_DATA +IGNORE_OUTPUT
+        ...     print(table.meta['name'], len(table))
+        """
+        response.raise_for_status()
+        yield from _iter_vizier_tsv(response.iter_content(chunk_size))
+
+    def _merge_chunked_results(self, responses, *, verbose=False, invalid='warn'):
+        """
+        Parse the responses of a query split in several requests, and stack
+        the tables of the same catalog, shifting their ``_q`` column by the
+        position of the first target of their request.
+
+        Always returns a `~astroquery.utils.TableList`: a response that is not
+        a table (e.g. a FITS file or an error page) raises a `TableParseError`.
+        """
+        table_dict = OrderedDict()
+        for response, offset in zip(responses, responses.offsets):
+            response.raise_for_status()
+            result = self._parse_result(response, verbose=verbose, invalid=invalid)
+            if not isinstance(result, commons.TableList):
+                self.response = response
+                raise TableParseError("Failed to parse VIZIER result! The "
+                                      "raw response of the request starting "
+                                      f"at target {offset} can be found in "
+                                      "self.response.")
+            for name, table in zip(result.keys(), result):
+                if '_q' in table.colnames and offset:
+                    table['_q'] = table['_q'].astype(np.int64) + offset
+                table_dict.setdefault(name, []).append(table)
+
+        for name, tables in table_dict.items():
+            if len(tables) > 1:
+                table_dict[name] = tbl.vstack(tables, metadata_conflicts='silent')
+            else:
+                table_dict[name] = tables[0]
+        return commons.TableList(table_dict)
+
     @property
     def valid_keywords(self):
         if not hasattr(self, '_valid_keyword_dict'):
@@ -797,15 +891,150 @@ def _parse_vizier_tsvfile(data, *, verbose=False):
     data : response content bytes
        Bytes containing the vizier-formatted list of tables
     """
+    return _stack_tables(_parse_vizier_tsv_block(block)
+                         for block in _split_vizier_tsv(data))
+
+
+def _stack_tables(tables):
+    """
+    Gather tables in a `~astroquery.utils.TableList` keyed by their names,
+    stacking the tables of the same name.
+    """
+    table_dict = OrderedDict()
+    for table in tables:
+        if table is not None:
+            table_dict.setdefault(table.meta['name'], []).append(table)
+    for name, tables in table_dict.items():
+        if len(tables) > 1:
+            table_dict[name] = tbl.vstack(tables, metadata_conflicts='silent')
+        else:
+            table_dict[name] = tables[0]
+    return commons.TableList(table_dict)
+
 
-    # http://stackoverflow.com/questions/4664850/find-all-occurrences-of-a-substring-in-python
-    split_indices = [m.start() for m in re.finditer(b'\n\n#', data)]
-    # we want to slice out chunks of the file each time
-    split_limits = zip(split_indices[:-1], split_indices[1:])
-    tables = [ascii.read(BytesIO(data[a:b]), format='fast_tab', delimiter='\t',
-                         header_start=0, comment="#") for
-              a, b in split_limits]
-    return tables
+def _split_vizier_tsv(data):
+    """
+    Yield the blocks of a tsv response separated by blank lines, as
+    memoryviews of ``data``.
+    """
+    view = memoryview(data)
+    start = 0
+    while (end := data.find(b'\n\n#', start)) >= 0:
+        yield view[start:end]
+        start = end + 2
+    yield view[start:]
+
+
+def _iter_vizier_tsv(chunks):
+    """
+    Parse the tables of a tsv response read by chunks of bytes, yielding
+    each table as soon as its block is complete.
+    """
+    buffer = bytearray()
+    start = searched = 0
+    for chunk in chunks:
+        buffer += chunk
+        while (end := buffer.find(b'\n\n#', max(start, searched - 2))) >= 0:
+            with memoryview(buffer) as view:
+                table = _parse_vizier_tsv_block(view[start:end])
+            if table is not None:
+                yield table
+            start = end + 2
+        searched = len(buffer)
+        if start > len(buffer) // 2:
+            # Drop the parsed blocks
+            del buffer[:start]
+            searched -= start
+            start = 0
+    with memoryview(buffer) as view:
+        table = _parse_vizier_tsv_block(view[start:])
+    if table is not None:
+        yield table
+
+
+# Fortran-like formats of the "#Column" descriptions
+_TSV_FLOAT_FORMATS = ('F', 'E', 'D')
+
+
+def _parse_vizier_tsv_block(block):
+    """
+    Parse a block of a tsv response into a `~astropy.table.Table`, or return
+    None if the block has no table.
+
+    A table block is made of comment lines describing the table, with one
+    ``#Column<TAB>name<TAB>(format)<TAB>description`` line per column, then
+    the line of the column names, the line of their units, a line of dashes
+    and the rows. The rows are read by the fast C reader, the columns with
+    a string format being kept as strings.
+    """
+    try:
+        text = str(block, 'ascii')
+        fast_reader = True
+    except UnicodeDecodeError:
+        # The C reader only handles ascii
+        text = str(block, 'utf-8', 'replace')
+        fast_reader = False
+
+    name = table_id = description = None
+    formats = {}
+    descriptions = {}
+    pos = 0
+    while text.startswith(('#', '\n'), pos):
+        end = text.find('\n', pos)
+        if end < 0:
+            return None
+        line = text[pos:end]
+        if line.startswith('#Column\t'):
+            fields = line.split('\t')
+            formats[fields[1]] = fields[2].strip('()')[:1].upper() if len(fields) > 2 else ''
+            descriptions[fields[1]] = fields[3] if len(fields) > 3 else None
+        elif line.startswith('#Table\t'):
+            table_id = line.split('\t')[1].rstrip(':')
+        elif line.startswith('#Name: '):
+            name = line[7:].strip()
+        elif line.startswith('#Title: '):
+            description = line[8:].strip()
+        pos = end + 1
+    if not formats or pos >= len(text):
+        return None
+    name = name or table_id
+
+    # Column names, units and dashes
+    header = []
+    while len(header) < 3 and pos < len(text):
+        end = text.find('\n', pos)
+        end = len(text) if end < 0 else end
+        header.append((text[pos:end].rstrip('\r'), end + 1))
+        pos = end + 1
+    names = header[0][0].split('\t')
+    for index, (line, next_pos) in enumerate(header[1:], start=1):
+        if line and not line.strip('-\t '):
+            units = header[1][0].split('\t') if index == 2 else None
+            data_pos = next_pos
+            break
+    else:
+        units = None
+        data_pos = header[0][1]
+
+    types = '\t'.join('S' if formats.get(colname, 'A') == 'A' else 'N' for colname in names)
+    table = ascii.read(header[0][0] + '\n' + types + '\n' + text[data_pos:],
+                       format='rdb', fast_reader=fast_reader, guess=False,
+                       comment='#')
+    if len(table) == 0:
+        return None
+
+    for index, colname in enumerate(names):
+        column = table.columns[index]
+        if formats.get(colname) in _TSV_FLOAT_FORMATS and column.dtype.kind in 'iu':
+            table.replace_column(column.name, column.astype(float))
+            column = table.columns[index]
+        if units and index < len(units) and units[index] and not units[index].startswith('"'):
+            column.unit = u.Unit(units[index], format='cds', parse_strict='silent')
+        column.description = descriptions.get(colname)
+    table.meta['name'] = name
+    if description:
+        table.meta['description'] = description
+    return table
 
 
 def _parse_vizier_votable(data, *, verbose=False, invalid='warn',
@@ -853,6 +1082,33 @@ def _parse_vizier_votable(data, *, verbose=False, invalid='warn',
         return commons.TableList(table_dict)
 
 
+class _ChunkedResponses(list):
+    """
+    The responses of a query split in several requests, with the index of
+    the first target of each request in ``offsets``.
+    """
+
+    def __init__(self, responses, offsets):
+        super().__init__(responses)
+        self.offsets = list(offsets)
+
+
+def _format_positions(lon, lat, *, galactic=False):
+    """
+    Format arrays of positions as VizieR targets, all at once.
+
+    The targets are the same as the ones built with
+    ``lon.to_string(unit="deg", decimal=True, precision=8)`` and
+    ``lat.to_string(unit="deg", decimal=True, precision=8, alwayssign=True)``
+    for each position, prefixed with ``G`` for galactic coordinates.
+    """
+    targets = np.char.add(np.char.mod('%.8f', np.atleast_1d(lon.to_value(u.deg))),
+                          np.char.mod('%+.8f', np.atleast_1d(lat.to_value(u.deg))))
+    if galactic:
+        targets = np.char.add('G', targets)
+    return targets.tolist()
+
+
 def _parse_angle(angle):
     """
     Returns the Vizier-formatted units and values for box/radius
@@ -6,6 +6,7 @@ import os
 
 def get_package_data():
     paths_test = [os.path.join('data', 'viz.xml'),
+                  os.path.join('data', 'viz.tsv'),
                   os.path.join('data', 'kang2010.xml'),
                   os.path.join('data', 'afgl2591_iram.xml'),
                   os.path.join('data', 'find_kangapj70683.xml'),
@@ -10,7 +10,7 @@ from astropy.table import Table
 import astropy.units as u
 
 from ... import vizier
-from ...exceptions import EmptyResponseError
+from ...exceptions import EmptyResponseError, TableParseError
 from ...utils import commons
 from astroquery.utils.mocks import MockResponse
 from .conftest import scalar_skycoord, vector_skycoord
@@ -120,6 +120,53 @@ def test_parse_result(filepath, objlen):
     assert isinstance(result[result.keys()[0]], Table)
 
 
+def test_parse_result_tsv():
+    with open(data_path('viz.tsv'), 'rb') as infile:
+        response = MockResponse(infile.read())
+    result = vizier.core.Vizier._parse_result(response)
+
+    assert isinstance(result, commons.TableList)
+    assert result.keys() == ['I/239/hip_main', 'I/289/out']
+    hip = result['I/239/hip_main']
+    assert hip.colnames == ['_r', 'HIP', 'RAhms', 'DEdms', 'Vmag', 'CCDM']
+    assert hip['HIP'].dtype.kind == 'i'
+    # Formats of the column descriptions: F is float even without decimals,
+    # A is string even when the values look like numbers
+    npt.assert_array_equal(hip['Vmag'].mask, [False, True, False])
+    assert hip['Vmag'].dtype.kind == 'f' and hip['Vmag'].unit == u.mag
+    assert list(hip['CCDM'][:2]) == ['0012', '0345']
+    assert hip['HIP'].description == 'Identifier (HIP number) (H1)'
+    assert hip.meta['description'] == 'The Hipparcos Main Catalogue'
+    # The last table of the response
+    assert len(result['I/289/out']) == 2
+    assert result['I/289/out']['RAJ2000'].unit == u.deg
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 2**20])
+def test_iter_tsv_tables(chunk_size):
+    with open(data_path('viz.tsv'), 'rb') as infile:
+        content = infile.read()
+    expected = vizier.core._parse_vizier_tsvfile(content)
+    tables = list(vizier.core.Vizier.iter_tsv_tables(MockResponse(content),
+                                                     chunk_size=chunk_size))
+
+    assert [table.meta['name'] for table in tables] == expected.keys()
+    for table, expected_table in zip(tables, expected):
+        assert table.pformat() == expected_table.pformat()
+
+
+@pytest.mark.parametrize(('return_type', 'cache', 'stream'),
+                         [('asu-tsv', False, True), ('asu-tsv', True, False),
+                          ('votable', False, False)])
+def test_post_payload_stream(monkeypatch, return_type, cache, stream):
+    # a cached response is read to the end before it is returned
+    requests = []
+    viz = vizier.core.VizierClass()
+    monkeypatch.setattr(viz, '_request', lambda **kwargs: requests.append(kwargs))
+    viz._post_payload("-source=I/289", return_type=return_type, cache=cache)
+    assert requests[0]['stream'] is stream
+
+
 def test_query_region_async(patch_post):
     response = vizier.core.Vizier.query_region_async(
         scalar_skycoord, radius=5 * u.deg, catalog=["HIP", "NOMAD", "UCAC"])
@@ -164,6 +211,83 @@ def test_query_regions(patch_post):
         vector_skycoord, radius=5 * u.deg, catalog=["HIP", "NOMAD", "UCAC"])
 
 
+@pytest.mark.parametrize("frame", ("icrs", "galactic"))
+def test_query_regions_payload(frame):
+    coords = SkyCoord(ra=[0, 299.59, 359.999999999, 10.5] * u.deg,
+                      dec=[-1e-12, 35.201, -89.5, 0] * u.deg, frame="icrs")
+    payload = vizier.VizierClass().query_region_async(
+        coords, radius=5 * u.deg, frame=frame, get_query_payload=True)
+    targets = payload.split("-c=<<====AstroqueryList\n")[1].split("\n====AstroqueryList")[0]
+
+    expected = []
+    for pos in coords.transform_to(frame):
+        lon, lat = (pos.l, pos.b) if frame == "galactic" else (pos.ra, pos.dec)
+        expected.append("{}{}{}".format(
+            "G" if frame == "galactic" else "",
+            lon.to_string(unit="deg", decimal=True, precision=8),
+            lat.to_string(unit="deg", decimal=True, precision=8, alwayssign=True)))
+    assert targets.splitlines() == expected
+
+
+def _chunk_votable(nrows):
+    rows = "".join(f"<TR><TD>{q}</TD><TD>{q * 1.5}</TD></TR>" for q in range(1, nrows + 1))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<VOTABLE version="1.4" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">
+<RESOURCE ID="yCat_1239" name="I/239">
+<TABLE ID="I_239_hip_main" name="I/239/hip_main">
+<FIELD name="_q" datatype="unsignedByte" width="1"/>
+<FIELD name="Vmag" datatype="float" width="5" unit="mag"/>
+<DATA><TABLEDATA>{rows}</TABLEDATA></DATA>
+</TABLE>
+</RESOURCE>
+</VOTABLE>""".encode()
+
+
+def test_query_regions_chunked(monkeypatch):
+    payloads = []
+
+    def post_payload(self, data_payload, *, return_type='votable', cache=True):
+        payloads.append(data_payload)
+        targets = data_payload.split("-c=<<====AstroqueryList\n")[1].split("\n====")[0]
+        return MockResponse(_chunk_votable(len(targets.splitlines())))
+
+    monkeypatch.setattr(vizier.VizierClass, '_post_payload', post_payload)
+    monkeypatch.setattr(vizier.conf, 'max_targets_per_request', 2)
+    coords = SkyCoord(ra=[10, 20, 30, 40, 50] * u.deg, dec=[1, 2, 3, 4, 5] * u.deg)
+
+    query = vizier.VizierClass().query_region_async(coords, radius=5 * u.deg, get_query_payload=True)
+    assert len(query) == 3
+    assert all("-c.rd=5.0" in payload.splitlines() for payload in query)
+
+    result = vizier.VizierClass().query_region(coords, radius=5 * u.deg)
+    assert len(payloads) == 3
+    assert isinstance(result, commons.TableList)
+    assert result.keys() == ["I/239/hip_main"]
+    assert list(result[0]["_q"]) == [1, 2, 3, 4, 5]
+    npt.assert_allclose(result[0]["Vmag"], [1.5, 3, 1.5, 3, 1.5])
+
+
+def test_query_regions_chunked_parse_error(monkeypatch):
+    def post_payload(self, data_payload, *, return_type='votable', cache=True):
+        targets = data_payload.split("-c=<<====AstroqueryList\n")[1].split("\n====")[0]
+        if len(targets.splitlines()) == 1:
+            return MockResponse(b"Service unavailable")
+        return MockResponse(_chunk_votable(len(targets.splitlines())))
+
+    monkeypatch.setattr(vizier.VizierClass, '_post_payload', post_payload)
+    monkeypatch.setattr(vizier.conf, 'max_targets_per_request', 2)
+    coords = SkyCoord(ra=[10, 20, 30] * u.deg, dec=[1, 2, 3] * u.deg)
+
+    # up to max_targets_per_request targets, a single response
+    response = vizier.VizierClass().query_region_async(coords[:2], radius=5 * u.deg)
+    assert isinstance(response, MockResponse)
+
+    viz = vizier.VizierClass()
+    with pytest.raises(TableParseError):
+        viz.query_region(coords, radius=5 * u.deg)
+    assert viz.response.content == b"Service unavailable"
+
+
 def test_query_object_async(patch_post):
     response = vizier.core.Vizier.query_object_async(
         "HD 226868", catalog=["NOMAD", "UCAC"])
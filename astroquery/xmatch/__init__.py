@@ -14,6 +14,17 @@ class Conf(_config.ConfigNamespace):
         300,
         'time limit for connecting to xMatch server')
 
+    tables_timeout = _config.ConfigItem(
+        86400,
+        'Time in seconds after which the list of the tables available in '
+        'the xMatch service is reloaded.')
+
+    max_workers = _config.ConfigItem(
+        # the service bans the addresses sending too many jobs in parallel
+        2,
+        'Maximum number of queries running at the same time when a local '
+        'table is cross-matched in chunks.')
+
 
 conf = Conf()
 
@@ -1,12 +1,17 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 from io import StringIO, BytesIO
+import threading
+import time
 
+from astropy.coordinates import SkyCoord
 from astropy.io import votable
 import astropy.units as u
-from astropy.table import Table
-from requests import HTTPError
+from astropy.table import Table, vstack
+import numpy as np
+from requests import HTTPError, RequestException
 
+from astroquery import log
 from astroquery.query import BaseQuery
 from astroquery.exceptions import InvalidQueryError
 from astroquery.utils import url_helpers, prepend_docstr_nosections, async_to_sync
@@ -19,14 +24,88 @@ except ImportError:
           'functionalities of this module.')
 
 
+def _sky_chunks(ra, dec, chunk_size):
+    """Split the rows of a catalogue in chunks of neighbouring sources.
+
+    The sources are sorted in declination zones, by right ascension,
+    alternately increasing and decreasing from a zone to the next, so that
+    each chunk of ``chunk_size`` consecutive sources covers a compact area.
+
+    Returns
+    -------
+    chunks : list of `~numpy.ndarray`
+        The indices of the rows of each chunk.
+    """
+    nchunks = -(-len(ra) // chunk_size)
+    nzones = max(1, int(np.sqrt(nchunks)))
+    dec_min, dec_max = np.nanmin(dec, initial=np.inf), np.nanmax(dec, initial=-np.inf)
+    zone = np.floor((dec - dec_min) / ((dec_max - dec_min) or 1) * nzones)
+    zone = np.nan_to_num(zone, nan=nzones).clip(0, nzones - 1)
+    order = np.lexsort((np.where(zone % 2, -ra, ra), zone))
+    return [order[start:start + chunk_size] for start in range(0, len(order), chunk_size)]
+
+
+class _TableRegistry:
+    """The identifiers of the VizieR tables available in the XMatch service.
+
+    They are loaded with ``load`` on first use and kept in a frozenset. Once
+    they are older than ``conf.tables_timeout`` seconds, they are reloaded
+    in a background thread, the previous set being used in the meantime.
+    """
+
+    def __init__(self, load):
+        self._load = load
+        self._tables = None
+        self._loaded = 0
+        self._refreshing = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def set(self, tables):
+        self._tables = frozenset(tables)
+        self._loaded = time.monotonic()
+
+    def get(self):
+        tables = self._tables
+        if tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self.set(self._load())
+                return self._tables
+        if time.monotonic() - self._loaded > conf.tables_timeout:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    self._thread = threading.Thread(target=self._refresh, daemon=True)
+                    self._thread.start()
+        return tables
+
+    def _refresh(self):
+        try:
+            # a cached response would not be any newer
+            self.set(self._load(cache=False))
+        except RequestException as ex:
+            # keep the previous tables until the next timeout
+            self._loaded = time.monotonic()
+            log.warning(f"Could not refresh the list of the XMatch tables: {ex}")
+        finally:
+            self._refreshing = False
+
+
 @async_to_sync
 class XMatchClass(BaseQuery):
     URL = conf.url
     TIMEOUT = conf.timeout
 
+    def __init__(self):
+        super().__init__()
+        # shared with the copies of the instance made by query_many
+        self._table_registry = _TableRegistry(self.get_available_tables)
+
     def query(self, cat1, cat2, max_distance, *,
               colRA1=None, colDec1=None, colRA2=None, colDec2=None,
-              area='allsky', cache=True, get_query_payload=False, **kwargs):
+              area='allsky', cache=True, get_query_payload=False, chunk_size=None,
+              **kwargs):
         """
         Query the `CDS cross-match service
         <http://cdsxmatch.u-strasbg.fr/xmatch>`_ by finding matches between
@@ -67,12 +146,24 @@ class XMatchClass(BaseQuery):
         cache : bool
             Defaults to True. If set overrides global caching behavior.
             See :ref:`caching documentation <astroquery_cache>`.
+        chunk_size : int, optional
+            For a large local `~astropy.table.Table` in ``cat1`` (or else
+            ``cat2``): the table is split in chunks of at most ``chunk_size``
+            neighbouring sources, cross-matched in concurrent queries, at most
+            ``conf.max_workers`` at a time. The results of the chunks are
+            stacked in one table. With a cone ``area``, only the sources close
+            to the cone are uploaded. Defaults to `None`, the whole table
+            being uploaded in one query.
 
         Returns
         -------
         table : `~astropy.table.Table`
             Query results table
         """
+        if chunk_size is not None:
+            return self._query_chunks(cat1, cat2, max_distance, chunk_size, colRA1=colRA1,
+                                      colDec1=colDec1, colRA2=colRA2, colDec2=colDec2, area=area,
+                                      cache=cache, get_query_payload=get_query_payload, **kwargs)
         response = self.query_async(cat1, cat2, max_distance, colRA1=colRA1, colDec1=colDec1,
                                     colRA2=colRA2, colDec2=colDec2, area=area, cache=cache,
                                     get_query_payload=get_query_payload,
@@ -128,6 +219,45 @@ class XMatchClass(BaseQuery):
 
         return response
 
+    def _query_chunks(self, cat1, cat2, max_distance, chunk_size, *, area, get_query_payload,
+                      **kwargs):
+        """Cross-match a local table in chunks, see ``chunk_size`` in `query`."""
+        cat_index = 1 if isinstance(cat1, Table) else 2
+        table = cat1 if cat_index == 1 else cat2
+        if not isinstance(table, Table):
+            raise ValueError("chunk_size requires an astropy Table in cat1 or cat2.")
+        ra_column, dec_column = kwargs[f'colRA{cat_index}'], kwargs[f'colDec{cat_index}']
+        if ra_column is None or dec_column is None:
+            raise ValueError(f"The arguments 'colRA{cat_index}' and 'colDec{cat_index}' "
+                             "must be provided for a local table.")
+        ra = np.asarray(table[ra_column], dtype=float)
+        dec = np.asarray(table[dec_column], dtype=float)
+
+        rows = np.arange(len(table))
+        if area is not None and area != 'allsky':
+            # the sources further from the cone have no counterpart in it
+            self._prepare_area({}, area)
+            separation = SkyCoord(ra, dec, unit=u.deg).separation(area.center)
+            near = separation <= area.radius + max_distance
+            rows, ra, dec = rows[near], ra[near], dec[near]
+
+        # a query without sources still gives the columns of the result
+        chunks = _sky_chunks(ra, dec, chunk_size) or [np.arange(0)]
+        list_of_kwargs = [dict(kwargs, cat1=cat1, cat2=cat2, max_distance=max_distance, area=area,
+                               get_query_payload=get_query_payload, cat_index=cat_index,
+                               rows=rows[chunk])
+                          for chunk in chunks]
+        results = self.query_many('_query_chunk', list_of_kwargs, max_workers=conf.max_workers)
+        if get_query_payload:
+            return results
+        return vstack(results, metadata_conflicts='silent')
+
+    def _query_chunk(self, *, cat_index, rows, **kwargs):
+        """Query with the ``rows`` of the local table ``cat{cat_index}``."""
+        catstr = f'cat{cat_index}'
+        kwargs[catstr] = kwargs[catstr][rows]
+        return self.query(**kwargs)
+
     def _prepare_sending_table(self, cat_index, payload, kwargs, cat, colRA, colDec):
         '''Check if table is a string, a `astropy.table.Table`, etc. and set
         query parameters accordingly.
@@ -196,12 +326,15 @@ class XMatchClass(BaseQuery):
         if table_id.startswith('vizier:'):
             table_id = table_id[7:]
 
-        return table_id in self.get_available_tables()
+        return table_id in self._table_registry.get()
 
     def get_available_tables(self, *, cache=True):
         """Get the list of the VizieR tables which are available in the
         xMatch service and return them as a list of strings.
 
+        `is_table_available` keeps them in memory, and reloads them in the
+        background after ``conf.tables_timeout`` seconds.
+
         Parameters
         ----------
         cache : bool
@@ -1,15 +1,20 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+from io import BytesIO
 from pathlib import Path
 import re
 
+import numpy as np
 import requests
 import pytest
+from astropy.coordinates import SkyCoord
 from astropy.io import ascii
+from astropy.io.votable import from_table
 from astropy.table import Table
-from astropy.units import arcsec
+from astropy.units import arcsec, deg
 
 from astroquery.utils.mocks import MockResponse
-from ...xmatch import XMatch
+from ...xmatch import XMatch, conf
+from ...xmatch.core import _sky_chunks
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_FILES = {
@@ -71,6 +76,45 @@ def test_xmatch_is_avail_table(monkeypatch):
     assert not xm.is_table_available('blablabla')
 
 
+def test_available_tables_registry(monkeypatch):
+    xm = XMatch()
+    calls = []
+
+    def get_available_tables(*, cache=True):
+        calls.append(cache)
+        return ['II/311/wise']
+
+    xm._table_registry._load = get_available_tables
+    assert xm.is_table_available('II/311/wise')
+    assert not xm.is_table_available('II/246/out')
+    payload = {}
+    xm._prepare_sending_table(1, payload, {}, "II/311/wise", None, None)
+    assert payload == {'cat1': 'vizier:II/311/wise'}
+    assert calls == [True]
+
+    # the expired tables are reloaded in the background, without the cache
+    def refresh(*, cache=True):
+        calls.append(cache)
+        return ['II/311/wise', 'II/246/out']
+
+    xm._table_registry._load = refresh
+    with conf.set_temp('tables_timeout', -1):
+        assert not xm.is_table_available('II/246/out')
+        xm._table_registry._thread.join()
+    assert xm.is_table_available('II/246/out')
+    assert calls == [True, False]
+
+    # the previous tables are kept if the reload fails
+    def fail(*, cache=True):
+        raise requests.ConnectionError("no connection")
+
+    xm._table_registry._load = fail
+    with conf.set_temp('tables_timeout', -1):
+        assert xm.is_table_available('II/246/out')
+        xm._table_registry._thread.join()
+    assert xm.is_table_available('II/246/out')
+
+
 def test_xmatch_query_local(monkeypatch):
     xm = XMatch()
     monkeypatch.setattr(xm, '_request', request_mockreturn)
@@ -156,3 +200,72 @@ def test_prepare_sending_tables(monkeypatch):
     assert (kwargs == {'files': {'cat1': ('cat1.csv', 'a,b\n0,3\n1,4\n2,5\n')}}
             # for windows systems
             or kwargs == {'files': {'cat1': ('cat1.csv', 'a,b\r\n0,3\r\n1,4\r\n2,5\r\n')}})
+
+
+def test_sky_chunks():
+    rng = np.random.default_rng(0)
+    ra, dec = rng.uniform(0, 360, 1000), np.degrees(np.arcsin(rng.uniform(-1, 1, 1000)))
+    chunks = _sky_chunks(ra, dec, 100)
+    assert len(chunks) == 10
+    assert sorted(np.concatenate(chunks)) == list(range(1000))
+    # each chunk is in a declination zone
+    assert all(np.ptp(dec[chunk]) < 150 for chunk in chunks)
+    assert [len(chunk) for chunk in _sky_chunks(ra, dec, 300)] == [300, 300, 300, 100]
+    assert _sky_chunks(ra[:0], dec[:0], 300) == []
+
+
+def _chunk_table():
+    rng = np.random.default_rng(1)
+    return Table({'ra': rng.uniform(0, 20, 100), 'dec': rng.uniform(-10, 10, 100),
+                  'my_id': np.arange(100)})
+
+
+def test_query_chunks_payload(monkeypatch):
+    xm = XMatch()
+    monkeypatch.setattr(xm, '_request', request_mockreturn)
+    table = _chunk_table()
+    payloads = xm.query(cat1=table, cat2='vizier:II/246/out', max_distance=5 * arcsec,
+                        colRA1='ra', colDec1='dec', chunk_size=30, get_query_payload=True)
+    assert len(payloads) == 4
+    uploaded = [ascii.read(kwargs['files']['cat1'][1], format='csv') for _, kwargs in payloads]
+    assert [len(chunk) for chunk in uploaded] == [30, 30, 30, 10]
+    assert sorted(np.concatenate([chunk['my_id'] for chunk in uploaded])) == list(range(100))
+    assert all(payload['cat2'] == 'vizier:II/246/out' for payload, _ in payloads)
+
+    # with a cone, only the sources around the cone are sent
+    regions = pytest.importorskip("regions")
+    area = regions.CircleSkyRegion(SkyCoord(5 * deg, 0 * deg), 3 * deg)
+    payloads = xm.query(cat1=table, cat2='vizier:II/246/out', max_distance=5 * arcsec,
+                        colRA1='ra', colDec1='dec', chunk_size=30, area=area,
+                        get_query_payload=True)
+    assert all(payload['area'] == 'cone' for payload, _ in payloads)
+    uploaded = [ascii.read(kwargs['files']['cat1'][1], format='csv') for _, kwargs in payloads]
+    near = SkyCoord(table['ra'], table['dec'], unit=deg).separation(area.center) < 3 * deg
+    assert sorted(np.concatenate([chunk['my_id'] for chunk in uploaded])) == list(table['my_id'][near])
+    area = regions.CircleSkyRegion(SkyCoord(180 * deg, 60 * deg), 3 * deg)
+    payloads = xm.query(cat1=table, cat2='vizier:II/246/out', max_distance=5 * arcsec,
+                        colRA1='ra', colDec1='dec', chunk_size=30, area=area,
+                        get_query_payload=True)
+    assert len(payloads) == 1
+    assert payloads[0][1]['files']['cat1'][1].strip() == 'ra,dec,my_id'
+
+    with pytest.raises(ValueError, match="chunk_size requires an astropy Table"):
+        xm.query(cat1='vizier:II/311/wise', cat2='vizier:II/246/out', max_distance=5 * arcsec,
+                 chunk_size=30)
+
+
+def test_query_chunks(monkeypatch):
+    xm = XMatch()
+    monkeypatch.setattr(xm, '_request', request_mockreturn)
+
+    def query_async(cat1, cat2, max_distance, **kwargs):
+        # each source matches itself
+        content = BytesIO()
+        from_table(cat1).to_xml(content)
+        return MockResponse(content=content.getvalue())
+
+    monkeypatch.setattr(xm, 'query_async', query_async)
+    result = xm.query(cat1=_chunk_table(), cat2='vizier:II/246/out', max_distance=5 * arcsec,
+                      colRA1='ra', colDec1='dec', chunk_size=30)
+    assert len(result) == 100
+    assert sorted(result['my_id']) == list(range(100))
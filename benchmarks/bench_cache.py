@@ -0,0 +1,127 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Compare cache hits of the astroquery response cache with the pickled
+`requests.Response` objects written before astroquery 0.4.11.
+
+Each hit is timed in a fresh subprocess, which also reports the increase of
+its peak resident set size while loading the entry::
+
+    python benchmarks/bench_cache.py --sizes 1 50 500 --compression none gzip
+"""
+import argparse
+import copy
+import json
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from astroquery.cache import write_response, read_response
+
+
+def _peak_rss():
+    # On Linux, ru_maxrss is inherited from the (large) parent process across
+    # fork and exec, while the VmHWM high-water mark is reset by exec.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def make_response(size):
+    """A VOTable-like response of ``size`` bytes."""
+    rng = np.random.default_rng(42)
+    rows = [f"<TR><TD>{i}</TD><TD>{ra:.8f}</TD><TD>{dec:.8f}</TD></TR>\n"
+            for i, (ra, dec) in enumerate(rng.uniform(0, 90, (20000, 2)))]
+    block = "".join(rows).encode()
+    content = (block * (size // len(block) + 1))[:size]
+
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = "https://example.org/tap/sync"
+    response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "text/xml"})
+    response.request = requests.Request("POST", response.url, data={"QUERY": "SELECT *"}).prepare()
+    return response
+
+
+def write_pickle(response, cache_file):
+    # What astroquery.query.to_cache did before the response cache format
+    response = copy.deepcopy(response)
+    with open(cache_file, "wb") as f:
+        pickle.dump(response, f, protocol=4)
+
+
+def read_pickle(cache_file):
+    with open(cache_file, "rb") as f:
+        return pickle.load(f)
+
+
+def load(kind, cache_file):
+    """Run in the subprocess: time one cache hit."""
+    rss = _peak_rss()
+    start = time.perf_counter()
+    response = read_pickle(cache_file) if kind == 'pickle' else read_response(cache_file)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    print(json.dumps({'time': elapsed, 'rss': _peak_rss() - rss}))
+
+
+def measure(kind, cache_file, repeat):
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, __file__, '--load', kind, str(cache_file)],
+                                check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output))
+    return min(res['time'] for res in results), max(res['rss'] for res in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 50, 500],
+                        help='Response sizes in MB')
+    parser.add_argument('--compression', nargs='+', default=['none', 'gzip'],
+                        choices=['none', 'gzip', 'zstd'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--load', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        load(*args.load)
+        return
+
+    print(f"{'size':>8} {'format':>14} {'file MB':>9} {'write s':>9} {'hit ms':>9} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            response = make_response(size * 1024**2)
+            cases = [('pickle', 'pickle', write_pickle)]
+            cases += [(f'response/{compression}', 'response',
+                       lambda resp, fn, compression=compression: write_response(resp, fn, compression))
+                      for compression in args.compression]
+            for label, kind, writer in cases:
+                cache_file = Path(tmpdir, 'entry')
+                start = time.perf_counter()
+                writer(response, cache_file)
+                write_time = time.perf_counter() - start
+
+                hit_time, rss = measure(kind, cache_file, args.repeat)
+                print(f"{size:>6}MB {label:>14} {cache_file.stat().st_size / 1024**2:>9.1f} "
+                      f"{write_time:>9.3f} {hit_time * 1e3:>9.1f} {rss / 1024**2:>12.1f}")
+                cache_file.unlink()
+            del response
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Compare the parsing of JPL Horizons responses into tables with the line loop
+used before astroquery 0.4.11.
+
+The responses are synthetic: the header of the Ceres test responses followed
+by their data rows, repeated up to the requested number of lines. Each case
+reports the parsing time and the peak memory allocated while parsing::
+
+    python benchmarks/bench_horizons_parse.py --lines 100000 1000000
+
+The reference parser takes several minutes on a million ephemerides lines;
+``--parsers new`` skips it.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from astropy.io import ascii
+from astropy.table import Table
+
+from astroquery.jplhorizons import HorizonsClass
+from astroquery.utils.mocks import MockResponse
+
+DATA = os.path.join(os.path.dirname(__file__), '..', 'astroquery', 'jplhorizons', 'tests', 'data')
+
+QUERIES = [('ephemerides', 'ceres_ephemerides_range.txt', 'Date__(UT)__HR:MN'),
+           ('elements', 'ceres_elements_range.txt', 'JDTDB,'),
+           ('vectors', 'ceres_vectors_range.txt', 'JDTDB,')]
+
+
+def reference_parse(text, query_type, header_key):
+    """The line loop and data reading of HorizonsClass._parse_result before
+    astroquery 0.4.11, without the metadata columns added to both tables."""
+    src = text.split('\n')
+    data_start_idx = data_end_idx = 0
+    headerline = []
+    for idx, line in enumerate(src):
+        if header_key in line:
+            headerline = line.split(',')
+            headerline[-1] = '_dump'
+            if query_type == 'ephemerides':
+                headerline[2:4] = ['solar_presence', 'lunar_presence']
+        if "$$EOE" in line:
+            data_end_idx = idx
+        if "$$SOE" in line:
+            data_start_idx = idx + 1
+        # the metadata and error tests run on every line
+        for key in ("Target body name", "Center body name", "rotational period in hours)",
+                    "Comet physical", "Multiple major-bodies match string", "Matching small-bodies:",
+                    "No ephemeris for target", "Cannot output elements", "Cannot interpret date",
+                    "INPUT ERROR"):
+            if key in line:
+                pass
+    headerline = [h.strip() for h in headerline]
+    raw_data = [line for line in src[data_start_idx:data_end_idx] if 'Cut-off' not in line]
+    data = ascii.read(raw_data, names=headerline, fill_values=[('.n.a.', '0'), ('n.a.', '0')],
+                      fast_reader=False)
+    return Table(data, masked=True)
+
+
+def make_response(filename, nlines):
+    """A copy of the response in ``filename`` with ``nlines`` data rows."""
+    with open(os.path.join(DATA, filename)) as f:
+        text = f.read()
+    soe = text.find('$$SOE\n') + len('$$SOE\n')
+    eoe = text.find('$$EOE')
+    rows = text[soe:eoe].splitlines(keepends=True)
+    data = (rows * (nlines // len(rows) + 1))[:nlines]
+    return text[:soe] + ''.join(data) + text[eoe:]
+
+
+def parse(text, query_type):
+    horizons = HorizonsClass(id='Ceres')
+    horizons.query_type = query_type
+    return horizons._parse_result(MockResponse(text.encode()))
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    nrows = len(result)
+    del result
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return nrows, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--query-type', nargs='+', default=[query for query, _, _ in QUERIES],
+                        choices=[query for query, _, _ in QUERIES])
+    parser.add_argument('--parsers', nargs='+', default=['reference', 'new'], choices=['reference', 'new'])
+    args = parser.parse_args()
+
+    print(f"{'lines':>9} {'query':>12} {'parser':>10} {'rows':>9} {'parse s':>9} {'peak MB':>9}")
+    for nlines in args.lines:
+        for query_type, filename, header_key in QUERIES:
+            if query_type not in args.query_type:
+                continue
+            text = make_response(filename, nlines)
+            cases = [('reference', reference_parse, (text, query_type, header_key)),
+                     ('new', parse, (text, query_type))]
+            for label, function, function_args in cases:
+                if label not in args.parsers:
+                    continue
+                nrows, elapsed, peak = measure(function, *function_args)
+                print(f"{nlines:>9} {query_type:>12} {label:>10} {nrows:>9} {elapsed:>9.3f} "
+                      f"{peak / 2**20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Compare the decoding of MAST Mashup responses into tables with the object
+array implementation used before astroquery 0.4.11.
+
+The payloads are synthetic CAOM-like results, with some missing values in
+every column.  Each case reports the time to decode the JSON body, the time
+to build the table, and the peak memory allocated while building it::
+
+    python benchmarks/bench_mast_json.py --rows 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+from astropy.table import Table, MaskedColumn
+
+from astroquery.mast import utils
+from astroquery.mast.discovery_portal import _json_to_table
+
+FIELDS = [('obsid', 'long'), ('obs_collection', 'string'), ('instrument_name', 'string'),
+          ('target_name', 'string'), ('s_ra', 'float'), ('s_dec', 'float'), ('t_min', 'float'),
+          ('t_exptime', 'float'), ('calib_level', 'int'), ('dataRights', 'string')]
+
+
+def reference_json_to_table(json_obj, col_config=None):
+    """discovery_portal._json_to_table before astroquery 0.4.11."""
+    data_table = Table(masked=True)
+
+    for col, atype in [(x['name'], x['type']) for x in json_obj['fields']]:
+        if col == "_selected_":
+            continue
+
+        ignore_value = None
+        if col_config:
+            ignore_value = col_config.get(col, {}).get("ignoreValue", None)
+
+        reg_type = utils.parse_type(atype)
+        atype = reg_type[1]
+        ignore_value = reg_type[2] if (ignore_value is None) else ignore_value
+
+        col_data = np.array([x.get(col, ignore_value) for x in json_obj['data']], dtype=object)
+        if ignore_value is not None:
+            col_data[np.where(np.equal(col_data, None))] = ignore_value
+
+        if atype == 'str':
+            col_mask = (col_data == ignore_value)
+        else:
+            col_mask = np.equal(col_data, ignore_value)
+
+        data_table.add_column(MaskedColumn(col_data.astype(atype), name=col, mask=col_mask))
+
+    return data_table
+
+
+def make_payload(nrows):
+    """A Mashup JSON response body with ``nrows`` rows."""
+    rng = np.random.default_rng(42)
+    missing = rng.random((nrows, len(FIELDS))) < 0.05
+    ra, dec = rng.uniform(0, 360, nrows), rng.uniform(-90, 90, nrows)
+    rows = []
+    for ii in range(nrows):
+        row = {'obsid': 2000000000 + ii, 'obs_collection': ('HST', 'TESS', 'JWST')[ii % 3],
+               'instrument_name': 'WFC3/UVIS', 'target_name': f'TARGET-{ii % 5000}',
+               's_ra': ra[ii], 's_dec': dec[ii], 't_min': 50000 + ii / 7, 't_exptime': 300.0,
+               'calib_level': ii % 4, 'dataRights': 'PUBLIC'}
+        for (name, _), is_missing in zip(FIELDS, missing[ii]):
+            if is_missing:
+                row[name] = None
+        rows.append(row)
+    return json.dumps({'status': 'COMPLETE', 'fields': [{'name': name, 'type': atype} for name, atype in FIELDS],
+                       'data': rows}).encode()
+
+
+class Body:
+    """Stands in for the `requests.Response` passed to ``utils._load_json``."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'implementation':>16} {'decode s':>9} {'table s':>9} {'peak MB':>9}")
+    for nrows in args.rows:
+        body = Body(make_payload(nrows))
+
+        start = time.perf_counter()
+        json_obj = json.loads(body.content)
+        decode_time = time.perf_counter() - start
+        table_time, peak = measure(reference_json_to_table, json_obj)
+        print(f"{nrows:>9} {'reference':>16} {decode_time:>9.3f} {table_time:>9.3f} {peak / 2**20:>9.1f}")
+
+        start = time.perf_counter()
+        json_obj = utils._load_json(body)
+        decode_time = time.perf_counter() - start
+        table_time, peak = measure(_json_to_table, json_obj)
+        label = 'columnar+orjson' if utils.orjson is not None else 'columnar'
+        print(f"{nrows:>9} {label:>16} {decode_time:>9.3f} {table_time:>9.3f} {peak / 2**20:>9.1f}")
+
+        assert all(np.array_equal(reference_json_to_table(json_obj)[name].mask, _json_to_table(json_obj)[name].mask)
+                   for name, _ in FIELDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Time synchronous TAP jobs with the pooled keep-alive connections of
+`~astroquery.utils.tap.conn.tapconn.ConnectionHandler`, and with a new
+connection for every request as before astroquery 0.4.11.
+
+The jobs run against a local stub TAP server, which counts the connections
+it accepts. Each of them is a TLS handshake on an HTTPS service::
+
+    python benchmarks/bench_tap_connections.py --jobs 500 --threads 1 4
+"""
+import argparse
+import http.client
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from astroquery.utils.tap.conn.tapconn import ConnectionHandler, TapConn, close_connections
+from astroquery.utils.tap.core import TapPlus
+
+VOTABLE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<VOTABLE version="1.4" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">
+ <RESOURCE type="results">
+  <INFO name="QUERY_STATUS" value="OK"/>
+  <TABLE>
+   <FIELD name="source_id" datatype="long"/>
+   <FIELD name="ra" datatype="double" unit="deg"/>
+   <DATA>
+    <TABLEDATA>
+     <TR><TD>1</TD><TD>10.5</TD></TR>
+     <TR><TD>2</TD><TD>11.5</TD></TR>
+    </TABLEDATA>
+   </DATA>
+  </TABLE>
+ </RESOURCE>
+</VOTABLE>
+"""
+
+
+class StubTapHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-votable+xml")
+        self.send_header("Content-Length", str(len(VOTABLE)))
+        self.end_headers()
+        self.wfile.write(VOTABLE)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubTapHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class OneShotConnectionHandler(ConnectionHandler):
+    """A new connection for every request"""
+
+    def __init__(self, host, port):
+        super().__init__(host, port, port)
+        self.host, self.port = host, port
+
+    def get_connection(self, *, ishttps=False, cookie=None, verbose=False):
+        return http.client.HTTPConnection(self.host, self.port)
+
+
+def make_tap(host, port, pooled):
+    connhandler = None if pooled else OneShotConnectionHandler(host, port)
+    conn = TapConn(ishttps=False, host=host, server_context="tap", port=port,
+                   connhandler=connhandler)
+    return TapPlus(url=f"http://{host}:{port}/tap", connhandler=conn)
+
+
+def run(server, jobs, threads, pooled):
+    host, port = server.server_address
+    tap = make_tap(host, port, pooled)
+    close_connections()
+    server.connections = 0
+
+    def launch(_):
+        return len(tap.launch_job("SELECT source_id, ra FROM stub").get_results())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        assert sum(executor.map(launch, range(jobs))) == 2 * jobs
+    return time.perf_counter() - start, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    server = start_server()
+    print(f"{'threads':>8} {'connections':>12} {'handshakes':>11} {'wall s':>8} {'ms/job':>8}")
+    for threads in args.threads:
+        for label, pooled in (('one-shot', False), ('pooled', True)):
+            elapsed, connections = run(server, args.jobs, threads, pooled)
+            print(f"{threads:>8} {label:>12} {connections:>11} {elapsed:>8.2f} "
+                  f"{elapsed / args.jobs * 1e3:>8.2f}")
+    close_connections()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Compare the parsing of VizieR ``asu-tsv`` responses with the parsing of
+the same results as VOTable, and with the tsv parser used before astroquery
+0.4.11.
+
+The responses are synthetic two-catalog results, in the layout of the VizieR
+tsv and VOTable (TABLEDATA) outputs. Each case reports the parsing time and
+the peak memory allocated while parsing::
+
+    python benchmarks/bench_vizier_tsv.py --rows 100000 1000000
+"""
+import argparse
+import re
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+from astropy.io import ascii, votable
+from astropy.table import Table
+
+from astroquery.vizier.core import _iter_vizier_tsv, _parse_vizier_tsvfile, _parse_vizier_votable
+
+COLUMNS = [('_r', 'F6.3', 'arcmin', '{:6.3f}'), ('RAJ2000', 'F10.6', 'deg', '{:10.6f}'),
+           ('DEJ2000', 'F10.6', 'deg', '{:+10.6f}'), ('ID', 'A12', '', '{}'),
+           ('Jmag', 'F6.3', 'mag', '{:6.3f}'), ('Qflg', 'A3', '', '{}')]
+
+
+def reference_parse_vizier_tsvfile(data):
+    """_parse_vizier_tsvfile before astroquery 0.4.11."""
+    split_indices = [m.start() for m in re.finditer(b'\n\n#', data)]
+    split_limits = zip(split_indices[:-1], split_indices[1:])
+    return [ascii.read(BytesIO(data[a:b]), format='fast_tab', delimiter='\t',
+                       header_start=0, comment="#") for a, b in split_limits]
+
+
+def make_table(nrows, seed):
+    rng = np.random.default_rng(seed)
+    return Table({'_r': rng.uniform(0, 10, nrows), 'RAJ2000': rng.uniform(0, 360, nrows),
+                  'DEJ2000': rng.uniform(-90, 90, nrows),
+                  'ID': [f'{ii:012d}' for ii in range(nrows)],
+                  'Jmag': rng.uniform(5, 18, nrows), 'Qflg': np.repeat(['AAA', 'ABU', 'EEE'], nrows // 3 + 1)[:nrows]})
+
+
+def make_tsv(tables):
+    """An asu-tsv response with the ``(name, table)`` pairs of ``tables``."""
+    out = ["#\n#   VizieR Astronomical Server vizier.cds.unistra.fr\n#\n"]
+    for name, table in tables:
+        out.append(f"\n#RESOURCE=yCat\n#Table\t{name.replace('/', '_')}:\n#Name: {name}\n")
+        out.extend(f"#Column\t{col}\t({fmt})\t{col} column\n" for col, fmt, _, _ in COLUMNS)
+        out.append("\t".join(col for col, *_ in COLUMNS) + "\n")
+        out.append("\t".join(unit for _, _, unit, _ in COLUMNS) + "\n")
+        out.append("\t".join("-" * int(re.search(r'\d+', fmt).group()) for _, fmt, _, _ in COLUMNS) + "\n")
+        columns = [[form.format(value) for value in table[col]] for col, _, _, form in COLUMNS]
+        out.append("\n".join("\t".join(row) for row in zip(*columns)) + "\n")
+    return "".join(out).encode()
+
+
+def make_votable(tables):
+    """The VOTable response with the same tables."""
+    vot = votable.tree.VOTableFile()
+    for name, table in tables:
+        resource = votable.tree.Resource()
+        vot.resources.append(resource)
+        vo_table = votable.tree.TableElement.from_table(vot, table)
+        vo_table.name = name
+        resource.tables.append(vo_table)
+    output = BytesIO()
+    vot.to_xml(output, tabledata_format='tabledata')
+    return output.getvalue()
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'parser':>16} {'tables':>7} {'parse s':>9} {'peak MB':>9}")
+    for nrows in args.rows:
+        tables = [('II/246/out', make_table(nrows, 1)), ('I/322A/out', make_table(nrows // 10, 2))]
+        tsv, xml = make_tsv(tables), make_votable(tables)
+        cases = [('votable', _parse_vizier_votable, xml),
+                 ('tsv reference', reference_parse_vizier_tsvfile, tsv),
+                 ('tsv', _parse_vizier_tsvfile, tsv),
+                 ('tsv streamed', lambda data: list(_iter_vizier_tsv(
+                     data[i:i + 2**20] for i in range(0, len(data), 2**20))), tsv)]
+        for label, function, data in cases:
+            elapsed, peak = measure(function, data)
+            ntables = len(function(data))
+            print(f"{nrows:>9} {label:>16} {ntables:>7} {elapsed:>9.3f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Time the check of the catalogue names of XMatch queries against the
+in-memory table registry, and against the list of tables loaded on every
+call as before astroquery 0.4.11.
+
+The list of tables is a synthetic ``getVizieRTableNames`` response, served
+by a mocked session; it goes through the astroquery response cache, in a
+temporary cache directory, as in a real session::
+
+    python benchmarks/bench_xmatch_tables.py --tables 30000 --calls 200
+"""
+import argparse
+import tempfile
+import time
+
+import requests
+from astropy.config import paths
+
+from astroquery.xmatch import XMatchClass
+
+
+def make_response(ntables):
+    """A getVizieRTableNames response with ``ntables`` tables."""
+    names = "\n".join(f"J/A+A/{ii // 10}/table{ii % 10}" for ii in range(ntables - 1))
+    response = requests.Response()
+    response._content = (names + "\nII/246/out\n").encode()
+    response.status_code = 200
+    response.reason = "OK"
+    response.encoding = "utf-8"
+    response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "text/plain"})
+    return response
+
+
+class ReferenceXMatch(XMatchClass):
+    """``is_table_available`` before astroquery 0.4.11."""
+
+    def is_table_available(self, table_id):
+        if not isinstance(table_id, str):
+            return False
+        if table_id.startswith('vizier:'):
+            table_id = table_id[7:]
+        return table_id in self.get_available_tables()
+
+
+def make_xmatch(cls, ntables):
+    xmatch = cls()
+    content = make_response(ntables)
+
+    def request(method, url, **kwargs):
+        response = make_response(0)
+        response._content = content._content
+        response.url = url
+        response.request = requests.Request(method, url, params=kwargs.get("params")).prepare()
+        return response
+
+    xmatch._session.request = request
+    return xmatch
+
+
+def per_call(xmatch, calls):
+    # the two checks of a VizieR catalogue in XMatch.query
+    start = time.perf_counter()
+    for _ in range(calls):
+        xmatch._prepare_sending_table(2, {}, {}, "vizier:II/246/out", None, None)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tables', type=int, nargs='+', default=[30000])
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'tables':>8} {'lookup':>10} {'first ms':>9} {'per call ms':>12}")
+    with tempfile.TemporaryDirectory() as cache_dir, paths.set_temp_cache(cache_dir):
+        for ntables in args.tables:
+            for label, cls in (('reference', ReferenceXMatch), ('registry', XMatchClass)):
+                xmatch = make_xmatch(cls, ntables)
+                xmatch.clear_cache()
+                first = per_call(xmatch, 1)
+                elapsed = per_call(xmatch, args.calls)
+                print(f"{ntables:>8} {label:>10} {first * 1e3:>9.2f} {elapsed * 1e3:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()